@@ -26,6 +26,8 @@ class Settings(BaseSettings):
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-here")  # change in production
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours
+    # sent as X-Admin-Token to /admin endpoints - unset disables them
+    ADMIN_API_TOKEN: str = os.getenv("ADMIN_API_TOKEN", "")
     
     # database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./development.db")
@@ -44,6 +46,35 @@ class Settings(BaseSettings):
 
     # cache
     REDIS_URL: str = os.getenv("REDIS_URL", "")
+    REDIS_MAX_CONNECTIONS: int = int(os.getenv("REDIS_MAX_CONNECTIONS", "20"))
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = float(os.getenv("REDIS_SOCKET_TIMEOUT_SECONDS", "1"))
+    # json, orjson or msgpack; compression is none, zstd or lz4
+    CACHE_SERIALIZER: str = os.getenv("CACHE_SERIALIZER", "json")
+    CACHE_COMPRESSION: str = os.getenv("CACHE_COMPRESSION", "none")
+    CACHE_COMPRESSION_MIN_BYTES: int = int(os.getenv("CACHE_COMPRESSION_MIN_BYTES", "1024"))
+    QUOTE_CACHE_MAX_SIZE: int = int(os.getenv("QUOTE_CACHE_MAX_SIZE", "2048"))
+    SUMMARY_CACHE_MAX_SIZE: int = int(os.getenv("SUMMARY_CACHE_MAX_SIZE", "4096"))
+    VALUATION_STATE_MAX_SIZE: int = int(os.getenv("VALUATION_STATE_MAX_SIZE", "4096"))
+    VALUATION_STATE_MAX_AGE_SECONDS: int = int(os.getenv("VALUATION_STATE_MAX_AGE_SECONDS", "300"))
+    NEGATIVE_CACHE_MAX_SIZE: int = int(os.getenv("NEGATIVE_CACHE_MAX_SIZE", "1024"))
+    NEGATIVE_CACHE_TTL_SECONDS: int = int(os.getenv("NEGATIVE_CACHE_TTL_SECONDS", "300"))
+    
+    # market data
+    # "yfinance" for live data, "replay" to serve a recorded CSV/Parquet file offline
+    MARKET_DATA_PROVIDER: str = os.getenv("MARKET_DATA_PROVIDER", "yfinance")
+    MARKET_DATA_REPLAY_PATH: str = os.getenv("MARKET_DATA_REPLAY_PATH", "")
+    YFINANCE_MAX_WORKERS: int = int(os.getenv("YFINANCE_MAX_WORKERS", "8"))
+    YFINANCE_BREAKER_FAILURE_THRESHOLD: int = int(os.getenv("YFINANCE_BREAKER_FAILURE_THRESHOLD", "5"))
+    YFINANCE_BREAKER_RECOVERY_SECONDS: float = float(os.getenv("YFINANCE_BREAKER_RECOVERY_SECONDS", "30"))
+    YFINANCE_RATE_LIMIT_PER_SECOND: float = float(os.getenv("YFINANCE_RATE_LIMIT_PER_SECOND", "5"))
+    YFINANCE_RATE_LIMIT_BURST: float = float(os.getenv("YFINANCE_RATE_LIMIT_BURST", "10"))
+    YFINANCE_RATE_LIMIT_WAIT_SECONDS: float = float(os.getenv("YFINANCE_RATE_LIMIT_WAIT_SECONDS", "2"))
+    MARKET_INDEX_TIMEOUT_SECONDS: float = float(os.getenv("MARKET_INDEX_TIMEOUT_SECONDS", "5"))
+    MAX_QUOTE_BATCH_SIZE: int = int(os.getenv("MAX_QUOTE_BATCH_SIZE", "50"))
+    # keep below the 1 minute price TTL so request-path reads stay cache hits
+    MARKET_DATA_REFRESH_SECONDS: int = int(os.getenv("MARKET_DATA_REFRESH_SECONDS", "45"))
+    # how often each streamed symbol is re-read - reads hit the quote cache, not Yahoo
+    QUOTE_STREAM_POLL_SECONDS: float = float(os.getenv("QUOTE_STREAM_POLL_SECONDS", "5"))
     
     # logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
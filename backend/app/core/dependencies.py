@@ -1,10 +1,12 @@
 # app/core/dependencies.py
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from typing import Optional
+import secrets
 
+from app.core.config import settings
 from app.infrastructure.database import SessionLocal
 from app.core.security import verify_token
 from app.domains.auth.repositories import UserRepository
@@ -67,6 +69,24 @@ def get_current_active_user(current_user: User = Depends(get_current_user)) -> U
     """Get current active user (alias for consistency)"""
     return current_user
 
+def get_user_from_token(token: str, db: Session) -> Optional[User]:
+    """Resolve a bearer token to an active user, None if it isn't valid"""
+    payload = verify_token(token)
+    if payload is None:
+        return None
+
+    # get user email from token
+    email: str = payload.get("sub")
+    if email is None:
+        return None
+
+    # get user from database
+    user = UserRepository(db).get_by_email(email)
+    if user is None or not user.is_active:
+        return None
+
+    return user
+
 def get_optional_user(
     db: Session = Depends(get_db),
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
@@ -76,25 +96,20 @@ def get_optional_user(
         return None
 
     try:
-        token = credentials.credentials
-
-        # verify token
-        payload = verify_token(token)
-        if payload is None:
-            return None
-
-        # get user email from token
-        email: str = payload.get("sub")
-        if email is None:
-            return None
-
-        # get user from database
-        user_repo = UserRepository(db)
-        user = user_repo.get_by_email(email)
+        return get_user_from_token(credentials.credentials, db)
+    except Exception:
+        return None
 
-        if user is None or not user.is_active:
-            return None
+def require_admin_token(x_admin_token: Optional[str] = Header(default=None)) -> None:
+    """Guard for operator endpoints - needs ADMIN_API_TOKEN set and sent as X-Admin-Token"""
+    if not settings.ADMIN_API_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin API is disabled."
+        )
 
-        return user
-    except Exception:
-        return None
\ No newline at end of file
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token, settings.ADMIN_API_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid admin token."
+        )
@@ -0,0 +1,164 @@
+# app/core/market_calendar.py
+
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import ET
+
+# regular NYSE session (ET)
+MARKET_OPEN = time(9, 30)
+MARKET_CLOSE = time(16, 0)
+EARLY_CLOSE = time(13, 0)
+
+# one-off closures not covered by the holiday rules (national days of mourning)
+SPECIAL_CLOSURES = {
+    date(2018, 12, 5): "National Day of Mourning (George H.W. Bush)",
+    date(2025, 1, 9): "National Day of Mourning (Jimmy Carter)",
+}
+
+
+def _easter(year: int) -> date:
+    """Gregorian Easter Sunday (anonymous algorithm)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """nth (1-based) given weekday of a month, or the last one when n == -1"""
+    if n == -1:
+        last = date(year, month + 1, 1) - timedelta(days=1) if month < 12 else date(year, 12, 31)
+        return last - timedelta(days=(last.weekday() - weekday) % 7)
+    first = date(year, month, 1)
+    return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+
+
+def _observed(day: date) -> date:
+    """Saturday holidays move to Friday, Sunday holidays to Monday"""
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+@lru_cache(maxsize=32)
+def holidays(year: int) -> Dict[date, str]:
+    """NYSE full-day closures for a year"""
+    result = {
+        _nth_weekday(year, 1, 0, 3): "Martin Luther King Jr. Day",
+        _nth_weekday(year, 2, 0, 3): "Washington's Birthday",
+        _easter(year) - timedelta(days=2): "Good Friday",
+        _nth_weekday(year, 5, 0, -1): "Memorial Day",
+        _observed(date(year, 7, 4)): "Independence Day",
+        _nth_weekday(year, 9, 0, 1): "Labor Day",
+        _nth_weekday(year, 11, 3, 4): "Thanksgiving Day",
+        _observed(date(year, 12, 25)): "Christmas Day",
+    }
+
+    # NYSE doesn't close on Dec 31 when New Year's Day falls on a Saturday
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        result[_observed(new_year)] = "New Year's Day"
+
+    if year >= 2022:
+        result[_observed(date(year, 6, 19))] = "Juneteenth"
+
+    for closure, name in SPECIAL_CLOSURES.items():
+        if closure.year == year:
+            result[closure] = name
+    return result
+
+
+@lru_cache(maxsize=32)
+def early_closes(year: int) -> Dict[date, str]:
+    """Sessions that close at 1:00 PM ET"""
+    candidates = {
+        date(year, 7, 3): "Independence Day Eve",
+        _nth_weekday(year, 11, 3, 4) + timedelta(days=1): "Day after Thanksgiving",
+        date(year, 12, 24): "Christmas Eve",
+    }
+    closed = holidays(year)
+    return {
+        day: name for day, name in candidates.items()
+        if day.weekday() < 5 and day not in closed
+    }
+
+
+def is_trading_day(day: date) -> bool:
+    return day.weekday() < 5 and day not in holidays(day.year)
+
+
+def session(day: date) -> Optional[Tuple[datetime, datetime]]:
+    """(open, close) as ET datetimes, or None when the market is closed all day"""
+    if not is_trading_day(day):
+        return None
+    close = EARLY_CLOSE if day in early_closes(day.year) else MARKET_CLOSE
+    return (
+        datetime.combine(day, MARKET_OPEN, tzinfo=ET),
+        datetime.combine(day, close, tzinfo=ET)
+    )
+
+
+def is_open(now: Optional[datetime] = None) -> bool:
+    """Whether the regular session is in progress"""
+    now = (now or datetime.now(ET)).astimezone(ET)
+    hours = session(now.date())
+    return hours is not None and hours[0] <= now < hours[1]
+
+
+def next_open(now: Optional[datetime] = None) -> datetime:
+    """Start of the next regular session after now (ET)"""
+    now = (now or datetime.now(ET)).astimezone(ET)
+    day = now.date()
+    while True:
+        hours = session(day)
+        if hours is not None and now < hours[0]:
+            return hours[0]
+        day += timedelta(days=1)
+
+
+def seconds_until_open(now: Optional[datetime] = None) -> float:
+    """0 while the market is open, otherwise seconds until the next session starts"""
+    now = (now or datetime.now(ET)).astimezone(ET)
+    if is_open(now):
+        return 0.0
+    return (next_open(now) - now).total_seconds()
+
+
+def previous_trading_day(day: date) -> date:
+    """Last trading day strictly before day"""
+    day -= timedelta(days=1)
+    while not is_trading_day(day):
+        day -= timedelta(days=1)
+    return day
+
+
+def trading_day_on_or_before(day: date) -> date:
+    return day if is_trading_day(day) else previous_trading_day(day)
+
+
+def trading_day_on_or_after(day: date) -> date:
+    while not is_trading_day(day):
+        day += timedelta(days=1)
+    return day
+
+
+def trading_days(start_date: date, end_date: date) -> List[date]:
+    """Trading days in [start_date, end_date]"""
+    days = []
+    day = start_date
+    while day <= end_date:
+        if is_trading_day(day):
+            days.append(day)
+        day += timedelta(days=1)
+    return days
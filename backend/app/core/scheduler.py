@@ -2,20 +2,28 @@
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from sqlalchemy.orm import Session
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 import logging
 
-from app.core.config import today_et, ET
+import numpy as np
+import pandas as pd
+
+from app.core import market_calendar
+from app.core.config import settings, today_et, ET
 
 from app.infrastructure.database import SessionLocal
+from app.infrastructure.invalidation import invalidation_bus, ALL_PORTFOLIOS_TAG
 from app.domains.portfolio.services import PortfolioService
 from app.domains.portfolio.models import PortfolioSnapshot
 from app.domains.portfolio.repositories import PortfolioRepository
 from app.domains.portfolio.schemas import PortfolioSnapshotCreate
 from app.domains.auth.repositories import UserRepository
-from app.domains.trading.repositories import PositionRepository
-from app.domains.stocks.external import YFinanceClient
+from app.domains.trading.repositories import PositionRepository, WatchlistRepository
+from app.domains.stocks.matrix import densify_closes
+from app.domains.stocks.services import StockService
+from app.domains.stocks.universe import symbol_index
 
 logger = logging.getLogger(__name__)
 
@@ -26,11 +34,22 @@ INITIAL_HISTORY_LOOKBACK_DAYS = 7
 MAX_HISTORY_LOOKBACK_DAYS = 30
 
 
+def _is_market_hours(now: datetime = None) -> bool:
+    """Check whether the regular NYSE session is open (holidays and early closes included)."""
+    return market_calendar.is_open(now)
+
+
 async def create_daily_snapshots():
     """
     Create portfolio snapshots for all active users.
-    This runs daily to populate historical portfolio data for charts.
+    This runs after each trading session to populate historical portfolio data for charts.
+    Weekends and holidays are skipped - prices don't move, and readers fall back
+    to the last trading day's snapshot.
     """
+    if not market_calendar.is_trading_day(today_et()):
+        logger.info(f"{today_et()} is not a trading day - skipping portfolio snapshots")
+        return
+
     logger.info("Starting daily portfolio snapshot creation...")
 
     db: Session = SessionLocal()
@@ -63,6 +82,63 @@ async def create_daily_snapshots():
         db.close()
 
 
+async def refresh_market_data():
+    """
+    Pre-warm the shared quote cache for every held or watched symbol.
+    Runs on a fixed interval during market hours so request-path reads are
+    cache hits and upstream load doesn't grow with traffic.
+    """
+    if not _is_market_hours():
+        return
+
+    db: Session = SessionLocal()
+    try:
+        symbols = set(PositionRepository(db).get_distinct_symbols())
+        symbols.update(WatchlistRepository(db).get_distinct_symbols())
+    except Exception as e:
+        logger.error(f"Error loading symbols for market data refresh: {e}")
+        return
+    finally:
+        db.close()
+
+    if not symbols:
+        return
+
+    try:
+        refreshed = await StockService().refresh_quotes(sorted(symbols))
+        logger.info(f"Market data refresh complete. Refreshed {refreshed}/{len(symbols)} quotes")
+    except Exception as e:
+        logger.error(f"Error in market data refresh job: {e}")
+
+
+async def refresh_symbol_metadata():
+    """
+    Refresh persisted company details (name, market cap) older than a day.
+    Keeps the metadata off the request hot path, which only fetches prices.
+    """
+    logger.info("Starting symbol metadata refresh...")
+
+    try:
+        refreshed = await StockService().refresh_stale_metadata()
+        logger.info(f"Symbol metadata refresh complete. Refreshed: {refreshed}")
+    except Exception as e:
+        logger.error(f"Error in symbol metadata refresh job: {e}")
+
+
+async def refresh_symbol_universe():
+    """
+    Re-download the listed symbol directories so symbol validation and
+    prefix search are answered locally instead of asking Yahoo.
+    """
+    logger.info("Starting symbol universe refresh...")
+
+    try:
+        count = await StockService().refresh_symbol_universe()
+        logger.info(f"Symbol universe refresh complete. Symbols: {count}")
+    except Exception as e:
+        logger.error(f"Error in symbol universe refresh job: {e}")
+
+
 async def backfill_missing_snapshots():
     """
     Reconstruct missing portfolio snapshots using historical closing prices.
@@ -124,19 +200,21 @@ async def backfill_missing_snapshots():
                     if current_earliest is None or user_gap_start < current_earliest:
                         symbol_earliest_gap_start[pos.symbol] = user_gap_start
 
-        # Batch-fetch historical closing prices (single yfinance call).
-        # Start with a short lookback, then widen it if the fetched history
-        # still lacks a usable pre-gap close for any symbol we need.
-        historical_prices: dict = {}
+        # Read a dense (day x symbol) close matrix from the local price bar
+        # store, which only downloads days it does not have yet (one batched
+        # yfinance call) and carries closes over weekends/holidays; NaN where
+        # no close is known yet. Start with a short lookback, then widen it if
+        # the history still lacks a usable pre-gap close for any symbol we need.
+        matrix = densify_closes(pd.DataFrame(), earliest_gap_start, yesterday)
         if all_symbols:
             symbols_to_fetch = sorted(all_symbols)
-            yf_client = YFinanceClient()
+            stock_service = StockService(db)
             lookback_days = INITIAL_HISTORY_LOOKBACK_DAYS
 
             while True:
                 fetch_start = earliest_gap_start - timedelta(days=lookback_days)
                 try:
-                    historical_prices = await yf_client.get_historical_closes(
+                    matrix = await stock_service.get_close_matrix(
                         symbols_to_fetch, fetch_start, yesterday
                     )
                 except Exception:
@@ -146,7 +224,8 @@ async def backfill_missing_snapshots():
                     )
                     return
 
-                if not historical_prices:
+                first_closes = matrix.apply(lambda column: column.first_valid_index())
+                if first_closes.isna().all():
                     if lookback_days >= MAX_HISTORY_LOOKBACK_DAYS:
                         logger.error(
                             "Historical price batch came back empty after a %s-day "
@@ -165,18 +244,16 @@ async def backfill_missing_snapshots():
                     lookback_days = next_lookback
                     continue
 
-                missing_pre_gap_symbols = []
-                for symbol in symbols_to_fetch:
-                    required_by = symbol_earliest_gap_start[symbol]
-                    prices_by_date = historical_prices.get(symbol, {})
-                    if any(trading_date <= required_by for trading_date in prices_by_date):
-                        continue
-                    missing_pre_gap_symbols.append(symbol)
+                missing_pre_gap_symbols = [
+                    symbol for symbol in symbols_to_fetch
+                    if pd.isna(first_closes[symbol])
+                    or first_closes[symbol] > pd.Timestamp(symbol_earliest_gap_start[symbol])
+                ]
 
                 if not missing_pre_gap_symbols:
                     logger.info(
                         "Fetched historical prices for %s symbols using a %s-day lookback",
-                        len(historical_prices),
+                        int(first_closes.notna().sum()),
                         lookback_days,
                     )
                     break
@@ -199,25 +276,8 @@ async def backfill_missing_snapshots():
                 )
                 lookback_days = next_lookback
 
-        # Pre-compute sorted trading dates per symbol for efficient lookups
-        # on weekends/holidays (find most recent trading day's close)
-        sorted_dates: dict[str, list[date]] = {}
-        for sym, prices_by_date in historical_prices.items():
-            sorted_dates[sym] = sorted(prices_by_date.keys())
-
-        def _get_price(symbol: str, target_date: date, fallback: float) -> float:
-            """Get closing price for a date, falling back to most recent trading day."""
-            sym_prices = historical_prices.get(symbol)
-            if not sym_prices:
-                return fallback
-            price = sym_prices.get(target_date)
-            if price is not None:
-                return price
-            # Weekend/holiday: walk backwards through sorted trading dates
-            for d in reversed(sorted_dates.get(symbol, [])):
-                if d <= target_date:
-                    return sym_prices[d]
-            return fallback
+        # like create_daily_snapshots, only trading days get a snapshot
+        matrix = matrix[[market_calendar.is_trading_day(day) for day in matrix.index.date]]
 
         total_created = 0
 
@@ -227,29 +287,44 @@ async def backfill_missing_snapshots():
             cash_balance = last_snapshot.cash_balance
             positions = user_positions.get(user.id, [])
 
-            current_date = user_gap_start
-            while current_date <= yesterday:
-                if portfolio_repo.get_snapshot_by_date(user.id, current_date) is None:
-                    # Reconstruct positions value from historical prices
-                    positions_value = 0.0
-                    for pos in positions:
-                        price = _get_price(pos.symbol, current_date, pos.average_price)
-                        positions_value += pos.quantity * price
-
-                    portfolio_value = positions_value + cash_balance
-
-                    portfolio_repo.create_snapshot(PortfolioSnapshotCreate(
-                        user_id=user.id,
-                        snapshot_date=current_date,
-                        portfolio_value=portfolio_value,
-                        positions_value=positions_value,
-                        cash_balance=cash_balance,
-                    ))
-                    total_created += 1
-                current_date += timedelta(days=1)
+            user_days = matrix.loc[pd.Timestamp(user_gap_start):]
+            if positions:
+                # Value every gap day at once; symbols without a known close
+                # fall back to the position's average price.
+                prices = user_days.reindex(columns=[pos.symbol for pos in positions]).to_numpy()
+                fallback = np.array([pos.average_price for pos in positions])
+                quantities = np.array([pos.quantity for pos in positions])
+                values = np.where(np.isnan(prices), fallback, prices) @ quantities
+            else:
+                values = np.zeros(len(user_days))
+
+            existing_dates = {
+                snapshot.snapshot_date
+                for snapshot in portfolio_repo.get_snapshots_by_date_range(user.id, user_gap_start, yesterday)
+            }
+
+            for day, positions_value in zip(user_days.index.date, values):
+                if day in existing_dates:
+                    continue
+
+                positions_value = float(positions_value)
+                portfolio_value = positions_value + cash_balance
+
+                portfolio_repo.create_snapshot(PortfolioSnapshotCreate(
+                    user_id=user.id,
+                    snapshot_date=day,
+                    portfolio_value=portfolio_value,
+                    positions_value=positions_value,
+                    cash_balance=cash_balance,
+                ))
+                total_created += 1
 
         logger.info(f"Backfill complete. Created {total_created} reconstructed snapshots.")
 
+        # new snapshots can move the day change baseline of cached summaries
+        if total_created:
+            await invalidation_bus.publish(ALL_PORTFOLIOS_TAG)
+
     except Exception as e:
         logger.error(f"Error during snapshot backfill: {e}")
         raise
@@ -260,7 +335,7 @@ async def backfill_missing_snapshots():
 def start_scheduler():
     """
     Initialize and start the background scheduler.
-    Schedules daily portfolio snapshot creation at market close (4:00 PM ET).
+    Schedules portfolio snapshot creation at market close (4:00 PM ET) on weekdays.
     """
     try:
         # schedule daily snapshots at 4:00 PM ET (market close)
@@ -268,12 +343,50 @@ def start_scheduler():
         # adjust timezone as needed for your deployment
         scheduler.add_job(
             create_daily_snapshots,
-            trigger=CronTrigger(hour=16, minute=0, timezone=ET),  # 4:00 PM ET daily
+            # 4:00 PM ET on weekdays, holidays are skipped inside the job
+            trigger=CronTrigger(day_of_week='mon-fri', hour=16, minute=0, timezone=ET),
             id='daily_portfolio_snapshots',
             name='Create daily portfolio snapshots',
             replace_existing=True
         )
 
+        # keep quotes for held and watched symbols warm during market hours
+        scheduler.add_job(
+            refresh_market_data,
+            trigger=IntervalTrigger(seconds=settings.MARKET_DATA_REFRESH_SECONDS),
+            id='market_data_refresh',
+            name='Refresh quotes for held and watched symbols',
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True
+        )
+
+        # refresh company details once a day, before the market opens
+        scheduler.add_job(
+            refresh_symbol_metadata,
+            trigger=CronTrigger(hour=6, minute=0, timezone=ET),  # 6:00 AM ET daily
+            id='daily_symbol_metadata_refresh',
+            name='Refresh symbol metadata',
+            replace_existing=True
+        )
+
+        # nasdaq trader regenerates the symbol directories overnight
+        scheduler.add_job(
+            refresh_symbol_universe,
+            trigger=CronTrigger(day_of_week='mon-fri', hour=5, minute=30, timezone=ET),  # 5:30 AM ET weekdays
+            id='daily_symbol_universe_refresh',
+            name='Refresh symbol universe',
+            replace_existing=True
+        )
+
+        # first boot: nothing persisted yet, so download the universe right away
+        if len(symbol_index) == 0:
+            scheduler.add_job(
+                refresh_symbol_universe,
+                id='startup_symbol_universe_refresh',
+                name='Refresh symbol universe on startup'
+            )
+
         # optional: add a job that runs at startup to create today's snapshot if missing
         scheduler.add_job(
             create_daily_snapshots,
@@ -283,7 +396,7 @@ def start_scheduler():
 
         scheduler.start()
         logger.info("Scheduler started successfully")
-        logger.info("Daily snapshots scheduled for 4:00 PM daily")
+        logger.info("Daily snapshots scheduled for 4:00 PM ET on trading days")
 
     except Exception as e:
         logger.error(f"Error starting scheduler: {e}")
@@ -0,0 +1,106 @@
+# app/domains/admin/api.py
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from typing import Any, Dict, List, Optional
+import logging
+
+from app.core.dependencies import require_admin_token
+from app.domains.portfolio.valuation import valuation_store
+from app.infrastructure.cache import MemoryCache, async_cache_service, cached_functions, caches
+
+logger = logging.getLogger(__name__)
+router = APIRouter(dependencies=[Depends(require_admin_token)])
+
+# per-prefix counters exported as <METRIC_PREFIX>_<name>_total
+PREFIX_COUNTERS = ("hits", "stale_hits", "misses", "evictions")
+FUNCTION_COUNTERS = ("hits", "negative_hits", "misses", "errors", "coalesced")
+METRIC_PREFIX = "mocktrade_cache"
+
+def _cache_stats() -> Dict[str, Dict[str, Any]]:
+    stats = {}
+    for name, cache in caches.items():
+        stats[name] = cache.stats()
+        if isinstance(cache, MemoryCache):
+            stats[name]["prefixes"] = cache.prefix_stats()
+    return stats
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _render_metrics(stats: Dict[str, Dict[str, Any]], functions: Dict[str, Dict[str, Any]]) -> str:
+    """Prometheus text exposition format"""
+    lines: List[str] = []
+
+    def metric(name: str, kind: str, help_text: str, samples: List[tuple]) -> None:
+        lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+        lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+        for labels, value in samples:
+            rendered = ",".join(f'{k}="{_label(v)}"' for k, v in labels.items())
+            lines.append(f"{METRIC_PREFIX}_{name}{{{rendered}}} {value}")
+
+    prefixes = [
+        ({"cache": name, "prefix": prefix}, counters)
+        for name, cache_stats in stats.items()
+        for prefix, counters in cache_stats["prefixes"].items()
+    ]
+    for counter in PREFIX_COUNTERS:
+        metric(f"{counter}_total", "counter", f"L1 {counter.replace('_', ' ')} by key prefix",
+               [(labels, counters[counter]) for labels, counters in prefixes])
+    metric("entries", "gauge", "L1 entries by key prefix",
+           [(labels, counters["size"]) for labels, counters in prefixes])
+    metric("oldest_entry_age_seconds", "gauge", "Age of the oldest L1 entry by key prefix",
+           [(labels, round(counters["oldest_age_seconds"], 3)) for labels, counters in prefixes])
+    metric("max_entries", "gauge", "L1 capacity",
+           [({"cache": name}, cache_stats["max_size"]) for name, cache_stats in stats.items()])
+
+    shared = [(name, cache_stats) for name, cache_stats in stats.items() if "shared_hits" in cache_stats]
+    metric("shared_hits_total", "counter", "Redis hits",
+           [({"cache": name}, cache_stats["shared_hits"]) for name, cache_stats in shared])
+    metric("shared_misses_total", "counter", "Redis misses",
+           [({"cache": name}, cache_stats["shared_misses"]) for name, cache_stats in shared])
+
+    for counter in FUNCTION_COUNTERS:
+        metric(f"function_{counter}_total", "counter", f"@cached {counter.replace('_', ' ')} by function",
+               [({"function": name}, function_stats[counter]) for name, function_stats in functions.items()])
+
+    return "\n".join(lines) + "\n"
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Size, hit ratio, evictions and key ages for every cache, per key prefix"""
+    return {
+        "redis_enabled": async_cache_service.enabled,
+        "caches": _cache_stats(),
+        "functions": {name: func.cache_stats() for name, func in cached_functions.items()},
+        "valuations": valuation_store.stats()
+    }
+
+@router.get("/cache/metrics", response_class=PlainTextResponse)
+async def get_cache_metrics():
+    """Cache counters for Prometheus to scrape"""
+    functions = {name: func.cache_stats() for name, func in cached_functions.items()}
+    return _render_metrics(_cache_stats(), functions)
+
+@router.post("/cache/flush")
+async def flush_cache(
+    prefix: str = Query(..., min_length=1),
+    cache: Optional[str] = Query(default=None)
+):
+    """Drop keys starting with prefix from one cache (or all of them), in L1 and Redis
+
+    Other workers' L1 copies of shared keys age out on their own TTLs.
+    """
+    if cache is not None and cache not in caches:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Unknown cache: {cache}")
+
+    targets = {cache: caches[cache]} if cache is not None else caches
+    flushed = {}
+    for name, target in targets.items():
+        if isinstance(target, MemoryCache):
+            flushed[name] = target.flush_prefix(prefix)
+        else:
+            flushed[name] = await target.flush_prefix(prefix)
+
+    logger.info(f"Flushed cache prefix {prefix!r}: {flushed}")
+    return {"prefix": prefix, "flushed": flushed}
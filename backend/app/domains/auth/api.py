@@ -13,6 +13,7 @@ from app.core.dependencies import get_db, get_current_user
 from app.domains.auth.models import User
 from app.domains.auth.schemas import UserCreate, User as UserResponse, Token, UserUpdate, PasswordChange, GoogleLoginRequest
 from app.domains.auth.services import AuthService
+from app.infrastructure.invalidation import invalidation_bus, user_tag, LEADERBOARD_TAG
 from app.domains.auth.exceptions import (
     InvalidCredentialsError,
     EmailAlreadyExistsError,
@@ -122,6 +123,7 @@ async def update_profile(
     try:
         auth_service = AuthService(db)
         updated_user = auth_service.update_user_profile(current_user, profile_data)
+        await invalidation_bus.publish(user_tag(current_user.id), LEADERBOARD_TAG)
         return updated_user
         
     except (EmailAlreadyExistsError, UsernameAlreadyExistsError) as e:
@@ -157,6 +159,7 @@ async def delete_account(
     try:
         auth_service = AuthService(db)
         auth_service.deactivate_user(current_user)
+        await invalidation_bus.publish(user_tag(current_user.id), LEADERBOARD_TAG)
         return {"message": "Account deleted successfully"}
         
     except Exception as e:
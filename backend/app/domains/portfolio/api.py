@@ -118,27 +118,9 @@ async def get_user_profile(
         if not target_user:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found.")
         
+        # copy - the cached profile is shared with other requests
         portfolio_service = PortfolioService(db)
-        summary = await portfolio_service.get_portfolio_summary(target_user.id)
-        
-        # use a standard starting value - could be made configurable later
-        # for now, all users start with the same amount as defined in user creation
-        starting_value = 100000.0  # this matches the default cash_balance in User model
-        
-        # base response with correct order
-        user_profile = {
-            "first_name": target_user.first_name,
-            "last_name": target_user.last_name,
-            "created_at": target_user.created_at.isoformat() if target_user.created_at else None,
-            "portfolio_value": summary.portfolio_value,
-            "positions_value": summary.positions_value,
-            "cash_balance": summary.cash_balance,
-            "starting_value": starting_value,
-            "total_return": summary.portfolio_value - starting_value,
-            "return_percentage": ((summary.portfolio_value - starting_value) / starting_value) * 100 if starting_value > 0 else 0,
-            "activity_count": 0,  # will be populated if activities requested
-            "positions": summary.positions  # use enriched positions from summary
-        }
+        user_profile = dict(await portfolio_service.get_user_profile(target_user.id))
         
         # add activities if requested
         if include_activities:
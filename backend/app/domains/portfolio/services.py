@@ -2,12 +2,13 @@
 
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, time, timedelta
 import asyncio
 import math
 import logging
 
-from app.core.config import today_et
+from app.core import market_calendar
+from app.core.config import settings, today_et, ET
 from app.domains.portfolio.repositories import PortfolioRepository
 from app.domains.portfolio.schemas import (
     PortfolioSnapshotCreate, 
@@ -16,11 +17,32 @@ from app.domains.portfolio.schemas import (
     PortfolioHistoryPoint
 )
 from app.domains.trading.repositories import PositionRepository
-from app.domains.stocks.services import StockService
+from app.domains.portfolio.valuation import UserValuation, valuation_store
+from app.domains.stocks.services import StockService, PRICE_CACHE_TTL, market_aware_ttl, quote_version
 from app.core.exceptions import BusinessLogicError
+from app.infrastructure.cache import MemoryCache, TieredCache, async_cache_service, cached, register_cache
+from app.infrastructure.invalidation import invalidation_bus, user_tag, ALL_PORTFOLIOS_TAG, LEADERBOARD_TAG
 
 logger = logging.getLogger(__name__)
 
+# summaries, profiles, history and leaderboards - trades and snapshots drop them
+# through the invalidation bus, so TTLs only have to bound how stale prices get
+portfolio_cache = register_cache("portfolio", invalidation_bus.register(TieredCache(
+    MemoryCache(max_size=settings.SUMMARY_CACHE_MAX_SIZE),
+    async_cache_service,
+    namespace="portfolio",
+    shared_prefixes=("summary_", "profile_", "leaderboard_")
+)))
+
+# snapshots only change once a day, and creating one invalidates the user
+HISTORY_CACHE_TTL = timedelta(hours=1)
+
+def summary_ttl(now: Optional[datetime] = None) -> timedelta:
+    """Price TTL, but never past midnight ET when the day change baseline moves"""
+    now = now or datetime.now(ET)
+    midnight = datetime.combine(now.date() + timedelta(days=1), time.min, tzinfo=ET)
+    return min(market_aware_ttl(PRICE_CACHE_TTL, now), midnight - now)
+
 class PortfolioError(BusinessLogicError):
     """Base exception for portfolio domain"""
     pass
@@ -30,80 +52,64 @@ class PortfolioService:
         self.db = db
         self.portfolio_repo = PortfolioRepository(db)
         self.position_repo = PositionRepository(db)
-        self.stock_service = StockService()
-
-    async def get_portfolio_summary(self, user_id: int) -> PortfolioSummary:
-        """Get current portfolio summary with real-time values"""
+        self.stock_service = StockService(db)
+
+    @cached(
+        ttl=summary_ttl,
+        backend=portfolio_cache,
+        model=PortfolioSummary,
+        key=lambda self, user_id, include_company_info=True: f"summary_{user_id}_{int(include_company_info)}",
+        tags=lambda self, user_id, include_company_info=True: [user_tag(user_id), ALL_PORTFOLIOS_TAG]
+    )
+    async def get_portfolio_summary(self, user_id: int, include_company_info: bool = True) -> PortfolioSummary:
+        """Get current portfolio summary with real-time values, cached until the next trade"""
         try:
-            # get user's current positions
-            positions = self.position_repo.get_all_by_user(user_id)
-
-            # get user's cash balance
-            from app.domains.auth.repositories import UserRepository
-            user_repo = UserRepository(self.db)
-            user = user_repo.get_by_id(user_id)
-
-            if not user:
-                raise PortfolioError(f"User {user_id} not found")
+            state = self._get_valuation(user_id)
+            symbols = list(state.positions)
 
-            cash_balance = user.cash_balance
-
-            # fetch all stock data in parallel (get_stock_data returns current_price + company_name)
-            async def _fetch_position_data(position):
+            # re-read quotes only when they may have moved since the last valuation
+            version = quote_version()
+            if state.needs_pricing(version, market_aware_ttl(PRICE_CACHE_TTL)):
                 try:
-                    stock_data = await self.stock_service.get_stock_data(position.symbol)
-                    return (position, stock_data, None)
+                    quotes = await self.stock_service.get_quotes(symbols) if symbols else {}
                 except Exception as e:
-                    return (position, None, e)
-
-            results = await asyncio.gather(*[_fetch_position_data(p) for p in positions])
+                    logger.warning(f"Could not get quotes for user {user_id}: {e}")
+                    quotes = {}
+                state.reprice(quotes, version)
+
+            # names from the long-lived company info cache, remembered per user
+            unnamed = [s for s in symbols if s not in state.company_names]
+            if include_company_info and unnamed:
+                company_info = await self.stock_service.get_company_info(unnamed)
+                state.company_names.update(
+                    {s: company_info.get(s, {}).get("company_name", s) for s in unnamed}
+                )
 
-            # build enriched positions and calculate total value in one pass
-            positions_value = 0.0
             enriched_positions = []
-            for position, stock_data, err in results:
-                if stock_data:
-                    current_price = stock_data["current_price"]
-                    company_name = stock_data.get("company_name", position.symbol)
-                else:
-                    logger.warning(f"Could not get stock data for {position.symbol}: {err}")
-                    current_price = position.average_price
-                    company_name = position.symbol
-
-                positions_value += position.quantity * current_price
+            for symbol, (shares, average_price) in state.positions.items():
+                current_price = state.prices.get(symbol, average_price)
                 enriched_positions.append({
-                    "symbol": position.symbol,
-                    "company_name": company_name,
-                    "shares": position.quantity,
+                    "symbol": symbol,
+                    "company_name": state.company_names.get(symbol, symbol) if include_company_info else symbol,
+                    "shares": shares,
                     "current_price": current_price,
-                    "average_price": position.average_price,
-                    "current_value": position.quantity * current_price
+                    "average_price": average_price,
+                    "current_value": shares * current_price
                 })
 
-            portfolio_value = positions_value + cash_balance
-
-            # calculate day change (compare to previous snapshot if available)
+            portfolio_value = state.portfolio_value
             day_change = None
             day_change_percent = None
-
-            yesterday = today_et() - timedelta(days=1)
-            previous_snapshot = self.portfolio_repo.get_snapshot_by_date(user_id, yesterday)
-
-            if previous_snapshot:
-                day_change = portfolio_value - previous_snapshot.portfolio_value
-                day_change_percent = (day_change / previous_snapshot.portfolio_value) * 100 if previous_snapshot.portfolio_value > 0 else 0
-
-            # get activity count efficiently
-            from app.domains.trading.repositories import ActivityRepository
-            activity_repo = ActivityRepository(self.db)
-            activity_count = activity_repo.count_by_user(user_id)
+            if state.baseline_value is not None:
+                day_change = portfolio_value - state.baseline_value
+                day_change_percent = (day_change / state.baseline_value) * 100 if state.baseline_value > 0 else 0
 
             return PortfolioSummary(
                 portfolio_value=portfolio_value,
-                positions_value=positions_value,
-                cash_balance=cash_balance,
-                positions_count=len(positions),
-                activity_count=activity_count,
+                positions_value=state.positions_value,
+                cash_balance=state.cash_balance,
+                positions_count=len(state.positions),
+                activity_count=state.activity_count,
                 day_change=day_change,
                 day_change_percent=day_change_percent,
                 positions=enriched_positions
@@ -113,6 +119,77 @@ class PortfolioService:
             logger.error(f"Error getting portfolio summary for user {user_id}: {e}")
             raise PortfolioError(f"Could not get portfolio summary: {str(e)}")
 
+    def _get_valuation(self, user_id: int) -> UserValuation:
+        """The user's valuation state, loaded from the database on first use each day"""
+        today = today_et()
+        state = valuation_store.get(user_id, today)
+        if state is not None:
+            return state
+
+        # get user's current positions
+        positions = self.position_repo.get_all_by_user(user_id)
+
+        # get user's cash balance
+        from app.domains.auth.repositories import UserRepository
+        user_repo = UserRepository(self.db)
+        user = user_repo.get_by_id(user_id)
+
+        if not user:
+            raise PortfolioError(f"User {user_id} not found")
+
+        # day change is measured against the last snapshot from the previous
+        # trading session (snapshots aren't taken on weekends and holidays)
+        previous_snapshot = self.portfolio_repo.get_snapshot_on_or_before(user_id, today - timedelta(days=1))
+        if previous_snapshot and previous_snapshot.snapshot_date < market_calendar.previous_trading_day(today):
+            previous_snapshot = None
+
+        # get activity count efficiently
+        from app.domains.trading.repositories import ActivityRepository
+        activity_repo = ActivityRepository(self.db)
+        activity_count = activity_repo.count_by_user(user_id)
+
+        return valuation_store.put(UserValuation(
+            user_id=user_id,
+            day=today,
+            cash_balance=user.cash_balance,
+            positions={p.symbol: (p.quantity, p.average_price) for p in positions},
+            activity_count=activity_count,
+            baseline_value=previous_snapshot.portfolio_value if previous_snapshot else None
+        ))
+
+    @cached(
+        ttl=summary_ttl,
+        backend=portfolio_cache,
+        key=lambda self, user_id: f"profile_{user_id}",
+        tags=lambda self, user_id: [user_tag(user_id), ALL_PORTFOLIOS_TAG]
+    )
+    async def get_user_profile(self, user_id: int) -> dict:
+        """Public profile - name plus portfolio value and returns against the starting cash"""
+        from app.domains.auth.repositories import UserRepository
+        user = UserRepository(self.db).get_by_id(user_id)
+        if not user:
+            raise PortfolioError(f"User {user_id} not found")
+
+        summary = await self.get_portfolio_summary(user_id)
+
+        # all users start with the same amount as the default cash_balance in the User model
+        starting_value = 100000.0
+
+        # base response with correct order
+        return {
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "created_at": user.created_at.isoformat() if user.created_at else None,
+            "portfolio_value": summary.portfolio_value,
+            "positions_value": summary.positions_value,
+            "cash_balance": summary.cash_balance,
+            "starting_value": starting_value,
+            "total_return": summary.portfolio_value - starting_value,
+            "return_percentage": ((summary.portfolio_value - starting_value) / starting_value) * 100 if starting_value > 0 else 0,
+            "activity_count": 0,  # will be populated if activities requested
+            "positions": summary.model_dump()["positions"]  # use enriched positions from summary
+        }
+
     async def create_portfolio_snapshot(self, user_id: int, snapshot_date: Optional[date] = None) -> None:
         """Create a portfolio snapshot for a specific date"""
         try:
@@ -122,8 +199,8 @@ class PortfolioService:
             # check if snapshot already exists for this date
             existing_snapshot = self.portfolio_repo.get_snapshot_by_date(user_id, snapshot_date)
             
-            # get current portfolio values
-            summary = await self.get_portfolio_summary(user_id)
+            # get current portfolio values (snapshots don't need company names)
+            summary = await self.get_portfolio_summary(user_id, include_company_info=False)
             
             snapshot_data = PortfolioSnapshotCreate(
                 user_id=user_id,
@@ -146,11 +223,23 @@ class PortfolioService:
                 # create new snapshot
                 self.portfolio_repo.create_snapshot(snapshot_data)
                 logger.info(f"Created portfolio snapshot for user {user_id} on {snapshot_date}")
+
+            # history and day change read snapshots - an earlier day's can be the baseline
+            if snapshot_date < today_et():
+                valuation_store.drop(user_id)
+            await invalidation_bus.publish(user_tag(user_id))
                 
         except Exception as e:
             logger.error(f"Error creating portfolio snapshot for user {user_id}: {e}")
             raise PortfolioError(f"Could not create portfolio snapshot: {str(e)}")
 
+    @cached(
+        ttl=HISTORY_CACHE_TTL,
+        backend=portfolio_cache,
+        model=PortfolioHistory,
+        key=lambda self, user_id, period="1mo": f"history_{user_id}_{period}",
+        tags=lambda self, user_id, period="1mo": [user_tag(user_id), ALL_PORTFOLIOS_TAG]
+    )
     def get_portfolio_history(self, user_id: int, period: str = "1mo") -> PortfolioHistory:
         """Get portfolio history for a specified period"""
         try:
@@ -199,6 +288,12 @@ class PortfolioService:
             logger.error(f"Error getting portfolio history for user {user_id}: {e}")
             raise PortfolioError(f"Could not get portfolio history: {str(e)}")
 
+    @cached(
+        ttl=summary_ttl,
+        backend=portfolio_cache,
+        key=lambda self, timeframe="day": f"leaderboard_{timeframe}",
+        tags=lambda self, timeframe="day": [LEADERBOARD_TAG, ALL_PORTFOLIOS_TAG]
+    )
     async def get_leaderboard(self, timeframe: str = "day") -> List[dict]:
         """Get leaderboard data for all users"""
         try:
@@ -208,6 +303,13 @@ class PortfolioService:
             # get all active users
             all_users = user_repo.get_all_active()
 
+            # warm the quote cache for every held symbol in one batch, so the
+            # per-user summaries below are served from cache
+            try:
+                await self.stock_service.get_quotes(self.position_repo.get_distinct_symbols())
+            except Exception as e:
+                logger.warning(f"Could not prefetch leaderboard quotes: {e}")
+
             # pre-compute target_date once (same for all users)
             today = today_et()
             target_date = None
@@ -226,8 +328,10 @@ class PortfolioService:
             # fetch all user summaries in parallel with concurrency limit
             sem = asyncio.Semaphore(10)
 
-            # Max days a snapshot can be before target_date and still be valid
+            # Max days a snapshot can be before the last trading day on or
+            # before target_date and still be valid (no snapshots on holidays)
             max_staleness = timedelta(days=2)
+            baseline_day = market_calendar.trading_day_on_or_before(target_date) if target_date else None
 
             async def _get_user_entry(user):
                 async with sem:
@@ -237,7 +341,7 @@ class PortfolioService:
                     baseline_missing = False
                     if target_date is not None:
                         snapshot = self.portfolio_repo.get_snapshot_on_or_before(user.id, target_date)
-                        if snapshot and (target_date - snapshot.snapshot_date) <= max_staleness:
+                        if snapshot and (baseline_day - snapshot.snapshot_date) <= max_staleness:
                             start_value = snapshot.portfolio_value
                         else:
                             baseline_missing = True
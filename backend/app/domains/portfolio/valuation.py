@@ -0,0 +1,186 @@
+# app/domains/portfolio/valuation.py
+
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+import threading
+import time
+
+from app.core.config import settings
+from app.infrastructure.invalidation import invalidation_bus, ALL_PORTFOLIOS_TAG
+
+logger = logging.getLogger(__name__)
+
+class UserValuation:
+    """One user's positions, cash and day change baseline, kept current by trades
+
+    Prices are the last quotes the positions were valued at, along with the
+    quote version they were read at.
+    """
+
+    def __init__(self, user_id: int, day: date, cash_balance: float,
+                 positions: Dict[str, Tuple[float, float]], activity_count: int,
+                 baseline_value: Optional[float] = None):
+        self.user_id = user_id
+        self.day = day
+        self.cash_balance = cash_balance
+        # symbol -> [shares, average_price]
+        self.positions: Dict[str, List[float]] = {s: list(p) for s, p in positions.items()}
+        self.activity_count = activity_count
+        self.baseline_value = baseline_value
+        self.prices: Dict[str, float] = {}
+        self.company_names: Dict[str, str] = {}
+        self.positions_value = 0.0
+        self.priced_version: Optional[int] = None
+        self.priced_at = 0.0
+        self.loaded_at = time.monotonic()
+
+    def needs_pricing(self, version: int, ttl: timedelta) -> bool:
+        """True when quotes moved since the last valuation, or it is older than ttl"""
+        return (
+            self.priced_version != version
+            or time.monotonic() - self.priced_at >= ttl.total_seconds()
+            or any(symbol not in self.prices for symbol in self.positions)
+        )
+
+    def reprice(self, quotes: Dict[str, Dict[str, Any]], version: int) -> None:
+        """Value positions at quotes - ones without a quote fall back to their average price
+
+        A valuation with fallbacks isn't marked as priced, so the next read retries.
+        """
+        complete = True
+        for symbol, (shares, average_price) in self.positions.items():
+            quote = quotes.get(symbol)
+            if quote:
+                self.prices[symbol] = quote["current_price"]
+            else:
+                logger.warning(f"Could not get quote for {symbol}, using average price")
+                self.prices[symbol] = average_price
+                complete = False
+
+        self._revalue()
+        self.priced_version = version if complete else None
+        self.priced_at = time.monotonic()
+
+    def apply_trade(self, symbol: str, shares: float, average_price: float, cash_balance: float) -> None:
+        """Apply a trade's resulting position (0 shares closes it) and cash"""
+        if shares:
+            self.positions[symbol] = [shares, average_price]
+            # new positions are valued at cost until the next reprice
+            self.prices.setdefault(symbol, average_price)
+        else:
+            self.positions.pop(symbol, None)
+            self.prices.pop(symbol, None)
+
+        self.cash_balance = cash_balance
+        self.activity_count += 1
+        self._revalue()
+
+    def _revalue(self) -> None:
+        self.positions_value = sum(
+            shares * self.prices.get(symbol, average_price)
+            for symbol, (shares, average_price) in self.positions.items()
+        )
+
+    @property
+    def portfolio_value(self) -> float:
+        return self.positions_value + self.cash_balance
+
+class ValuationStore:
+    """Per-worker LRU of UserValuation, so summaries skip the database
+
+    Changes made in this worker are applied here directly (apply_trade, drop),
+    so the invalidation bus only drops users changed by other workers, plus
+    everyone on portfolio-wide tags. States are reloaded after max_age anyway,
+    in case a bus message was missed.
+    """
+
+    def __init__(self, max_size: int = 4096, max_age: timedelta = timedelta(minutes=5)):
+        self.max_size = max_size
+        self.max_age = max_age
+        self._states: "OrderedDict[int, UserValuation]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.trades_applied = 0
+
+    def get(self, user_id: int, day: date) -> Optional[UserValuation]:
+        """State for user_id, None if missing, too old or built on another day (the baseline moved)"""
+        with self._lock:
+            state = self._states.get(user_id)
+            if (state is None or state.day != day
+                    or time.monotonic() - state.loaded_at >= self.max_age.total_seconds()):
+                self._states.pop(user_id, None)
+                self.misses += 1
+                return None
+
+            self._states.move_to_end(user_id)
+            self.hits += 1
+            return state
+
+    def put(self, state: UserValuation) -> UserValuation:
+        with self._lock:
+            self._states[state.user_id] = state
+            self._states.move_to_end(state.user_id)
+            while len(self._states) > self.max_size:
+                self._states.popitem(last=False)
+        return state
+
+    def apply_trade(self, user_id: int, symbol: str, shares: float, average_price: float,
+                    cash_balance: float) -> bool:
+        """Update a user's state after a trade, returns False if it wasn't loaded"""
+        with self._lock:
+            state = self._states.get(user_id)
+            if state is None:
+                return False
+            state.apply_trade(symbol, shares, average_price, cash_balance)
+            self.trades_applied += 1
+            return True
+
+    def drop(self, user_id: int) -> bool:
+        with self._lock:
+            return self._states.pop(user_id, None) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._states.clear()
+            self.hits = 0
+            self.misses = 0
+            self.trades_applied = 0
+
+    def drop_local_tags(self, tags: Iterable[str]) -> int:
+        """Another worker changed these users - their state here is out of date"""
+        tags = list(tags)
+        if ALL_PORTFOLIOS_TAG in tags:
+            with self._lock:
+                dropped = len(self._states)
+                self._states.clear()
+            return dropped
+
+        user_ids = [int(t.split(":", 1)[1]) for t in tags if t.startswith("user:")]
+        return sum(self.drop(user_id) for user_id in user_ids)
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """This worker's own changes - per-user ones were already applied, so only wide tags drop"""
+        tags = list(tags)
+        return self.drop_local_tags(tags) if ALL_PORTFOLIOS_TAG in tags else 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._states),
+                "max_size": self.max_size,
+                "max_age_seconds": self.max_age.total_seconds(),
+                "hits": self.hits,
+                "misses": self.misses,
+                "trades_applied": self.trades_applied,
+                "hit_ratio": self.hits / lookups if lookups else 0.0
+            }
+
+# process-wide valuation states
+valuation_store = invalidation_bus.register(ValuationStore(
+    max_size=settings.VALUATION_STATE_MAX_SIZE,
+    max_age=timedelta(seconds=settings.VALUATION_STATE_MAX_AGE_SECONDS)
+))
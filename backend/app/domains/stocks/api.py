@@ -1,15 +1,23 @@
 # app/domains/stocks/api.py
 
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, Query, status, Depends, WebSocket, WebSocketDisconnect
+from sqlalchemy.orm import Session
+import asyncio
 import logging
 
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_db, get_current_user, get_user_from_token
 from app.domains.auth.models import User
+from app.infrastructure.database import SessionLocal
 from app.domains.stocks.services import StockService
+from app.domains.stocks.streaming import quote_hub
 from app.domains.stocks.schemas import (
     StockData, 
     MarketIndicesResponse, 
     MarketMoversResponse,
+    PriceHistoryResponse,
+    QuotesRequest,
+    QuotesResponse,
+    SymbolSearchResponse,
     SymbolRequest
 )
 
@@ -33,11 +41,101 @@ async def get_stock_quote(symbol: str, current_user: User = Depends(get_current_
             detail=f"Could not fetch quote for symbol {symbol}."
         )
 
+@router.post("/quotes", response_model=QuotesResponse)
+async def get_stock_quotes(request: QuotesRequest, current_user: User = Depends(get_current_user)):
+    """Get current price and previous close for many symbols in one upstream call"""
+    try:
+        stock_service = StockService()
+        quotes = await stock_service.get_quotes(request.symbols)
+        
+        logger.info(f"Successfully fetched {len(quotes)} of {len(request.symbols)} quotes")
+        return QuotesResponse(
+            quotes=[quotes[s] for s in request.symbols if s in quotes],
+            missing=[s for s in request.symbols if s not in quotes]
+        )
+        
+    except Exception as e:
+        logger.error(f"Error fetching quotes for {request.symbols}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Could not fetch quotes."
+        )
+
+@router.get("/search", response_model=SymbolSearchResponse)
+async def search_symbols(
+    q: str = Query(..., min_length=1, max_length=50),
+    limit: int = Query(10, ge=1, le=25),
+    current_user: User = Depends(get_current_user)
+):
+    """Search tickers and company names - served from the in-memory symbol index"""
+    stock_service = StockService()
+    return SymbolSearchResponse(query=q, results=stock_service.search_symbols(q, limit))
+
+@router.websocket("/stream")
+async def stream_quotes(
+    websocket: WebSocket,
+    token: str = Query(...),
+    symbols: str = Query("")
+):
+    """Push live quotes for subscribed symbols
+
+    Browsers can't set headers on a WebSocket, so the access token comes as a
+    query parameter. Clients send {"action": "subscribe"|"unsubscribe", "symbols": [...]}.
+    """
+    # short-lived session - a yield dependency would hold a pooled connection
+    # for as long as the stream stays open
+    db = SessionLocal()
+    try:
+        user = get_user_from_token(token, db)
+    finally:
+        db.close()
+
+    if user is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    queue = quote_hub.connect()
+
+    async def send_updates():
+        while True:
+            await websocket.send_json(await queue.get())
+
+    sender = asyncio.create_task(send_updates())
+    try:
+        watching = quote_hub.subscribe(queue, symbols.split(",")) if symbols else []
+        await websocket.send_json({"type": "subscribed", "symbols": watching})
+
+        while True:
+            message = await websocket.receive_json()
+            requested = message.get("symbols") or []
+            action = message.get("action")
+            if action == "subscribe":
+                watching = quote_hub.subscribe(queue, requested)
+            elif action == "unsubscribe":
+                watching = quote_hub.unsubscribe(queue, requested)
+            else:
+                await websocket.send_json({"type": "error", "detail": f"Unknown action {action!r}."})
+                continue
+            await websocket.send_json({"type": "subscribed", "symbols": watching})
+
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"Quote stream closed with error: {e}")
+    finally:
+        sender.cancel()
+        quote_hub.disconnect(queue)
+
 @router.get("/{symbol}", response_model=dict)
-async def get_stock_data(symbol: str, current_user: User = Depends(get_current_user)):
+async def get_stock_data(
+    symbol: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
     """Get comprehensive stock data including company name and market cap"""
     try:
-        stock_service = StockService()
+        stock_service = StockService(db)
         result = await stock_service.get_stock_data(symbol.upper())
         
         logger.info(f"Successfully fetched stock data for {symbol}")
@@ -67,6 +165,26 @@ async def get_current_price(symbol: str):
             detail=f"Could not fetch price for symbol {symbol}."
         )
 
+@router.get("/{symbol}/history", response_model=PriceHistoryResponse)
+async def get_price_history(
+    symbol: str,
+    period: str = "1mo",
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get daily OHLCV bars for a chart period from the local price store"""
+    try:
+        stock_service = StockService(db)
+        bars = await stock_service.get_price_history(symbol, period)
+        return PriceHistoryResponse(symbol=symbol.upper(), period=period, bars=bars)
+        
+    except Exception as e:
+        logger.error(f"Error fetching price history for {symbol}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Could not fetch price history for {symbol.upper()}."
+        )
+
 @router.post("/validate", response_model=dict)
 async def validate_symbol(request: SymbolRequest):
     """Validate if a stock symbol exists"""
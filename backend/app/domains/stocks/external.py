@@ -2,16 +2,34 @@
 
 import yfinance as yf
 import asyncio
+import pandas as pd
 import logging
 from typing import Dict, List, Optional
 from datetime import date, datetime, timedelta
 
-from app.domains.stocks.schemas import StockData, MarketIndex, MarketMover
+from app.domains.stocks.schemas import StockData, StockQuote, SymbolMetadata, PriceBarData, MarketIndex, MarketMover
+from app.core.config import settings
+from app.infrastructure.executor import yfinance_executor
+from app.infrastructure.resilience import yfinance_breaker, yfinance_rate_limiter
 
 logger = logging.getLogger(__name__)
 
+def format_market_cap(market_cap: Optional[float]) -> str:
+    """Format market cap with appropriate suffix"""
+    if not market_cap:
+        return "N/A"
+    
+    if market_cap >= 1e12:
+        return f"${market_cap/1e12:.2f}T"
+    elif market_cap >= 1e9:
+        return f"${market_cap/1e9:.2f}B" 
+    elif market_cap >= 1e6:
+        return f"${market_cap/1e6:.2f}M"
+    else:
+        return f"${market_cap:,.0f}"
+
 class YFinanceClient:
-    """Clean wrapper for Yahoo Finance API calls"""
+    """Clean wrapper for Yahoo Finance API calls - the default MarketDataProvider"""
     
     # predefined indices - no need to query for names
     INDICES = {
@@ -21,42 +39,76 @@ class YFinanceClient:
         "^VIX": "VIX"
     }
     
+    def __init__(self):
+        self.executor = yfinance_executor
+        self.breaker = yfinance_breaker
+        self.rate_limiter = yfinance_rate_limiter
+
+    async def _run(self, func, *args, **kwargs):
+        """Run a blocking yfinance call on the dedicated executor
+
+        Every upstream call goes through the circuit breaker and rate limiter, so
+        during an incident callers fail fast instead of each waiting on Yahoo.
+        """
+        # take the token first - a half-open probe slot must only be claimed
+        # by a call that will actually record an outcome
+        await self.rate_limiter.acquire(timeout=settings.YFINANCE_RATE_LIMIT_WAIT_SECONDS)
+        self.breaker.before_call()
+
+        try:
+            result = await self.executor.run(func, *args, **kwargs)
+        except BaseException:
+            # timeouts and cancellations (e.g. wait_for) count as failures too
+            self.breaker.record_failure()
+            self.rate_limiter.penalize()
+            raise
+
+        self.breaker.record_success()
+        self.rate_limiter.reward()
+        return result
+
     async def get_stock_data(self, symbol: str) -> Optional[StockData]:
         """Get comprehensive stock data including company name"""
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
-            hist = ticker.history(period="2d")
-            
-            if hist.empty:
-                return None
-            
-            current_price = hist['Close'].iloc[-1]
-            previous_close = hist['Close'].iloc[-2] if len(hist) > 1 else current_price
-            
-            return StockData(
-                symbol=symbol.upper(),
-                company_name=info.get('longName', info.get('shortName', symbol)),
-                current_price=float(current_price),
-                previous_close_price=float(previous_close),
-                market_capitalization=self._format_market_cap(info.get('marketCap', 0)),
-                timestamp=datetime.now().isoformat()
-            )
-            
+            return await self._run(self._fetch_stock_data, symbol)
         except Exception as e:
             logger.error(f"Error fetching stock data for {symbol}: {e}")
             return None
     
     async def get_current_price(self, symbol: str) -> Optional[float]:
-        """Get current price only - no company info needed"""
+        """Get current price only - no company info needed
+
+        Returns None when yfinance has no data for the symbol; upstream errors re-raise.
+        """
         try:
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period="1d")
-            return float(hist['Close'].iloc[-1]) if not hist.empty else None
+            return await self._run(self._fetch_current_price, symbol)
         except Exception as e:
             logger.error(f"Error fetching price for {symbol}: {e}")
-            return None
+            raise
     
+    async def get_symbol_metadata(self, symbol: str) -> Optional[SymbolMetadata]:
+        """Get static company details (name, market cap) - no price data"""
+        try:
+            return await self._run(self._fetch_symbol_metadata, symbol)
+        except Exception as e:
+            logger.error(f"Error fetching metadata for {symbol}: {e}")
+            return None
+
+    async def get_quotes(self, symbols: List[str]) -> Dict[str, StockQuote]:
+        """Batch-fetch current price and previous close for many symbols.
+
+        Returns {symbol: StockQuote, ...}; symbols yfinance has no data for are omitted.
+        Uses a single yf.download() call for efficiency.
+        """
+        if not symbols:
+            return {}
+
+        try:
+            return await self._run(self._fetch_quotes, symbols)
+        except Exception as e:
+            logger.error(f"Error fetching quotes for {len(symbols)} symbols: {e}")
+            return {}
+
     async def get_historical_closes(
         self, symbols: List[str], start_date: date, end_date: date
     ) -> Dict[str, Dict[date, float]]:
@@ -69,129 +121,279 @@ class YFinanceClient:
             return {}
 
         try:
-            # yf.download end is exclusive, so add one day
-            # Pass symbols as a space-separated string for consistent behavior
-            df = yf.download(
-                " ".join(symbols),
-                start=start_date.isoformat(),
-                end=(end_date + timedelta(days=1)).isoformat(),
-                progress=False,
-            )
+            return await self._run(self._fetch_historical_closes, symbols, start_date, end_date)
+        except Exception as e:
+            logger.error(f"Error fetching historical closes: {e}")
+            raise
 
-            if df.empty:
-                return {}
-
-            result: Dict[str, Dict[date, float]] = {}
-
-            if len(symbols) == 1:
-                # Single symbol: columns are flat ['Close', 'High', ...]
-                sym = symbols[0]
-                result[sym] = {}
-                close_col = df["Close"]
-                if hasattr(close_col, "columns"):
-                    # MultiIndex case — extract the series
-                    close_col = close_col.iloc[:, 0]
-                for ts, price in close_col.dropna().items():
-                    result[sym][ts.date()] = float(price)
-            else:
-                # Multiple symbols: columns are MultiIndex ('Close', 'AAPL'), ...
-                close_df = df["Close"]
-                for sym in symbols:
-                    if sym not in close_df.columns:
-                        continue
-                    result[sym] = {}
-                    series = close_df[sym].dropna()
-                    for ts, price in series.items():
-                        result[sym][ts.date()] = float(price)
-
-            return result
+    async def get_price_bars(
+        self, symbols: List[str], start_date: date, end_date: date
+    ) -> Dict[str, List[PriceBarData]]:
+        """Batch-fetch daily OHLCV bars for multiple symbols.
 
+        Returns {symbol: [PriceBarData, ...], ...} in date order.
+        Uses a single yf.download() call for efficiency.
+        """
+        if not symbols:
+            return {}
+
+        try:
+            return await self._run(self._fetch_price_bars, symbols, start_date, end_date)
         except Exception as e:
-            logger.error(f"Error fetching historical closes: {e}")
+            logger.error(f"Error fetching price bars: {e}")
             raise
 
-    async def get_market_indices(self) -> List[MarketIndex]:
-        """Get market indices - use predefined names, just fetch prices in parallel"""
-
-        async def _fetch_index(symbol: str, name: str):
-            try:
-                hist = yf.Ticker(symbol).history(period="2d")
-
-                if hist.empty:
-                    return None
-
-                current = hist['Close'].iloc[-1]
-                previous = hist['Close'].iloc[-2] if len(hist) > 1 else current
-                change = current - previous
-                percent = (change / previous) * 100 if previous != 0 else 0
-
-                return MarketIndex(
-                    symbol=name,
-                    ticker=symbol,
-                    value=float(current),
-                    change=float(change),
-                    percent=float(percent)
+    def _fetch_price_bars(
+        self, symbols: List[str], start_date: date, end_date: date
+    ) -> Dict[str, List[PriceBarData]]:
+        """Blocking part of get_price_bars"""
+        # yf.download end is exclusive, so add one day
+        df = yf.download(
+            " ".join(symbols),
+            start=start_date.isoformat(),
+            end=(end_date + timedelta(days=1)).isoformat(),
+            progress=False,
+        )
+
+        if df.empty:
+            return {}
+
+        result: Dict[str, List[PriceBarData]] = {}
+        for sym, frame in self._symbol_frames(df, symbols).items():
+            frame = frame.dropna(subset=["Close"])
+            if frame.empty:
+                continue
+
+            def _col(name: str) -> pd.Series:
+                return frame[name] if name in frame.columns else frame["Close"]
+
+            volumes = frame["Volume"] if "Volume" in frame.columns else pd.Series(index=frame.index, dtype=float)
+            result[sym] = [
+                PriceBarData(
+                    date=ts.date(),
+                    open=float(o),
+                    high=float(h),
+                    low=float(l),
+                    close=float(c),
+                    volume=int(v) if pd.notna(v) else None
+                )
+                for ts, o, h, l, c, v in zip(
+                    frame.index, _col("Open"), _col("High"), _col("Low"), frame["Close"], volumes
                 )
-            except Exception as e:
-                logger.error(f"Error fetching index {symbol}: {e}")
-                return None
+            ]
 
+        return result
+
+    def _fetch_historical_closes(
+        self, symbols: List[str], start_date: date, end_date: date
+    ) -> Dict[str, Dict[date, float]]:
+        """Blocking part of get_historical_closes"""
+        # yf.download end is exclusive, so add one day
+        # Pass symbols as a space-separated string for consistent behavior
+        df = yf.download(
+            " ".join(symbols),
+            start=start_date.isoformat(),
+            end=(end_date + timedelta(days=1)).isoformat(),
+            progress=False,
+        )
+
+        if df.empty:
+            return {}
+
+        return {
+            sym: dict(zip(series.index.date, series.to_numpy(dtype=float).tolist()))
+            for sym, series in self._close_series(df, symbols).items()
+        }
+
+    def _fetch_quotes(self, symbols: List[str]) -> Dict[str, StockQuote]:
+        """Blocking part of get_quotes"""
+        # 5 days covers weekends and a holiday while still giving two closes
+        df = yf.download(" ".join(symbols), period="5d", progress=False)
+
+        if df.empty:
+            return {}
+
+        timestamp = datetime.now().isoformat()
+        quotes: Dict[str, StockQuote] = {}
+        for sym, series in self._close_series(df, symbols).items():
+            if series.empty:
+                continue
+
+            current_price = series.iloc[-1]
+            previous_close = series.iloc[-2] if len(series) > 1 else current_price
+
+            quotes[sym] = StockQuote(
+                symbol=sym,
+                current_price=float(current_price),
+                previous_close_price=float(previous_close),
+                timestamp=timestamp
+            )
+
+        return quotes
+
+    def _close_series(self, df, symbols: List[str]) -> Dict[str, pd.Series]:
+        """Split a yf.download() frame into one NaN-free close series per symbol"""
+        if len(symbols) == 1:
+            # Single symbol: columns are flat ['Close', 'High', ...]
+            close_col = df["Close"]
+            if hasattr(close_col, "columns"):
+                # MultiIndex case — extract the series
+                close_col = close_col.iloc[:, 0]
+            return {symbols[0]: close_col.dropna()}
+
+        # Multiple symbols: columns are MultiIndex ('Close', 'AAPL'), ...
+        close_df = df["Close"]
+        return {
+            sym: close_df[sym].dropna()
+            for sym in symbols
+            if sym in close_df.columns
+        }
+
+    def _symbol_frames(self, df, symbols: List[str]) -> Dict[str, pd.DataFrame]:
+        """Split a yf.download() frame into one flat OHLCV frame per symbol"""
+        if not isinstance(df.columns, pd.MultiIndex):
+            # Single symbol with flat columns ['Close', 'High', ...]
+            return {symbols[0]: df}
+
+        tickers = df.columns.get_level_values(1)
+        if len(symbols) == 1:
+            return {symbols[0]: df.droplevel(1, axis=1)}
+
+        return {
+            sym: df.xs(sym, level=1, axis=1)
+            for sym in symbols
+            if sym in tickers
+        }
+
+    async def get_market_indices(self) -> List[MarketIndex]:
+        """Get market indices - use predefined names, fetch all prices concurrently"""
         results = await asyncio.gather(*[
-            _fetch_index(symbol, name) for symbol, name in self.INDICES.items()
+            self._get_index(symbol, name) for symbol, name in self.INDICES.items()
         ])
 
         return [r for r in results if r is not None]
+
+    async def _get_index(self, symbol: str, name: str) -> Optional[MarketIndex]:
+        """Fetch one index on its own executor thread, giving up after the per-index timeout"""
+        try:
+            return await asyncio.wait_for(
+                self._run(self._fetch_index, symbol, name),
+                timeout=settings.MARKET_INDEX_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Timed out fetching index {symbol}")
+            return None
+        except Exception as e:
+            logger.error(f"Error fetching index {symbol}: {e}")
+            return None
+
+    def _fetch_index(self, symbol: str, name: str) -> Optional[MarketIndex]:
+        """Blocking part of _get_index"""
+        hist = yf.Ticker(symbol).history(period="2d")
+
+        if hist.empty:
+            return None
+
+        current = hist['Close'].iloc[-1]
+        previous = hist['Close'].iloc[-2] if len(hist) > 1 else current
+        change = current - previous
+        percent = (change / previous) * 100 if previous != 0 else 0
+
+        return MarketIndex(
+            symbol=name,
+            ticker=symbol,
+            value=float(current),
+            change=float(change),
+            percent=float(percent)
+        )
     
     async def get_market_movers(self) -> Dict[str, List[MarketMover]]:
-        """Get top gainers and losers with company names"""
-        return {
-            'gainers': self._get_screener_data('day_gainers'),
-            'losers': self._get_screener_data('day_losers')
-        }
+        """Get top gainers and losers with company names, both screens fetched concurrently"""
+        gainers, losers = await asyncio.gather(
+            self._get_movers('day_gainers'),
+            self._get_movers('day_losers')
+        )
+        return {'gainers': gainers, 'losers': losers}
+
+    async def _get_movers(self, screen_type: str) -> List[MarketMover]:
+        """Run one screener, returning an empty list on failure"""
+        try:
+            return await self._run(self._get_screener_data, screen_type)
+        except Exception as e:
+            logger.error(f"Error fetching {screen_type}: {e}")
+            return []
     
     async def validate_symbol(self, symbol: str) -> bool:
         """Check if symbol is valid"""
         try:
-            info = yf.Ticker(symbol).info
-            return bool(info.get('symbol') or info.get('shortName'))
+            return await self._run(self._fetch_symbol_validity, symbol)
         except Exception as e:
             logger.error(f"Error validating symbol {symbol}: {e}")
             raise
     
+    def _fetch_stock_data(self, symbol: str) -> Optional[StockData]:
+        """Blocking part of get_stock_data"""
+        ticker = yf.Ticker(symbol)
+        info = ticker.info
+        hist = ticker.history(period="2d")
+        
+        if hist.empty:
+            return None
+        
+        current_price = hist['Close'].iloc[-1]
+        previous_close = hist['Close'].iloc[-2] if len(hist) > 1 else current_price
+        
+        return StockData(
+            symbol=symbol.upper(),
+            company_name=info.get('longName', info.get('shortName', symbol)),
+            current_price=float(current_price),
+            previous_close_price=float(previous_close),
+            market_capitalization=self._format_market_cap(info.get('marketCap', 0)),
+            timestamp=datetime.now().isoformat()
+        )
+    
+    def _fetch_symbol_metadata(self, symbol: str) -> Optional[SymbolMetadata]:
+        """Blocking part of get_symbol_metadata"""
+        info = yf.Ticker(symbol).info
+        if not (info.get('symbol') or info.get('shortName')):
+            return None
+        
+        market_cap = info.get('marketCap')
+        return SymbolMetadata(
+            symbol=symbol.upper(),
+            company_name=info.get('longName', info.get('shortName', symbol)),
+            market_cap=float(market_cap) if market_cap else None
+        )
+    
+    def _fetch_current_price(self, symbol: str) -> Optional[float]:
+        """Blocking part of get_current_price"""
+        hist = yf.Ticker(symbol).history(period="1d")
+        return float(hist['Close'].iloc[-1]) if not hist.empty else None
+    
+    def _fetch_symbol_validity(self, symbol: str) -> bool:
+        """Blocking part of validate_symbol"""
+        info = yf.Ticker(symbol).info
+        return bool(info.get('symbol') or info.get('shortName'))
+    
     def _format_market_cap(self, market_cap: int) -> str:
         """Format market cap with appropriate suffix"""
-        if not market_cap:
-            return "N/A"
-        
-        if market_cap >= 1e12:
-            return f"${market_cap/1e12:.2f}T"
-        elif market_cap >= 1e9:
-            return f"${market_cap/1e9:.2f}B" 
-        elif market_cap >= 1e6:
-            return f"${market_cap/1e6:.2f}M"
-        else:
-            return f"${market_cap:,.0f}"
+        return format_market_cap(market_cap)
     
     def _get_screener_data(self, screen_type: str) -> List[MarketMover]:
-        """Get data from yfinance screener including company names"""
-        try:
-            results = yf.screen(screen_type)
-            
-            if not results or 'quotes' not in results:
-                return []
-            
-            movers = []
-            for stock in results['quotes'][:10]:  # top 10
-                movers.append(MarketMover(
-                    symbol=stock.get('symbol', ''),
-                    name=stock.get('longName', stock.get('shortName', stock.get('symbol', ''))),
-                    price=float(stock.get('regularMarketPrice', 0)),
-                    change=float(stock.get('regularMarketChange', 0)),
-                    change_percent=float(stock.get('regularMarketChangePercent', 0))
-                ))
-            
-            return movers
-            
-        except Exception as e:
-            logger.error(f"Error fetching {screen_type}: {e}")
+        """Get data from yfinance screener including company names (blocking - run on the executor)"""
+        results = yf.screen(screen_type)
+        
+        if not results or 'quotes' not in results:
             return []
+        
+        movers = []
+        for stock in results['quotes'][:10]:  # top 10
+            movers.append(MarketMover(
+                symbol=stock.get('symbol', ''),
+                name=stock.get('longName', stock.get('shortName', stock.get('symbol', ''))),
+                price=float(stock.get('regularMarketPrice', 0)),
+                change=float(stock.get('regularMarketChange', 0)),
+                change_percent=float(stock.get('regularMarketChangePercent', 0))
+            ))
+        
+        return movers
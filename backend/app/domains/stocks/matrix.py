@@ -0,0 +1,26 @@
+# app/domains/stocks/matrix.py
+
+import pandas as pd
+from typing import List, Optional
+from datetime import date
+
+def densify_closes(
+    frame: pd.DataFrame, start_date: date, end_date: date, symbols: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """Turn a sparse (trading date x symbol) close frame into a dense calendar-day matrix
+
+    Weekends and holidays carry the last close forward in one vectorized ffill.
+    Closes before start_date only seed the carry-forward and are sliced off.
+    Days before a symbol's first close stay NaN so callers can pick a fallback.
+    """
+    if symbols is not None:
+        frame = frame.reindex(columns=symbols)
+    frame = frame.copy()
+    frame.index = pd.to_datetime(frame.index)
+    frame = frame.sort_index()
+
+    start = pd.Timestamp(start_date)
+    first = min(frame.index[0], start) if len(frame.index) else start
+    days = pd.date_range(first, pd.Timestamp(end_date), freq="D")
+
+    return frame.reindex(days).ffill().loc[start:]
@@ -0,0 +1,34 @@
+# app/domains/stocks/models.py
+
+from sqlalchemy import Column, String, Float, Date, DateTime, BigInteger, func
+from app.infrastructure.database import Base
+
+class SymbolMetadata(Base):
+    """Slow-changing company details, kept apart from the volatile price path"""
+    __tablename__ = "symbol_metadata"
+
+    symbol = Column(String, primary_key=True, index=True)
+    company_name = Column(String)
+    market_cap = Column(Float, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class ListedSymbol(Base):
+    """Every US-listed ticker, refreshed from the exchange symbol directories"""
+    __tablename__ = "symbol_universe"
+
+    symbol = Column(String, primary_key=True, index=True)
+    name = Column(String)
+    exchange = Column(String, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class PriceBar(Base):
+    """Daily OHLCV bar - local price history synced incrementally from upstream"""
+    __tablename__ = "price_bars"
+
+    symbol = Column(String, primary_key=True)
+    date = Column(Date, primary_key=True)
+    open = Column(Float)
+    high = Column(Float)
+    low = Column(Float)
+    close = Column(Float, nullable=False)
+    volume = Column(BigInteger, nullable=True)
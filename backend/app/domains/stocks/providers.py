@@ -0,0 +1,57 @@
+# app/domains/stocks/providers.py
+
+from typing import Dict, List, Optional, Protocol, runtime_checkable
+from datetime import date
+import logging
+
+from app.core.config import settings
+from app.domains.stocks.schemas import StockData, StockQuote, SymbolMetadata, PriceBarData, MarketIndex, MarketMover
+
+logger = logging.getLogger(__name__)
+
+@runtime_checkable
+class MarketDataProvider(Protocol):
+    """Interface every market data source implements (yfinance, local replay, ...)"""
+
+    async def get_stock_data(self, symbol: str) -> Optional[StockData]: ...
+
+    async def get_current_price(self, symbol: str) -> Optional[float]: ...
+
+    async def get_symbol_metadata(self, symbol: str) -> Optional[SymbolMetadata]: ...
+
+    async def get_quotes(self, symbols: List[str]) -> Dict[str, StockQuote]: ...
+
+    async def get_historical_closes(
+        self, symbols: List[str], start_date: date, end_date: date
+    ) -> Dict[str, Dict[date, float]]: ...
+
+    async def get_price_bars(
+        self, symbols: List[str], start_date: date, end_date: date
+    ) -> Dict[str, List[PriceBarData]]: ...
+
+    async def get_market_indices(self) -> List[MarketIndex]: ...
+
+    async def get_market_movers(self) -> Dict[str, List[MarketMover]]: ...
+
+    async def validate_symbol(self, symbol: str) -> bool: ...
+
+# replay data is loaded once per process
+_replay_provider = None
+
+def get_market_data_provider() -> MarketDataProvider:
+    """Return the provider selected by settings.MARKET_DATA_PROVIDER"""
+    global _replay_provider
+
+    provider = settings.MARKET_DATA_PROVIDER.lower()
+    if provider == "yfinance":
+        from app.domains.stocks.external import YFinanceClient
+        return YFinanceClient()
+
+    if provider == "replay":
+        if _replay_provider is None:
+            from app.domains.stocks.replay import ReplayProvider
+            _replay_provider = ReplayProvider(settings.MARKET_DATA_REPLAY_PATH)
+            logger.info(f"Using replay market data from {settings.MARKET_DATA_REPLAY_PATH}")
+        return _replay_provider
+
+    raise ValueError(f"Unknown market data provider: {settings.MARKET_DATA_PROVIDER}")
@@ -0,0 +1,186 @@
+# app/domains/stocks/replay.py
+
+import pandas as pd
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+from datetime import date, datetime
+
+from app.domains.stocks.external import YFinanceClient, format_market_cap
+from app.domains.stocks.schemas import StockData, StockQuote, SymbolMetadata, PriceBarData, MarketIndex, MarketMover
+
+logger = logging.getLogger(__name__)
+
+class ReplayProvider:
+    """Deterministic market data served from a recorded CSV/Parquet file
+
+    The file is long-format with one row per symbol and trading day:
+    symbol, date, close and optionally open, high, low, volume, name, market_cap. The latest close is the
+    current price and the close before it is the previous close, so the same file
+    always produces the same numbers - useful for offline load tests.
+    """
+
+    REQUIRED_COLUMNS = {"symbol", "date", "close"}
+
+    def __init__(self, path: str):
+        if not path:
+            raise ValueError("MARKET_DATA_REPLAY_PATH must be set for the replay provider")
+
+        df = self._read(Path(path))
+        missing = self.REQUIRED_COLUMNS - set(df.columns)
+        if missing:
+            raise ValueError(f"Replay file {path} is missing columns: {sorted(missing)}")
+
+        df["symbol"] = df["symbol"].astype(str).str.upper()
+        df["date"] = pd.to_datetime(df["date"]).dt.date
+        df = df.dropna(subset=["close"]).sort_values(["symbol", "date"])
+
+        # {symbol: {date: close}} in date order
+        self.closes: Dict[str, Dict[date, float]] = {
+            sym: dict(zip(group["date"], group["close"].astype(float)))
+            for sym, group in df.groupby("symbol")
+        }
+        self.bars: Dict[str, List[PriceBarData]] = {}
+        for sym, group in df.groupby("symbol"):
+            def _col(name: str):
+                return group[name] if name in group.columns else group["close"]
+            volumes = group["volume"] if "volume" in group.columns else [None] * len(group)
+            self.bars[sym] = [
+                PriceBarData(
+                    date=d, open=float(o), high=float(h), low=float(l), close=float(c),
+                    volume=int(v) if pd.notna(v) else None
+                )
+                for d, o, h, l, c, v in zip(
+                    group["date"], _col("open"), _col("high"), _col("low"), group["close"], volumes
+                )
+            ]
+
+        self.metadata: Dict[str, SymbolMetadata] = {}
+        for sym, group in df.groupby("symbol"):
+            last = group.iloc[-1]
+            name = last.get("name") if "name" in group.columns else None
+            market_cap = last.get("market_cap") if "market_cap" in group.columns else None
+            self.metadata[sym] = SymbolMetadata(
+                symbol=sym,
+                company_name=name if isinstance(name, str) and name else sym,
+                market_cap=float(market_cap) if pd.notna(market_cap) else None
+            )
+
+        logger.info(f"Loaded replay data for {len(self.closes)} symbols from {path}")
+
+    def _read(self, path: Path) -> pd.DataFrame:
+        """Load the recorded data - parquet needs pyarrow or fastparquet installed"""
+        if path.suffix in (".parquet", ".pq"):
+            return pd.read_parquet(path)
+        return pd.read_csv(path)
+
+    def _last_two(self, symbol: str) -> Optional[tuple]:
+        """(current, previous) close for a symbol, or None if unknown"""
+        history = self.closes.get(symbol.upper())
+        if not history:
+            return None
+        prices = list(history.values())
+        return prices[-1], prices[-2] if len(prices) > 1 else prices[-1]
+
+    async def get_stock_data(self, symbol: str) -> Optional[StockData]:
+        prices = self._last_two(symbol)
+        if prices is None:
+            return None
+
+        metadata = self.metadata[symbol.upper()]
+        return StockData(
+            symbol=symbol.upper(),
+            company_name=metadata.company_name,
+            current_price=prices[0],
+            previous_close_price=prices[1],
+            market_capitalization=format_market_cap(metadata.market_cap),
+            timestamp=datetime.now().isoformat()
+        )
+
+    async def get_current_price(self, symbol: str) -> Optional[float]:
+        prices = self._last_two(symbol)
+        return prices[0] if prices else None
+
+    async def get_symbol_metadata(self, symbol: str) -> Optional[SymbolMetadata]:
+        return self.metadata.get(symbol.upper())
+
+    async def get_quotes(self, symbols: List[str]) -> Dict[str, StockQuote]:
+        timestamp = datetime.now().isoformat()
+        quotes: Dict[str, StockQuote] = {}
+        for sym in symbols:
+            prices = self._last_two(sym)
+            if prices is None:
+                continue
+            quotes[sym] = StockQuote(
+                symbol=sym,
+                current_price=prices[0],
+                previous_close_price=prices[1],
+                timestamp=timestamp
+            )
+        return quotes
+
+    async def get_historical_closes(
+        self, symbols: List[str], start_date: date, end_date: date
+    ) -> Dict[str, Dict[date, float]]:
+        result: Dict[str, Dict[date, float]] = {}
+        for sym in symbols:
+            history = {
+                d: price for d, price in self.closes.get(sym.upper(), {}).items()
+                if start_date <= d <= end_date
+            }
+            if history:
+                result[sym] = history
+        return result
+
+    async def get_price_bars(
+        self, symbols: List[str], start_date: date, end_date: date
+    ) -> Dict[str, List[PriceBarData]]:
+        result: Dict[str, List[PriceBarData]] = {}
+        for sym in symbols:
+            bars = [bar for bar in self.bars.get(sym.upper(), []) if start_date <= bar.date <= end_date]
+            if bars:
+                result[sym] = bars
+        return result
+
+    async def get_market_indices(self) -> List[MarketIndex]:
+        """Indices are served when the file includes their tickers (^GSPC, ...)"""
+        indices = []
+        for ticker, name in YFinanceClient.INDICES.items():
+            prices = self._last_two(ticker)
+            if prices is None:
+                continue
+            current, previous = prices
+            change = current - previous
+            indices.append(MarketIndex(
+                symbol=name,
+                ticker=ticker,
+                value=current,
+                change=change,
+                percent=(change / previous) * 100 if previous != 0 else 0
+            ))
+        return indices
+
+    async def get_market_movers(self) -> Dict[str, List[MarketMover]]:
+        """Rank the recorded symbols by their last daily change"""
+        movers = []
+        for sym in self.closes:
+            if sym.startswith("^"):
+                continue
+            current, previous = self._last_two(sym)
+            change = current - previous
+            movers.append(MarketMover(
+                symbol=sym,
+                name=self.metadata[sym].company_name,
+                price=current,
+                change=change,
+                change_percent=(change / previous) * 100 if previous != 0 else 0
+            ))
+
+        movers.sort(key=lambda m: m.change_percent, reverse=True)
+        return {
+            'gainers': [m for m in movers if m.change_percent > 0][:10],
+            'losers': [m for m in reversed(movers) if m.change_percent < 0][:10]
+        }
+
+    async def validate_symbol(self, symbol: str) -> bool:
+        return symbol.upper() in self.closes
@@ -0,0 +1,141 @@
+# app/domains/stocks/repositories.py
+
+import pandas as pd
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from typing import Dict, List, Optional, Tuple
+from datetime import date, datetime
+from app.domains.stocks.models import SymbolMetadata, ListedSymbol, PriceBar
+
+# dialects with INSERT ... ON CONFLICT DO UPDATE
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+class SymbolMetadataRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_by_symbols(self, symbols: List[str]) -> List[SymbolMetadata]:
+        if not symbols:
+            return []
+        return self.db.query(SymbolMetadata).filter(SymbolMetadata.symbol.in_(symbols)).all()
+
+    def get_stale(self, updated_before: datetime, limit: Optional[int] = None) -> List[SymbolMetadata]:
+        query = self.db.query(SymbolMetadata).filter(
+            SymbolMetadata.updated_at < updated_before
+        ).order_by(SymbolMetadata.updated_at)
+        if limit:
+            query = query.limit(limit)
+        return query.all()
+
+    def upsert(self, symbol: str, company_name: str, market_cap: Optional[float]) -> SymbolMetadata:
+        self.upsert_many([(symbol, company_name, market_cap)])
+        return self.db.get(SymbolMetadata, symbol)
+
+    def upsert_many(self, rows: List[Tuple[str, str, Optional[float]]]) -> int:
+        """Insert or overwrite (symbol, company_name, market_cap) rows in one statement and commit
+
+        ON CONFLICT makes concurrent first inserts of a symbol safe.
+        """
+        values = {
+            symbol: {"symbol": symbol, "company_name": company_name, "market_cap": market_cap}
+            for symbol, company_name, market_cap in rows
+        }
+        if not values:
+            return 0
+
+        dialect = self.db.get_bind().dialect.name
+        if dialect not in _UPSERT_INSERTS:
+            for row in values.values():
+                self.db.merge(SymbolMetadata(**row, updated_at=func.now()))
+            self.db.commit()
+            return len(values)
+
+        stmt = _UPSERT_INSERTS[dialect](SymbolMetadata).values(list(values.values()))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SymbolMetadata.symbol],
+            set_={
+                "company_name": stmt.excluded.company_name,
+                "market_cap": stmt.excluded.market_cap,
+                # set explicitly so a refresh with unchanged values still counts as fresh
+                "updated_at": func.now()
+            }
+        )
+        self.db.execute(stmt)
+        self.db.commit()
+        return len(values)
+
+class ListedSymbolRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_all(self) -> List[ListedSymbol]:
+        return self.db.query(ListedSymbol).all()
+
+    def replace_all(self, entries: Dict[str, Tuple[str, str]]) -> int:
+        """Swap the universe for {symbol: (name, exchange)} in one transaction"""
+        self.db.query(ListedSymbol).delete()
+        self.db.bulk_save_objects([
+            ListedSymbol(symbol=symbol, name=name, exchange=exchange)
+            for symbol, (name, exchange) in entries.items()
+        ])
+        self.db.commit()
+        return len(entries)
+
+class PriceBarRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_date_bounds(self, symbols: List[str]) -> Dict[str, tuple]:
+        """{symbol: (first_date, last_date)} for symbols that have stored bars"""
+        if not symbols:
+            return {}
+        rows = self.db.query(
+            PriceBar.symbol, func.min(PriceBar.date), func.max(PriceBar.date)
+        ).filter(PriceBar.symbol.in_(symbols)).group_by(PriceBar.symbol).all()
+        return {symbol: (first, last) for symbol, first, last in rows}
+
+    def get_bars(self, symbol: str, start_date: date, end_date: date) -> List[PriceBar]:
+        return self.db.query(PriceBar).filter(
+            PriceBar.symbol == symbol,
+            PriceBar.date >= start_date,
+            PriceBar.date <= end_date
+        ).order_by(PriceBar.date).all()
+
+    def get_close_frame(self, symbols: List[str], start_date: date, end_date: date) -> pd.DataFrame:
+        """Stored closes as a (date x symbol) frame, built without per-row dicts"""
+        rows = []
+        if symbols:
+            rows = self.db.query(PriceBar.date, PriceBar.symbol, PriceBar.close).filter(
+                PriceBar.symbol.in_(symbols),
+                PriceBar.date >= start_date,
+                PriceBar.date <= end_date
+            ).all()
+        frame = pd.DataFrame(rows, columns=["date", "symbol", "close"])
+        return frame.pivot(index="date", columns="symbol", values="close")
+
+    def upsert_bars(self, symbol: str, bars: list) -> int:
+        """Insert or overwrite bars (PriceBarData) for one symbol, returns the number written"""
+        if not bars:
+            return 0
+        dates = [bar.date for bar in bars]
+        existing = {
+            row.date: row for row in self.db.query(PriceBar).filter(
+                PriceBar.symbol == symbol,
+                PriceBar.date >= min(dates),
+                PriceBar.date <= max(dates)
+            ).all()
+        }
+
+        for bar in bars:
+            row = existing.get(bar.date)
+            if row is None:
+                row = PriceBar(symbol=symbol, date=bar.date)
+                self.db.add(row)
+            row.open = bar.open
+            row.high = bar.high
+            row.low = bar.low
+            row.close = bar.close
+            row.volume = bar.volume
+        self.db.commit()
+        return len(bars)
@@ -1,7 +1,10 @@
 # app/domains/stocks/schemas.py
 
 from pydantic import BaseModel, validator
-from typing import List
+from typing import List, Optional
+from datetime import date
+
+from app.core.config import settings
 
 # core stock data - contains everything we might need
 class StockData(BaseModel):
@@ -12,6 +15,30 @@ class StockData(BaseModel):
     market_capitalization: str
     timestamp: str
 
+# lightweight price-only quote (batch endpoint)
+class StockQuote(BaseModel):
+    symbol: str
+    current_price: float
+    previous_close_price: float
+    timestamp: str
+    stale: bool = False
+    age_seconds: Optional[float] = None
+
+# static company details (long-lived, refreshed daily)
+class SymbolMetadata(BaseModel):
+    symbol: str
+    company_name: str
+    market_cap: Optional[float] = None
+
+# one daily OHLCV bar
+class PriceBarData(BaseModel):
+    date: date
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: Optional[int] = None
+
 # market data schemas
 class MarketIndex(BaseModel):
     symbol: str
@@ -28,12 +55,34 @@ class MarketMover(BaseModel):
     change_percent: float
 
 # response containers
+# stale/age_seconds mark values served from cache while a refresh runs
 class MarketIndicesResponse(BaseModel):
     indices: List[MarketIndex]
+    stale: bool = False
+    age_seconds: float = 0.0
 
 class MarketMoversResponse(BaseModel):
     gainers: List[MarketMover]
     losers: List[MarketMover]
+    stale: bool = False
+    age_seconds: float = 0.0
+
+class PriceHistoryResponse(BaseModel):
+    symbol: str
+    period: str
+    bars: List[PriceBarData]
+
+class SymbolSearchResult(BaseModel):
+    symbol: str
+    name: str
+
+class SymbolSearchResponse(BaseModel):
+    query: str
+    results: List[SymbolSearchResult]
+
+class QuotesResponse(BaseModel):
+    quotes: List[StockQuote]
+    missing: List[str] = []
 
 # simple request validation
 class SymbolRequest(BaseModel):
@@ -43,4 +92,17 @@ class SymbolRequest(BaseModel):
     def validate_symbol(cls, v):
         if not v or len(v.strip()) == 0:
             raise ValueError('Symbol cannot be empty')
-        return v.upper().strip()
\ No newline at end of file
+        return v.upper().strip()
+
+class QuotesRequest(BaseModel):
+    symbols: List[str]
+
+    @validator('symbols')
+    def validate_symbols(cls, v):
+        # normalize and de-duplicate while keeping request order
+        symbols = list(dict.fromkeys(s.upper().strip() for s in v if s and s.strip()))
+        if not symbols:
+            raise ValueError('At least one symbol is required')
+        if len(symbols) > settings.MAX_QUOTE_BATCH_SIZE:
+            raise ValueError(f'At most {settings.MAX_QUOTE_BATCH_SIZE} symbols per request')
+        return symbols
@@ -1,15 +1,92 @@
 # app/domains/stocks/services.py
 
+import asyncio
 import logging
-from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+import time
+import pandas as pd
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Set, Tuple
+from datetime import date, datetime, timedelta, timezone
+from sqlalchemy.orm import Session
 
-from app.domains.stocks.external import YFinanceClient
-from app.domains.stocks.schemas import StockData, MarketIndex, MarketMover, MarketIndicesResponse, MarketMoversResponse
+from app.domains.stocks.external import format_market_cap
+from app.domains.stocks.matrix import densify_closes
+from app.domains.stocks.providers import get_market_data_provider
+from app.domains.stocks.repositories import SymbolMetadataRepository, ListedSymbolRepository, PriceBarRepository
+from app.infrastructure.singleflight import SingleFlight
+from app.domains.stocks.universe import fetch_symbol_directory, symbol_index
+from app.domains.stocks.schemas import StockData, SymbolMetadata, PriceBarData, MarketIndex, MarketMover, MarketIndicesResponse, MarketMoversResponse
+from app.core import market_calendar
+from app.core.config import settings, today_et, ET
 from app.core.exceptions import BusinessLogicError
+from app.infrastructure.cache import MemoryCache, TieredCache, async_cache_service, register_cache
+from app.infrastructure.database import SessionLocal
 
 logger = logging.getLogger(__name__)
 
+# cache durations per key type
+PRICE_CACHE_TTL = timedelta(minutes=1)
+COMPANY_INFO_CACHE_TTL = timedelta(hours=24)
+METADATA_MAX_AGE = timedelta(days=1)
+
+# how long past expiry a value may still be served while it is being refreshed
+QUOTE_MAX_STALENESS = timedelta(minutes=15)
+MARKET_MAX_STALENESS = timedelta(hours=1)
+MARKET_CACHE_TTL = timedelta(minutes=5)
+VALIDATION_CACHE_TTL = timedelta(minutes=60)
+# after the close, wait for the closing auction prints before holding prices overnight
+CLOSE_SETTLE_PERIOD = timedelta(minutes=15)
+
+# a completed sync covers a symbol until the next trading day
+BARS_SYNC_CACHE_TTL = timedelta(hours=6)
+
+# how far before a window to read so its first days have a close to carry forward
+CARRY_FORWARD_LOOKBACK = timedelta(days=7)
+
+# chart periods served from the local price bar store
+HISTORY_PERIOD_DAYS = {"5d": 5, "1mo": 30, "3mo": 90, "6mo": 180, "1y": 365, "5y": 365 * 5}
+
+# redis key for the movers lists shared by all workers
+SHARED_MOVERS_KEY = "stocks:market_movers"
+
+# process-wide quote cache - shared by every StockService instance in this worker
+quote_cache = MemoryCache(max_size=settings.QUOTE_CACHE_MAX_SIZE)
+
+# quote_cache backed by redis, so one worker's fetch serves the others
+shared_quote_cache = register_cache("stocks", TieredCache(
+    quote_cache,
+    async_cache_service,
+    namespace="stocks",
+    shared_prefixes=("quote_", "price_", "company_", "valid_", "market_indices")
+))
+
+# symbols upstream had no data for - a separate LRU so a flood of bad tickers
+# can only evict each other, never real quotes
+missing_symbol_cache = register_cache("missing_symbols", MemoryCache(
+    max_size=settings.NEGATIVE_CACHE_MAX_SIZE,
+    default_ttl=timedelta(seconds=settings.NEGATIVE_CACHE_TTL_SECONDS)
+))
+
+# concurrent misses for the same key share one upstream fetch
+quote_flight = SingleFlight()
+
+# bumped whenever this worker stores fresh quotes, so anything priced at an
+# older version knows the quote cache may have moved
+_quote_version = 0
+
+def quote_version() -> int:
+    return _quote_version
+
+# in-flight stale-while-revalidate refreshes
+_background_refreshes: Set[asyncio.Task] = set()
+
+def market_aware_ttl(ttl: timedelta, now: Optional[datetime] = None) -> timedelta:
+    """The regular TTL during the session, otherwise hold prices until the next open"""
+    now = now or datetime.now(ET)
+    if market_calendar.is_open(now) or market_calendar.is_open(now - CLOSE_SETTLE_PERIOD):
+        return ttl
+    return max(ttl, timedelta(seconds=market_calendar.seconds_until_open(now)))
+
 class StockError(BusinessLogicError):
     """Base exception for stock domain"""
     pass
@@ -17,55 +94,53 @@ class StockError(BusinessLogicError):
 class StockService:
     """Business logic for stock data management"""
     
-    def __init__(self):
-        self.client = YFinanceClient()
-        self._cache = {}
-        self._cache_duration = timedelta(minutes=5)  # 5 minute cache
+    def __init__(self, db: Optional[Session] = None):
+        self.db = db
+        self.client = get_market_data_provider()
+        self._cache = shared_quote_cache
+        self._missing = missing_symbol_cache
+        self._flight = quote_flight
+        self._shared = async_cache_service
     
     async def get_stock_data(self, symbol: str) -> Dict[str, any]:
-        """Get complete stock data with caching"""
-        cache_key = f"stock_data_{symbol.upper()}"
-        
-        # check cache
-        if self._is_cache_valid(cache_key):
-            logger.info(f"Returning cached stock data for {symbol}")
-            return self._cache[cache_key]['data']
-        
-        # fetch fresh data
-        stock_data = await self.client.get_stock_data(symbol)
-        
-        if stock_data:
-            result = {
-                "symbol": stock_data.symbol,
-                "company_name": stock_data.company_name,
-                "current_price": stock_data.current_price,
-                "previous_close_price": stock_data.previous_close_price,
-                "market_capitalization": stock_data.market_capitalization,
-                "timestamp": stock_data.timestamp
-            }
-            
-            # cache the result
-            self._cache[cache_key] = {
-                'data': result,
-                'timestamp': datetime.now()
-            }
-            
-            logger.info(f"Fetched fresh stock data for {symbol}")
-            return result
-        
-        raise Exception(f"Could not fetch stock data for {symbol}")
+        """Get complete stock data - fresh price plus long-lived company details"""
+        symbol = symbol.upper()
+
+        # price comes from the fast quote path, name/market cap from the metadata store
+        quotes = await self.get_quotes([symbol])
+        quote = quotes.get(symbol)
+        if not quote:
+            raise Exception(f"Could not fetch stock data for {symbol}")
+
+        info = (await self.get_company_info([symbol])).get(symbol, {})
+
+        return {
+            "symbol": symbol,
+            "company_name": info.get("company_name", symbol),
+            "current_price": quote["current_price"],
+            "previous_close_price": quote["previous_close_price"],
+            "market_capitalization": info.get("market_capitalization", "N/A"),
+            "timestamp": quote["timestamp"]
+        }
     
     async def get_current_price(self, symbol: str) -> Dict[str, any]:
-        """Get current price only - faster endpoint"""
+        """Get current price only - faster endpoint
+
+        Never served stale: this is the price orders execute at.
+        """
         cache_key = f"price_{symbol.upper()}"
         
         # check cache (shorter cache for prices)
-        if self._is_cache_valid(cache_key, duration_minutes=1):
+        cached = await self._cache.get(cache_key)
+        if cached is not None:
             logger.info(f"Returning cached price for {symbol}")
-            return self._cache[cache_key]['data']
+            return cached
+
+        if self.is_known_missing(symbol):
+            raise StockError(f"No price data for {symbol.upper()}")
         
         # fetch fresh price
-        price = await self.client.get_current_price(symbol)
+        price = await self._flight.do(cache_key, lambda: self.client.get_current_price(symbol))
         
         if price is not None:
             result = {
@@ -75,139 +150,473 @@ class StockService:
             }
             
             # cache the result
-            self._cache[cache_key] = {
-                'data': result,
-                'timestamp': datetime.now()
-            }
+            await self._cache.set(cache_key, result, market_aware_ttl(PRICE_CACHE_TTL))
             
             logger.info(f"Fetched fresh price for {symbol}")
             return result
-        
-        raise Exception(f"Could not fetch price for {symbol}")
+
+        # upstream errors re-raise above, so None really means no data
+        self._mark_missing([symbol.upper()])
+        raise StockError(f"Could not fetch price for {symbol}")
     
+    async def get_quotes(self, symbols: List[str]) -> Dict[str, Dict[str, any]]:
+        """Get current price and previous close for many symbols with one upstream call"""
+        symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        results = {}
+        missing = []
+        stale = []
+
+        # serve what we can from cache - stale quotes are served while they revalidate
+        symbols = [s for s in symbols if not self.is_known_missing(s)]
+        entries = await self._cache.get_entries([f"quote_{s}" for s in symbols])
+        for symbol in symbols:
+            entry = entries.get(f"quote_{symbol}")
+            if entry is None:
+                missing.append(symbol)
+                continue
+
+            quote, age, is_fresh = entry
+            if is_fresh:
+                results[symbol] = quote
+            else:
+                results[symbol] = dict(quote, stale=True, age_seconds=round(age, 1))
+                stale.append(symbol)
+
+        if stale:
+            # distinct key from _fetch_quotes' own single-flight key, which the refresh joins
+            self._spawn_refresh("refresh_quotes_" + ",".join(sorted(stale)), lambda: self._fetch_quotes(stale))
+
+        if not missing:
+            return results
+
+        # fetch every cache miss in a single batch
+        results.update(await self._fetch_quotes(missing))
+        return results
+
+    async def refresh_quotes(self, symbols: List[str], chunk_size: int = 100) -> int:
+        """Re-fetch quotes into the shared cache regardless of freshness, returns quotes refreshed"""
+        symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        refreshed = 0
+        for i in range(0, len(symbols), chunk_size):
+            refreshed += len(await self._fetch_quotes(symbols[i:i + chunk_size]))
+        return refreshed
+
+    async def _fetch_quotes(self, symbols: List[str]) -> Dict[str, Dict[str, any]]:
+        """Fetch quotes in one upstream call and write them to the cache"""
+        global _quote_version
+        batch_key = "quotes_" + ",".join(sorted(symbols))
+        quotes = await self._flight.do(batch_key, lambda: self.client.get_quotes(symbols))
+
+        results = {}
+        prices = {}
+        for symbol, quote in quotes.items():
+            results[symbol] = {
+                "symbol": quote.symbol,
+                "current_price": quote.current_price,
+                "previous_close_price": quote.previous_close_price,
+                "timestamp": quote.timestamp
+            }
+            prices[f"price_{symbol}"] = {
+                "symbol": symbol,
+                "current_price": quote.current_price,
+                "timestamp": quote.timestamp
+            }
+            self._missing.delete(f"missing_{symbol}")
+
+        if quotes:
+            _quote_version += 1
+
+        # cache as quotes and as plain prices so get_current_price benefits too
+        ttl = market_aware_ttl(PRICE_CACHE_TTL)
+        await self._cache.set_many(
+            {f"quote_{symbol}": result for symbol, result in results.items()}, ttl, stale_ttl=QUOTE_MAX_STALENESS
+        )
+        await self._cache.set_many(prices, ttl)
+
+        # a batch can come back partial or empty during an outage, so only
+        # remember absent tickers we know aren't listed
+        absent = [s for s in symbols if s not in quotes]
+        self._mark_missing([s for s in absent if len(symbol_index) and s not in symbol_index])
+
+        logger.info(f"Fetched {len(quotes)}/{len(symbols)} fresh quotes in one batch")
+        return results
+
+    async def get_company_info(self, symbols: List[str]) -> Dict[str, Dict[str, str]]:
+        """Get company name and market cap for many symbols (never raises)
+
+        Looks in the in-process cache, then the symbol_metadata table, and only
+        goes upstream for symbols we have never seen.
+        """
+        symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        results = {}
+        missing = []
+
+        cached = await self._cache.get_entries([f"company_{s}" for s in symbols], allow_stale=False)
+        for symbol in symbols:
+            entry = cached.get(f"company_{symbol}")
+            if entry is not None:
+                results[symbol] = entry[0]
+            else:
+                missing.append(symbol)
+
+        if not missing:
+            return results
+
+        # persisted metadata - served regardless of age, the daily job keeps it fresh
+        try:
+            with self._session() as db:
+                stored = {
+                    row.symbol: self._company_info(row.symbol, row.company_name, row.market_cap)
+                    for row in SymbolMetadataRepository(db).get_by_symbols(missing)
+                }
+            results.update(await self._remember_company_info(stored))
+        except Exception as e:
+            logger.warning(f"Could not read symbol metadata: {e}")
+
+        unknown = [s for s in missing if s not in results]
+        if unknown:
+            fetched = await asyncio.gather(*[
+                self._flight.do(f"metadata_{s}", lambda s=s: self.client.get_symbol_metadata(s))
+                for s in unknown
+            ])
+            fetched = [m for m in fetched if m is not None]
+            self._store_metadata(fetched)
+            results.update(await self._remember_company_info({
+                m.symbol: self._company_info(m.symbol, m.company_name, m.market_cap) for m in fetched
+            }))
+
+        return results
+
+    async def refresh_stale_metadata(self, max_age: timedelta = METADATA_MAX_AGE, limit: int = 200) -> int:
+        """Re-fetch persisted company details older than max_age, returns rows refreshed"""
+        updated_before = datetime.now(timezone.utc) - max_age
+        with self._session() as db:
+            stale_symbols = [row.symbol for row in SymbolMetadataRepository(db).get_stale(updated_before, limit)]
+
+        if not stale_symbols:
+            return 0
+
+        fetched = await asyncio.gather(*[self.client.get_symbol_metadata(s) for s in stale_symbols])
+        refreshed = [m for m in fetched if m is not None]
+        self._store_metadata(refreshed)
+        await self._remember_company_info({
+            m.symbol: self._company_info(m.symbol, m.company_name, m.market_cap) for m in refreshed
+        })
+
+        logger.info(f"Refreshed metadata for {len(refreshed)}/{len(stale_symbols)} stale symbols")
+        return len(refreshed)
+
+    def _store_metadata(self, metadata_list: List[SymbolMetadata]) -> None:
+        """Persist fetched company details (best effort)"""
+        if not metadata_list:
+            return
+        with self._session() as db:
+            try:
+                SymbolMetadataRepository(db).upsert_many([
+                    (m.symbol, m.company_name, m.market_cap) for m in metadata_list
+                ])
+            except Exception as e:
+                # leave the (possibly request) session usable for later queries
+                db.rollback()
+                logger.warning(f"Could not persist symbol metadata: {e}")
+
+    def _company_info(self, symbol: str, company_name: str, market_cap: Optional[float]) -> Dict[str, str]:
+        """Company details in response format"""
+        return {
+            "company_name": company_name or symbol,
+            "market_capitalization": format_market_cap(market_cap)
+        }
+
+    async def _remember_company_info(self, infos: Dict[str, Dict[str, str]]) -> Dict[str, Dict[str, str]]:
+        """Cache {symbol: company details} in one batch and return them"""
+        await self._cache.set_many({f"company_{s}": info for s, info in infos.items()}, COMPANY_INFO_CACHE_TTL)
+        return infos
+
+    async def sync_price_bars(self, symbols: List[str], start_date: date, end_date: date) -> int:
+        """Fetch only the daily bars missing from the local store, returns bars written
+
+        Each symbol is fetched from the day after its last stored bar (or from
+        start_date when the store doesn't reach back that far). Symbols sharing a
+        start date go in one batch download. Today's bar isn't final until the
+        close, so it is never stored. Upstream errors propagate.
+        """
+        end_date = min(end_date, today_et() - timedelta(days=1))
+        if not symbols or start_date > end_date:
+            return 0
+
+        written = 0
+        with self._session() as db:
+            repo = PriceBarRepository(db)
+            bounds = repo.get_date_bounds(symbols)
+
+            by_start: Dict[date, List[str]] = {}
+            for symbol in symbols:
+                covered = await self._cache.get(f"bars_synced_{symbol}")
+                if covered and covered[0] <= start_date and covered[1] >= end_date:
+                    continue
+
+                # a window starting on a weekend or holiday is covered from its first session
+                stored = bounds.get(symbol)
+                if stored and stored[0] <= market_calendar.trading_day_on_or_after(start_date):
+                    fetch_start = stored[1] + timedelta(days=1)
+                else:
+                    fetch_start = start_date
+                # nothing to fetch when the window holds no trading sessions
+                if market_calendar.trading_days(fetch_start, end_date):
+                    by_start.setdefault(fetch_start, []).append(symbol)
+
+            for fetch_start, group in sorted(by_start.items()):
+                bars = await self.client.get_price_bars(group, fetch_start, end_date)
+                for symbol in group:
+                    written += repo.upsert_bars(symbol, bars.get(symbol, []))
+                    await self._cache.set(f"bars_synced_{symbol}", (start_date, end_date), BARS_SYNC_CACHE_TTL)
+
+        if written:
+            logger.info(f"Synced {written} price bars for {len(symbols)} symbols")
+        return written
+
+    async def get_close_matrix(self, symbols: List[str], start_date: date, end_date: date) -> pd.DataFrame:
+        """Dense (calendar day x symbol) close matrix, forward-filled over weekends and holidays
+
+        Days before a symbol's first known close are NaN.
+        """
+        read_start = start_date - CARRY_FORWARD_LOOKBACK
+        await self.sync_price_bars(symbols, read_start, end_date)
+        with self._session() as db:
+            frame = PriceBarRepository(db).get_close_frame(symbols, read_start, end_date)
+        return densify_closes(frame, start_date, end_date, symbols)
+
+    async def get_price_history(self, symbol: str, period: str = "1mo") -> List[PriceBarData]:
+        """Daily bars for a chart period, read from the local store"""
+        symbol = symbol.upper()
+        end_date = today_et()
+        start_date = end_date - timedelta(days=HISTORY_PERIOD_DAYS.get(period, 30))
+
+        await self.sync_price_bars([symbol], start_date, end_date)
+        with self._session() as db:
+            rows = PriceBarRepository(db).get_bars(symbol, start_date, end_date)
+            return [
+                PriceBarData(
+                    date=row.date, open=row.open, high=row.high, low=row.low,
+                    close=row.close, volume=row.volume
+                )
+                for row in rows
+            ]
+
+    @contextmanager
+    def _session(self):
+        """Use the request's session when we have one, otherwise a short-lived one"""
+        if self.db is not None:
+            yield self.db
+            return
+
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
     async def get_market_indices(self) -> MarketIndicesResponse:
-        """Get market indices with caching"""
-        cache_key = "market_indices"
-        
-        # check cache
-        if self._is_cache_valid(cache_key):
-            logger.info("Returning cached market indices")
-            return MarketIndicesResponse(indices=self._cache[cache_key]['data'])
-        
-        # fetch real market indices data
+        """Get market indices, served stale while a refresh runs"""
         try:
-            indices_data = await self.client.get_market_indices()
-            
-            # convert to dict format for caching and response
-            indices_list = []
-            for index in indices_data:
-                indices_list.append({
-                    "symbol": index.symbol,
-                    "ticker": index.ticker,
-                    "value": index.value,
-                    "change": index.change,
-                    "percent": index.percent
-                })
-            
-            # cache the result
-            self._cache[cache_key] = {
-                'data': indices_list,
-                'timestamp': datetime.now()
-            }
-            
-            logger.info("Fetched fresh market indices from Yahoo Finance")
-            return MarketIndicesResponse(indices=indices_list)
-            
+            indices_list, age, stale = await self._get_or_revalidate(
+                "market_indices", self._fetch_market_indices, MARKET_CACHE_TTL, MARKET_MAX_STALENESS
+            )
         except Exception as e:
             logger.error(f"Error fetching market indices: {e}")
-            # fall back to empty list on error
+            # fall back to empty list when there is nothing usable to serve
             return MarketIndicesResponse(indices=[])
+
+        return MarketIndicesResponse(
+            indices=indices_list,
+            stale=stale,
+            age_seconds=round(age, 1)
+        )
     
     async def get_market_movers(self) -> MarketMoversResponse:
-        """Get market movers with caching"""
-        cache_key = "market_movers"
-        
-        # check cache
-        if self._is_cache_valid(cache_key):
-            logger.info("Returning cached market movers")
-            cached_data = self._cache[cache_key]['data']
-            return MarketMoversResponse(
-                gainers=cached_data['gainers'],
-                losers=cached_data['losers']
-            )
-        
-        # fetch real market movers data
+        """Get market movers, served stale while a refresh runs"""
         try:
-            movers_data = await self.client.get_market_movers()
-            
-            # convert to dict format for caching and response
-            gainers_list = []
-            for gainer in movers_data['gainers']:
-                gainers_list.append({
-                    "symbol": gainer.symbol,
-                    "name": gainer.name,
-                    "price": gainer.price,
-                    "change": gainer.change,
-                    "change_percent": gainer.change_percent
-                })
-            
-            losers_list = []
-            for loser in movers_data['losers']:
-                losers_list.append({
-                    "symbol": loser.symbol,
-                    "name": loser.name,
-                    "price": loser.price,
-                    "change": loser.change,
-                    "change_percent": loser.change_percent
-                })
-            
-            movers_dict = {
-                'gainers': gainers_list,
-                'losers': losers_list
-            }
-            
-            # cache the result
-            self._cache[cache_key] = {
-                'data': movers_dict,
-                'timestamp': datetime.now()
-            }
-            
-            logger.info("Fetched fresh market movers from Yahoo Finance")
-            return MarketMoversResponse(
-                gainers=gainers_list,
-                losers=losers_list
+            movers_dict, age, stale = await self._get_or_revalidate(
+                "market_movers", self._fetch_market_movers, MARKET_CACHE_TTL, MARKET_MAX_STALENESS
             )
-            
         except Exception as e:
             logger.error(f"Error fetching market movers: {e}")
-            # fall back to empty lists on error
+            # fall back to empty lists when there is nothing usable to serve
             return MarketMoversResponse(gainers=[], losers=[])
+
+        return MarketMoversResponse(
+            gainers=movers_dict['gainers'],
+            losers=movers_dict['losers'],
+            stale=stale,
+            age_seconds=round(age, 1)
+        )
+    
+    async def _fetch_market_indices(self) -> List[Dict[str, any]]:
+        """Fetch indices from upstream in cacheable dict format"""
+        indices_data = await self.client.get_market_indices()
+        if not indices_data:
+            # don't let an upstream outage overwrite the last good value
+            raise StockError("No market indices returned")
+
+        logger.info("Fetched fresh market indices from Yahoo Finance")
+        return [
+            {
+                "symbol": index.symbol,
+                "ticker": index.ticker,
+                "value": index.value,
+                "change": index.change,
+                "percent": index.percent
+            }
+            for index in indices_data
+        ]
+    
+    async def _fetch_market_movers(self) -> Dict[str, List[Dict[str, any]]]:
+        """Fetch movers in cacheable dict format, shared across workers via Redis
+
+        Whichever worker refreshes first stores the normalized lists in the shared
+        cache, so the screeners are hit once per refresh interval, not once per worker.
+        """
+        shared = await self._shared.get(SHARED_MOVERS_KEY)
+        if shared and time.time() < shared["expires_at"]:
+            return shared["movers"]
+
+        movers_data = await self.client.get_market_movers()
+        if not movers_data['gainers'] and not movers_data['losers']:
+            # don't let an upstream outage overwrite the last good value
+            raise StockError("No market movers returned")
+
+        def _to_dict(mover: MarketMover) -> Dict[str, any]:
+            return {
+                "symbol": mover.symbol,
+                "name": mover.name,
+                "price": mover.price,
+                "change": mover.change,
+                "change_percent": mover.change_percent
+            }
+
+        logger.info("Fetched fresh market movers from Yahoo Finance")
+        movers = {
+            'gainers': [_to_dict(m) for m in movers_data['gainers']],
+            'losers': [_to_dict(m) for m in movers_data['losers']]
+        }
+        ttl = market_aware_ttl(MARKET_CACHE_TTL)
+        await self._shared.set(
+            SHARED_MOVERS_KEY,
+            {"expires_at": time.time() + ttl.total_seconds(), "movers": movers},
+            ttl + MARKET_MAX_STALENESS
+        )
+        return movers
+    
+    async def _get_or_revalidate(self, cache_key: str, fetch, ttl: timedelta,
+                                 max_staleness: timedelta) -> Tuple[any, float, bool]:
+        """Stale-while-revalidate read, returns (value, age_seconds, stale)
+
+        Fresh entries are returned as is. Expired entries still within max_staleness
+        are returned immediately while one background refresh runs. Anything older
+        (or missing) blocks on a fetch.
+        """
+        entry = await self._cache.get_entry(cache_key)
+        if entry is not None:
+            value, age, is_fresh = entry
+            if not is_fresh:
+                logger.info(f"Serving stale {cache_key} ({age:.0f}s old) while revalidating")
+                self._spawn_refresh(cache_key, lambda: self._fetch_and_store(cache_key, fetch, ttl, max_staleness))
+            return value, age, not is_fresh
+
+        value = await self._flight.do(cache_key, lambda: self._fetch_and_store(cache_key, fetch, ttl, max_staleness))
+        return value, 0.0, False
+    
+    async def _fetch_and_store(self, cache_key: str, fetch, ttl: timedelta, max_staleness: timedelta) -> any:
+        """Fetch a value and cache it, keeping it servable as stale for max_staleness"""
+        value = await fetch()
+        await self._cache.set(cache_key, value, market_aware_ttl(ttl), stale_ttl=max_staleness)
+        return value
+    
+    def _spawn_refresh(self, key: str, refresh) -> None:
+        """Run a refresh in the background, at most one per key at a time"""
+        async def _run():
+            try:
+                await self._flight.do(key, refresh)
+            except Exception as e:
+                logger.warning(f"Background refresh of {key} failed: {e}")
+
+        task = asyncio.ensure_future(_run())
+        # keep a reference until done so the task isn't garbage collected
+        _background_refreshes.add(task)
+        task.add_done_callback(_background_refreshes.discard)
     
     async def validate_symbol(self, symbol: str) -> bool:
-        """Validate if a stock symbol exists"""
-        cache_key = f"valid_{symbol.upper()}"
+        """Validate if a stock symbol exists
+
+        Listed symbols are answered from the local universe; only unknown
+        tickers fall through to Yahoo.
+        """
+        symbol = symbol.upper()
+        if symbol in symbol_index:
+            return True
+
+        if self.is_known_missing(symbol):
+            return False
+
+        cache_key = f"valid_{symbol}"
         
         # check cache (longer cache for validation)
-        if self._is_cache_valid(cache_key, duration_minutes=60):
-            return self._cache[cache_key]['data']
+        cached = await self._cache.get(cache_key)
+        if cached is not None:
+            return cached
         
         # validate symbol
-        is_valid = await self.client.validate_symbol(symbol)
+        is_valid = await self._flight.do(cache_key, lambda: self.client.validate_symbol(symbol))
         
-        # cache the result
-        self._cache[cache_key] = {
-            'data': is_valid,
-            'timestamp': datetime.now()
-        }
+        # cache the result - invalid symbols go to the short-lived negative cache
+        if is_valid:
+            await self._cache.set(cache_key, True, VALIDATION_CACHE_TTL)
+            symbol_index.add(symbol)
+        else:
+            self._mark_missing([symbol])
         
         return is_valid
-    
-    def _is_cache_valid(self, cache_key: str, duration_minutes: int = 5) -> bool:
-        """Check if cached data is still valid"""
-        if cache_key not in self._cache:
-            return False
-        
-        cache_time = self._cache[cache_key]['timestamp']
-        expiry_time = cache_time + timedelta(minutes=duration_minutes)
-        
-        return datetime.now() < expiry_time
\ No newline at end of file
+
+    def is_known_missing(self, symbol: str) -> bool:
+        """Whether upstream recently had no data for an unlisted symbol
+
+        Listed symbols never count - a gap for them is an upstream hiccup, and
+        orders must still be able to fetch their price.
+        """
+        symbol = symbol.upper()
+        return symbol not in symbol_index and self._missing.get(f"missing_{symbol}") is not None
+
+    def _mark_missing(self, symbols: List[str]) -> None:
+        for symbol in symbols:
+            self._missing.set(f"missing_{symbol}", True)
+        if symbols:
+            logger.info(f"Negative-cached {len(symbols)} symbols with no upstream data")
+
+    def search_symbols(self, query: str, limit: int = 10) -> List[Dict[str, str]]:
+        """Ranked ticker/company name matches, answered from the local universe"""
+        return [
+            {"symbol": symbol, "name": name}
+            for symbol, name in symbol_index.search(query, limit)
+        ]
+
+    def load_symbol_universe(self) -> int:
+        """Load the persisted symbol universe into memory, returns symbols loaded"""
+        with self._session() as db:
+            rows = ListedSymbolRepository(db).get_all()
+        symbol_index.load({row.symbol: row.name for row in rows})
+        logger.info(f"Loaded {len(rows)} listed symbols")
+        return len(rows)
+
+    async def refresh_symbol_universe(self) -> int:
+        """Re-download the exchange symbol directories, persist and reload them"""
+        # plain HTTP to nasdaqtrader, so keep it off the yfinance executor's slots and stats
+        entries = await asyncio.to_thread(fetch_symbol_directory)
+        if not entries:
+            raise StockError("Symbol directory download returned no symbols")
+
+        with self._session() as db:
+            ListedSymbolRepository(db).replace_all(entries)
+        symbol_index.load({symbol: name for symbol, (name, _) in entries.items()})
+
+        logger.info(f"Refreshed symbol universe: {len(entries)} listed symbols")
+        return len(entries)
@@ -0,0 +1,179 @@
+# app/domains/stocks/streaming.py
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# per-connection backlog - slow clients drop their oldest updates instead of growing memory
+STREAM_QUEUE_SIZE = 100
+
+QuoteFetcher = Callable[[List[str]], Awaitable[Dict[str, Dict[str, Any]]]]
+SymbolCheck = Callable[[str], bool]
+
+async def _fetch_quotes(symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Default fetcher - goes through the shared quote cache and single-flight"""
+    from app.domains.stocks.services import StockService
+    return await StockService().get_quotes(symbols)
+
+def _is_streamable(symbol: str) -> bool:
+    """Default check - listed symbols once the index is loaded, else anything upstream hasn't rejected"""
+    from app.domains.stocks.services import StockService
+    from app.domains.stocks.universe import symbol_index
+    if len(symbol_index):
+        return symbol in symbol_index
+    return not StockService().is_known_missing(symbol)
+
+class QuoteHub:
+    """Fans one batched background poll out to every subscribed connection
+
+    Every symbol watched in this worker is fetched together each tick, so a
+    thousand connections watching SPY share one upstream request, and only
+    quotes that actually changed are pushed.
+    """
+
+    def __init__(self, interval: float, fetch: QuoteFetcher = _fetch_quotes,
+                 max_symbols_per_connection: int = 50, batch_size: int = 50,
+                 is_streamable: SymbolCheck = _is_streamable):
+        self.interval = interval
+        self.max_symbols_per_connection = max_symbols_per_connection
+        self.batch_size = batch_size
+        self._fetch = fetch
+        self._is_streamable = is_streamable
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._subscriptions: Dict[asyncio.Queue, Set[str]] = {}
+        self._poller: Optional[asyncio.Task] = None
+        # set when new symbols shouldn't wait for the next tick
+        self._wake = asyncio.Event()
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        self.polls = 0
+        self.messages_sent = 0
+        self.messages_dropped = 0
+        self.symbols_rejected = 0
+
+    def connect(self) -> asyncio.Queue:
+        """Register a connection, returns the queue its updates arrive on"""
+        queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+        self._subscriptions[queue] = set()
+        return queue
+
+    def disconnect(self, queue: asyncio.Queue) -> None:
+        self.unsubscribe(queue, list(self._subscriptions.get(queue, ())))
+        self._subscriptions.pop(queue, None)
+
+    def subscribe(self, queue: asyncio.Queue, symbols: List[str]) -> List[str]:
+        """Subscribe a connection to symbols, returns the symbols it is now watching
+
+        Unknown symbols and ones past the per-connection cap are ignored.
+        """
+        watching = self._subscriptions.setdefault(queue, set())
+        for symbol in dict.fromkeys(s.upper().strip() for s in symbols if s and s.strip()):
+            if symbol in watching or len(watching) >= self.max_symbols_per_connection:
+                continue
+            if symbol not in self._subscribers and not self._is_streamable(symbol):
+                self.symbols_rejected += 1
+                continue
+
+            watching.add(symbol)
+            if symbol in self._subscribers:
+                # late joiners get the last known quote right away
+                if symbol in self._latest:
+                    self._send(queue, self._message(symbol, self._latest[symbol]))
+            else:
+                self._wake.set()
+            self._subscribers.setdefault(symbol, set()).add(queue)
+
+        if self._subscribers and (self._poller is None or self._poller.done()):
+            # a fresh event per poller, so it belongs to the running loop
+            self._wake = asyncio.Event()
+            self._poller = asyncio.create_task(self._poll())
+        return sorted(watching)
+
+    def unsubscribe(self, queue: asyncio.Queue, symbols: List[str]) -> List[str]:
+        """Drop symbols from a connection, stopping the poller once nobody watches anything"""
+        watching = self._subscriptions.get(queue, set())
+        for symbol in (s.upper().strip() for s in symbols):
+            watching.discard(symbol)
+            subscribers = self._subscribers.get(symbol)
+            if subscribers is None:
+                continue
+
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[symbol]
+                self._latest.pop(symbol, None)
+
+        if not self._subscribers and self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
+        return sorted(watching)
+
+    async def _poll(self) -> None:
+        while self._subscribers:
+            self._wake.clear()
+            symbols = sorted(self._subscribers)
+            quotes: Dict[str, Dict[str, Any]] = {}
+            for i in range(0, len(symbols), self.batch_size):
+                batch = symbols[i:i + self.batch_size]
+                try:
+                    quotes.update(await self._fetch(batch))
+                    self.polls += 1
+                except Exception as e:
+                    logger.warning(f"Quote stream poll failed for {len(batch)} symbols: {e}")
+
+            for symbol, quote in quotes.items():
+                if quote is None or symbol not in self._subscribers or not self._changed(symbol, quote):
+                    continue
+                self._latest[symbol] = quote
+                message = self._message(symbol, quote)
+                for queue in list(self._subscribers[symbol]):
+                    self._send(queue, message)
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def _changed(self, symbol: str, quote: Dict[str, Any]) -> bool:
+        previous = self._latest.get(symbol)
+        return previous is None or (
+            previous.get("current_price"), previous.get("previous_close_price")
+        ) != (quote.get("current_price"), quote.get("previous_close_price"))
+
+    def _message(self, symbol: str, quote: Dict[str, Any]) -> Dict[str, Any]:
+        return {"type": "quote", "symbol": symbol, "data": quote}
+
+    def _send(self, queue: asyncio.Queue, message: Dict[str, Any]) -> None:
+        if queue.full():
+            queue.get_nowait()
+            self.messages_dropped += 1
+        queue.put_nowait(message)
+        self.messages_sent += 1
+
+    async def shutdown(self) -> None:
+        """Cancel the poller"""
+        poller, self._poller = self._poller, None
+        self._subscribers.clear()
+        if poller is not None:
+            poller.cancel()
+            await asyncio.gather(poller, return_exceptions=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "connections": len(self._subscriptions),
+            "symbols": len(self._subscribers),
+            "polls": self.polls,
+            "messages_sent": self.messages_sent,
+            "messages_dropped": self.messages_dropped,
+            "symbols_rejected": self.symbols_rejected,
+        }
+
+# process-wide hub - every stream connection in this worker shares its poller
+quote_hub = QuoteHub(
+    interval=settings.QUOTE_STREAM_POLL_SECONDS,
+    max_symbols_per_connection=settings.MAX_QUOTE_BATCH_SIZE,
+    batch_size=settings.MAX_QUOTE_BATCH_SIZE
+)
@@ -0,0 +1,159 @@
+# app/domains/stocks/universe.py
+
+import bisect
+import csv
+import io
+import logging
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# nasdaq trader publishes every US-listed security nightly (pipe-delimited)
+NASDAQ_LISTED_URL = "https://www.nasdaqtrader.com/dynamic/SymDir/nasdaqlisted.txt"
+OTHER_LISTED_URL = "https://www.nasdaqtrader.com/dynamic/SymDir/otherlisted.txt"
+
+OTHER_EXCHANGES = {
+    "A": "NYSE American",
+    "N": "NYSE",
+    "P": "NYSE Arca",
+    "Z": "Cboe BZX",
+    "V": "IEX",
+}
+
+def parse_symbol_directory(text: str, symbol_field: str, default_exchange: Optional[str] = None) -> Dict[str, Tuple[str, str]]:
+    """Parse a nasdaq trader directory file into {symbol: (name, exchange)}
+
+    Symbols are converted to Yahoo's format (BRK.B -> BRK-B). Test issues,
+    preferreds/warrants with special characters and the footer line are skipped.
+    """
+    entries: Dict[str, Tuple[str, str]] = {}
+    for row in csv.DictReader(io.StringIO(text), delimiter="|"):
+        symbol = (row.get(symbol_field) or "").strip()
+        if not symbol or symbol.startswith("File Creation Time") or row.get("Test Issue") == "Y":
+            continue
+        if any(c in symbol for c in "$^= "):
+            continue
+
+        name = (row.get("Security Name") or symbol).split(" - ")[0].strip()
+        exchange = default_exchange or OTHER_EXCHANGES.get(row.get("Exchange", ""), "")
+        entries[symbol.replace(".", "-")] = (name, exchange)
+    return entries
+
+def fetch_symbol_directory(timeout: float = 30.0) -> Dict[str, Tuple[str, str]]:
+    """Download and merge the nasdaq and other-listed directories (blocking)"""
+    nasdaq = requests.get(NASDAQ_LISTED_URL, timeout=timeout)
+    nasdaq.raise_for_status()
+    other = requests.get(OTHER_LISTED_URL, timeout=timeout)
+    other.raise_for_status()
+
+    entries = parse_symbol_directory(nasdaq.text, "Symbol", "NASDAQ")
+    entries.update(parse_symbol_directory(other.text, "ACT Symbol"))
+    return entries
+
+# cap on prefix matches scanned per query, keeps one-letter queries fast
+MAX_SEARCH_CANDIDATES = 500
+
+def _name_tokens(name: str) -> List[str]:
+    """Lowercase words of a company name"""
+    return re.findall(r"[a-z0-9]+", name.lower())
+
+class SymbolIndex:
+    """In-memory symbol universe - set membership plus bisect prefix search
+
+    Symbols and company-name words are each kept in a sorted list, so a prefix
+    lookup is a binary search followed by a short scan.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._symbols: List[str] = []
+        self._names: Dict[str, str] = {}
+        self._tokens: List[Tuple[str, str]] = []
+
+    def load(self, names: Dict[str, str]) -> None:
+        """Replace the whole universe with {symbol: name}"""
+        symbols = sorted(names)
+        tokens = sorted(
+            (token, symbol) for symbol, name in names.items() for token in set(_name_tokens(name or ""))
+        )
+        with self._lock:
+            self._symbols = symbols
+            self._names = dict(names)
+            self._tokens = tokens
+
+    def add(self, symbol: str, name: Optional[str] = None) -> None:
+        """Add one symbol learned outside a full refresh (e.g. validated upstream)"""
+        with self._lock:
+            if symbol in self._names:
+                return
+            bisect.insort(self._symbols, symbol)
+            self._names[symbol] = name or symbol
+            for token in set(_name_tokens(name or "")):
+                bisect.insort(self._tokens, (token, symbol))
+
+    def clear(self) -> None:
+        self.load({})
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._names
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def get_name(self, symbol: str) -> Optional[str]:
+        return self._names.get(symbol)
+
+    def search_prefix(self, prefix: str, limit: int = 10) -> List[Tuple[str, str]]:
+        """Symbols starting with prefix, in alphabetical order, as (symbol, name)"""
+        prefix = prefix.upper()
+        with self._lock:
+            symbols, names = self._symbols, self._names
+        results = []
+        for symbol in symbols[bisect.bisect_left(symbols, prefix):]:
+            if not symbol.startswith(prefix) or len(results) >= limit:
+                break
+            results.append((symbol, names[symbol]))
+        return results
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[str, str]]:
+        """Ranked matches on ticker or company name, as (symbol, name)
+
+        Order: exact ticker, ticker prefix (shortest first), names starting with
+        the query, then names with a later word matching. Every query word must
+        prefix-match a word of the name.
+        """
+        words = _name_tokens(query)
+        if not words:
+            return []
+        # tickers are stored in Yahoo's format (BRK.B -> BRK-B)
+        upper = query.strip().upper().replace(".", "-")
+
+        with self._lock:
+            symbols, names, tokens = self._symbols, self._names, self._tokens
+
+        ranked: Dict[str, tuple] = {}
+        for symbol in symbols[bisect.bisect_left(symbols, upper):][:MAX_SEARCH_CANDIDATES]:
+            if not symbol.startswith(upper):
+                break
+            ranked[symbol] = (0 if symbol == upper else 1, len(symbol), symbol)
+
+        start = bisect.bisect_left(tokens, (words[0], ""))
+        for token, symbol in tokens[start:start + MAX_SEARCH_CANDIDATES]:
+            if not token.startswith(words[0]):
+                break
+            if symbol in ranked:
+                continue
+            name_words = _name_tokens(names[symbol])
+            if not all(any(w.startswith(q) for w in name_words) for q in words[1:]):
+                continue
+            ranked[symbol] = (2 if name_words[0].startswith(words[0]) else 3, len(names[symbol]), symbol)
+
+        best = sorted(ranked, key=ranked.get)[:limit]
+        return [(symbol, names[symbol]) for symbol in best]
+
+# process-wide universe, loaded from the symbol_universe table at startup
+symbol_index = SymbolIndex()
@@ -18,6 +18,7 @@ from app.domains.trading.schemas import (
     WatchlistResponse
 )
 from app.domains.trading.services import TradingService, InsufficientFundsError, InsufficientSharesError, TradingError
+from app.infrastructure.invalidation import invalidation_bus, user_tag
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -179,29 +180,40 @@ async def get_watchlist(
         if not watchlist_items:
             return []
         
-        # get current stock data for each watchlist item
+        # get current prices for the whole watchlist in one batch
         from app.domains.stocks.services import StockService
-        stock_service = StockService()
+        stock_service = StockService(db)
+        symbols = [item.symbol for item in watchlist_items]
+
+        try:
+            quotes = await stock_service.get_quotes(symbols)
+        except Exception as e:
+            logger.warning(f"Could not get watchlist quotes: {e}")
+            quotes = {}
+        company_info = await stock_service.get_company_info(symbols)
+
         watchlist_with_data = []
-        
         for item in watchlist_items:
-            try:
-                # get current stock price and details
-                stock_data = await stock_service.get_stock_data(item.symbol)
-                
+            quote = quotes.get(item.symbol)
+            info = company_info.get(item.symbol, {})
+
+            if quote:
+                current_price = quote["current_price"]
+                previous_close = quote["previous_close_price"]
+                change = current_price - previous_close
                 watchlist_with_data.append(WatchlistResponse(
                     id=item.id,
                     symbol=item.symbol,
-                    name=stock_data.get("company_name", item.symbol),
-                    current_price=stock_data["current_price"],
-                    previous_close=stock_data.get("previous_close_price", stock_data["current_price"]),
-                    change=stock_data["current_price"] - stock_data.get("previous_close_price", stock_data["current_price"]),
-                    change_percent=((stock_data["current_price"] - stock_data.get("previous_close_price", stock_data["current_price"])) / stock_data.get("previous_close_price", stock_data["current_price"])) * 100 if stock_data.get("previous_close_price") else 0.0,
-                    market_cap=stock_data.get("market_capitalization", "N/A"),
+                    name=info.get("company_name", item.symbol),
+                    current_price=current_price,
+                    previous_close=previous_close,
+                    change=change,
+                    change_percent=(change / previous_close) * 100 if previous_close else 0.0,
+                    market_cap=info.get("market_capitalization", "N/A"),
                     created_at=item.created_at
                 ))
-            except Exception as e:
-                logger.warning(f"Could not get stock data for {item.symbol}: {e}")
+            else:
+                logger.warning(f"Could not get stock data for {item.symbol}")
                 # return basic data if stock service fails
                 watchlist_with_data.append(WatchlistResponse(
                     id=item.id,
@@ -251,6 +263,7 @@ async def add_to_watchlist(
             )
         
         watchlist_item = trading_service.add_to_watchlist(current_user.id, watchlist_data)
+        await invalidation_bus.publish(user_tag(current_user.id))
         
         logger.info(f"Added {watchlist_data.symbol} to watchlist for user {current_user.username}")
         return watchlist_item
@@ -273,6 +286,7 @@ async def remove_from_watchlist(
     try:
         trading_service = TradingService(db)
         trading_service.remove_from_watchlist(current_user.id, symbol.upper())
+        await invalidation_bus.publish(user_tag(current_user.id))
         
         logger.info(f"Removed {symbol} from watchlist for user {current_user.username}")
         return {"message": f"Removed {symbol} from watchlist"}
@@ -20,6 +20,10 @@ class PositionRepository:
     def get_all_by_user(self, user_id: int) -> List[Position]:
         return self.db.query(Position).filter(Position.user_id == user_id).all()
 
+    def get_distinct_symbols(self) -> List[str]:
+        rows = self.db.query(Position.symbol).distinct().all()
+        return [row[0] for row in rows]
+
     def create(self, user_id: int, symbol: str, quantity: float, average_price: float) -> Position:
         position = Position(
             user_id=user_id,
@@ -95,6 +99,10 @@ class WatchlistRepository:
             Watchlist.user_id == user_id
         ).order_by(Watchlist.created_at).all()
 
+    def get_distinct_symbols(self) -> List[str]:
+        rows = self.db.query(Watchlist.symbol).distinct().all()
+        return [row[0] for row in rows]
+
     def get_by_user_and_symbol(self, user_id: int, symbol: str) -> Optional[Watchlist]:
         return self.db.query(Watchlist).filter(
             Watchlist.user_id == user_id,
@@ -10,6 +10,8 @@ from app.domains.trading.repositories import PositionRepository, ActivityReposit
 from app.domains.trading.schemas import OrderCreate, WatchlistCreate, TradeConfirmation, PositionDetail
 from app.domains.auth.models import User
 from app.core.exceptions import BusinessLogicError
+from app.domains.portfolio.valuation import valuation_store
+from app.infrastructure.invalidation import invalidation_bus, user_tag, LEADERBOARD_TAG
 
 logger = logging.getLogger(__name__)
 
@@ -84,6 +86,8 @@ class TradingService:
         )
         
         logger.info(f"Buy order executed successfully for user {user.id}")
+        valuation_store.apply_trade(user.id, order.symbol, position.quantity, position.average_price, new_cash_balance)
+        await invalidation_bus.publish(user_tag(user.id), LEADERBOARD_TAG)
         
         return TradeConfirmation(
             id=activity.id,
@@ -135,6 +139,8 @@ class TradingService:
         )
         
         logger.info(f"Sell order executed successfully for user {user.id}")
+        valuation_store.apply_trade(user.id, order.symbol, new_quantity, position.average_price, new_cash_balance)
+        await invalidation_bus.publish(user_tag(user.id), LEADERBOARD_TAG)
         
         return TradeConfirmation(
             id=activity.id,
@@ -1,25 +1,203 @@
 # app/infrastructure/cache.py
 
-import redis
-from typing import Optional, Any
-import json
+from typing import Optional, Any, Callable, Dict, Iterable, List, Tuple, Type, Union
+from collections import OrderedDict
+import asyncio
+import functools
+import inspect
 import logging
+import re
+import threading
+import time
 from datetime import timedelta
 
 from app.core.config import settings
+from app.infrastructure.serialization import CacheCodec, get_codec
+from app.infrastructure.singleflight import SingleFlight
+
+try:
+    import redis
+    import redis.asyncio as aioredis
+except ImportError:  # redis is optional - CacheService degrades to a no-op
+    redis = None
+    aioredis = None
 
 logger = logging.getLogger(__name__)
 
+_PREFIX_PATTERN = re.compile(r"[^_:(]*")
+
+def key_prefix(key: str) -> str:
+    """Group a key is counted under in stats - "quote" for quote_AAPL"""
+    return _PREFIX_PATTERN.match(key).group() or key
+
+class MemoryCache:
+    """Process-wide LRU cache with per-key TTLs and hit/miss counters
+
+    Entries set with a stale_ttl are kept past expiry so callers can serve them
+    stale (via get_entry) while a refresh runs - get() only ever returns fresh values.
+    """
+
+    def __init__(self, max_size: int = 1024, default_ttl: Optional[timedelta] = None):
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        # key -> (value, stored_at, expires_at, retain_until)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # key prefix -> counters, so TTLs can be tuned per kind of entry
+        self._prefix_counters: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, key: str, counter: str) -> None:
+        counters = self._prefix_counters.get(key_prefix(key))
+        if counters is None:
+            counters = self._prefix_counters[key_prefix(key)] = {
+                "hits": 0, "stale_hits": 0, "misses": 0, "evictions": 0
+            }
+        counters[counter] += 1
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value if present and not expired"""
+        entry = self.get_entry(key, allow_stale=False)
+        return entry[0] if entry is not None else None
+
+    def get_entry(self, key: str, allow_stale: bool = True) -> Optional[Tuple[Any, float, bool]]:
+        """Get (value, age_seconds, is_fresh), including stale entries still within their window"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                self._count(key, "misses")
+                return None
+
+            value, stored_at, expires_at, retain_until = entry
+            if retain_until is not None and now >= retain_until:
+                del self._entries[key]
+                self.misses += 1
+                self._count(key, "misses")
+                return None
+
+            is_fresh = expires_at is None or now < expires_at
+            if not is_fresh and not allow_stale:
+                self.misses += 1
+                self._count(key, "misses")
+                return None
+
+            # mark as most recently used
+            self._entries.move_to_end(key)
+            if is_fresh:
+                self.hits += 1
+                self._count(key, "hits")
+            else:
+                self.stale_hits += 1
+                self._count(key, "stale_hits")
+            return value, now - stored_at, is_fresh
+
+    def set(self, key: str, value: Any, ttl: Optional[timedelta] = None,
+            stale_ttl: Optional[timedelta] = None) -> None:
+        """Set a value, evicting the least recently used entry when full
+
+        stale_ttl keeps the entry around that much longer after it expires.
+        """
+        ttl = ttl if ttl is not None else self.default_ttl
+        now = time.monotonic()
+        expires_at = now + ttl.total_seconds() if ttl is not None else None
+        retain_until = expires_at
+        if expires_at is not None and stale_ttl is not None:
+            retain_until = expires_at + stale_ttl.total_seconds()
+
+        with self._lock:
+            self._entries[key] = (value, now, expires_at, retain_until)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                evicted, _ = self._entries.popitem(last=False)
+                self.evictions += 1
+                self._count(evicted, "evictions")
+
+    def delete(self, key: str) -> bool:
+        """Delete a key from cache"""
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def flush_prefix(self, prefix: str) -> int:
+        """Drop every key starting with prefix, returns entries dropped"""
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.stale_hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self._prefix_counters.clear()
+
+    def prefix_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Counters, size and entry ages per key prefix"""
+        now = time.monotonic()
+        with self._lock:
+            ages: Dict[str, List[float]] = {}
+            for key, entry in self._entries.items():
+                ages.setdefault(key_prefix(key), []).append(now - entry[1])
+
+            stats = {}
+            for prefix in sorted(set(ages) | set(self._prefix_counters)):
+                counters = self._prefix_counters.get(prefix, {"hits": 0, "stale_hits": 0, "misses": 0, "evictions": 0})
+                prefix_ages = ages.get(prefix, [])
+                lookups = counters["hits"] + counters["misses"]
+                stats[prefix] = {
+                    "size": len(prefix_ages),
+                    **counters,
+                    "hit_ratio": counters["hits"] / lookups if lookups else 0.0,
+                    "oldest_age_seconds": max(prefix_ages, default=0.0),
+                    "mean_age_seconds": sum(prefix_ages) / len(prefix_ages) if prefix_ages else 0.0
+                }
+            return stats
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache size and hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
 class CacheService:
     """Redis cache service (optional - falls back to no caching if Redis not available)"""
     
-    def __init__(self):
-        self.redis_client = None
-        self._initialize_redis()
+    def __init__(self, redis_client: Optional[Any] = None, codec: Optional[CacheCodec] = None):
+        self.redis_client = redis_client
+        self.codec = codec or get_codec()
+        if redis_client is None:
+            self._initialize_redis()
+
+    @property
+    def enabled(self) -> bool:
+        return self.redis_client is not None
     
     def _initialize_redis(self):
         """Initialize Redis connection if available"""
         if settings.REDIS_URL:
+            if redis is None:
+                logger.warning("REDIS_URL is set but the redis package is not installed, caching disabled")
+                return
             try:
                 self.redis_client = redis.from_url(settings.REDIS_URL)
                 # test connection
@@ -30,20 +208,19 @@ class CacheService:
                 self.redis_client = None
         else:
             logger.info("No Redis URL configured, caching disabled")
-    
+
     def set(self, key: str, value: Any, expire: Optional[timedelta] = None) -> bool:
         """Set a value in cache"""
         if not self.redis_client:
             return False
         
         try:
-            # serialize value to JSON
-            serialized_value = json.dumps(value, default=str)
+            serialized_value = self.codec.encode(value)
             
             if expire:
                 return self.redis_client.setex(
                     key, 
-                    int(expire.total_seconds()), 
+                    max(1, int(expire.total_seconds())), 
                     serialized_value
                 )
             else:
@@ -61,7 +238,7 @@ class CacheService:
         try:
             value = self.redis_client.get(key)
             if value:
-                return json.loads(value.decode('utf-8'))
+                return self.codec.decode(value)
             return None
             
         except Exception as e:
@@ -90,5 +267,565 @@ class CacheService:
             logger.error(f"Cache exists error: {e}")
             return False
 
-# global cache service instance
-cache_service = CacheService()
\ No newline at end of file
+class AsyncCacheService:
+    """asyncio Redis cache service with a connection pool and batched reads/writes
+
+    Same no-op fallback as CacheService when Redis isn't configured. The pool
+    connects lazily, so a Redis outage shows up as cache misses rather than
+    failing startup.
+    """
+
+    def __init__(self, redis_client: Optional[Any] = None, codec: Optional[CacheCodec] = None):
+        self.redis_client = redis_client
+        self.codec = codec or get_codec()
+        if redis_client is None:
+            self._initialize_redis()
+
+    def _initialize_redis(self):
+        """Create the pooled client if Redis is configured"""
+        if not settings.REDIS_URL:
+            return
+        if aioredis is None:
+            logger.warning("REDIS_URL is set but the redis package is not installed, caching disabled")
+            return
+        self.redis_client = aioredis.from_url(
+            settings.REDIS_URL,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS
+        )
+        logger.info(f"Async Redis cache service initialized (pool of {settings.REDIS_MAX_CONNECTIONS})")
+
+    @property
+    def enabled(self) -> bool:
+        return self.redis_client is not None
+
+    def _dumps(self, value: Any) -> bytes:
+        return self.codec.encode(value)
+
+    def _loads(self, value: Optional[bytes]) -> Optional[Any]:
+        return self.codec.decode(value) if value else None
+
+    def _seconds(self, expire: Optional[timedelta]) -> Optional[int]:
+        return max(1, int(expire.total_seconds())) if expire else None
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Get a value from cache"""
+        if not self.redis_client:
+            return None
+
+        try:
+            return self._loads(await self.redis_client.get(key))
+        except Exception as e:
+            logger.error(f"Cache get error: {e}")
+            return None
+
+    async def set(self, key: str, value: Any, expire: Optional[timedelta] = None) -> bool:
+        """Set a value in cache"""
+        if not self.redis_client:
+            return False
+
+        try:
+            return bool(await self.redis_client.set(key, self._dumps(value), ex=self._seconds(expire)))
+        except Exception as e:
+            logger.error(f"Cache set error: {e}")
+            return False
+
+    async def delete(self, key: str) -> bool:
+        """Delete a key from cache"""
+        if not self.redis_client:
+            return False
+
+        try:
+            return bool(await self.redis_client.delete(key))
+        except Exception as e:
+            logger.error(f"Cache delete error: {e}")
+            return False
+
+    async def exists(self, key: str) -> bool:
+        """Check if key exists in cache"""
+        if not self.redis_client:
+            return False
+
+        try:
+            return bool(await self.redis_client.exists(key))
+        except Exception as e:
+            logger.error(f"Cache exists error: {e}")
+            return False
+
+    async def mget(self, keys: List[str]) -> Dict[str, Any]:
+        """Get many values in one round trip, returns {key: value} for keys that exist"""
+        if not self.redis_client or not keys:
+            return {}
+
+        try:
+            values = await self.redis_client.mget(keys)
+        except Exception as e:
+            logger.error(f"Cache mget error: {e}")
+            return {}
+
+        results = {}
+        for key, value in zip(keys, values):
+            try:
+                loaded = self._loads(value)
+            except Exception as e:
+                logger.warning(f"Cache decode error for {key}: {e}")
+                continue
+            if loaded is not None:
+                results[key] = loaded
+        return results
+
+    async def mset(self, items: Iterable[Tuple[str, Any, Optional[timedelta]]]) -> bool:
+        """Set many (key, value, expire) items in one pipelined round trip"""
+        if not self.redis_client:
+            return False
+
+        try:
+            async with self.pipeline() as pipe:
+                for key, value, expire in items:
+                    pipe.set(key, self._dumps(value), ex=self._seconds(expire))
+                await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Cache mset error: {e}")
+            return False
+
+    async def delete_many(self, keys: List[str]) -> int:
+        """Delete many keys in one round trip, returns keys deleted"""
+        if not self.redis_client or not keys:
+            return 0
+
+        try:
+            return await self.redis_client.delete(*keys)
+        except Exception as e:
+            logger.error(f"Cache delete error: {e}")
+            return 0
+
+    async def delete_pattern(self, pattern: str, batch_size: int = 500) -> int:
+        """Delete keys matching a glob pattern via SCAN, returns keys deleted"""
+        if not self.redis_client:
+            return 0
+
+        deleted = 0
+        try:
+            batch = []
+            async for key in self.redis_client.scan_iter(match=pattern, count=batch_size):
+                batch.append(key)
+                if len(batch) >= batch_size:
+                    deleted += await self.redis_client.delete(*batch)
+                    batch = []
+            if batch:
+                deleted += await self.redis_client.delete(*batch)
+        except Exception as e:
+            logger.error(f"Cache delete pattern error: {e}")
+        return deleted
+
+    async def add_members(self, key: str, members: List[str], expire: Optional[timedelta] = None) -> bool:
+        """Add members to a set, (re)setting its expiry"""
+        if not self.redis_client or not members:
+            return False
+
+        try:
+            async with self.pipeline() as pipe:
+                pipe.sadd(key, *members)
+                if expire:
+                    pipe.expire(key, self._seconds(expire))
+                await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Cache sadd error: {e}")
+            return False
+
+    async def pop_members(self, key: str) -> List[str]:
+        """Read and delete a set in one round trip"""
+        if not self.redis_client:
+            return []
+
+        try:
+            async with self.pipeline(transaction=True) as pipe:
+                pipe.smembers(key)
+                pipe.delete(key)
+                members, _ = await pipe.execute()
+            return [m.decode("utf-8") if isinstance(m, bytes) else m for m in members]
+        except Exception as e:
+            logger.error(f"Cache smembers error: {e}")
+            return []
+
+    async def publish(self, channel: str, message: str) -> bool:
+        """Publish a message to every worker subscribed to channel"""
+        if not self.redis_client:
+            return False
+
+        try:
+            await self.redis_client.publish(channel, message)
+            return True
+        except Exception as e:
+            logger.error(f"Cache publish error: {e}")
+            return False
+
+    def pubsub(self):
+        return self.redis_client.pubsub()
+
+    def pipeline(self, transaction: bool = False):
+        """Raw pipeline for callers batching other commands - queue commands, then await execute()"""
+        return self.redis_client.pipeline(transaction=transaction)
+
+    async def close(self) -> None:
+        """Release pooled connections"""
+        if self.redis_client is not None:
+            await self.redis_client.aclose()
+
+class TieredCache:
+    """Per-process MemoryCache (L1) in front of Redis (L2) so workers share fetches
+
+    Only keys starting with one of shared_prefixes go to Redis, encoded with the
+    shared service's CacheCodec (json, orjson or msgpack per CACHE_SERIALIZER,
+    optionally compressed). Without Redis this is just the L1 cache.
+    """
+
+    def __init__(self, local: MemoryCache, shared: AsyncCacheService, namespace: str,
+                 shared_prefixes: Tuple[str, ...] = ()):
+        self.local = local
+        self.shared = shared
+        self.namespace = namespace
+        self.shared_prefixes = shared_prefixes
+        self.shared_hits = 0
+        self.shared_misses = 0
+        # tag -> keys set with it in this worker
+        self._tagged: Dict[str, set] = {}
+        # tag -> times it was invalidated, so writers can tell their value went stale mid-build
+        self._generations: Dict[str, int] = {}
+        self._tag_lock = threading.Lock()
+
+    def _is_shared(self, key: str) -> bool:
+        return self.shared.enabled and key.startswith(self.shared_prefixes)
+
+    def _shared_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.namespace}:tag:{tag}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Get a value if present and not expired in either tier"""
+        entry = await self.get_entry(key, allow_stale=False)
+        return entry[0] if entry is not None else None
+
+    async def get_entry(self, key: str, allow_stale: bool = True) -> Optional[Tuple[Any, float, bool]]:
+        """Get (value, age_seconds, is_fresh) - L1 first, then Redis when L1 is missing or stale"""
+        return (await self.get_entries([key], allow_stale)).get(key)
+
+    async def get_entries(self, keys: List[str], allow_stale: bool = True) -> Dict[str, Tuple[Any, float, bool]]:
+        """get_entry for many keys, with one Redis round trip for every L1 miss"""
+        entries = {}
+        lookup = []
+        for key in keys:
+            entry = self.local.get_entry(key, allow_stale=allow_stale)
+            if entry is not None:
+                entries[key] = entry
+            # another worker may already have refreshed it
+            if (entry is None or not entry[2]) and self._is_shared(key):
+                lookup.append(key)
+
+        if not lookup:
+            return entries
+
+        payloads = await self.shared.mget([self._shared_key(k) for k in lookup])
+        for key in lookup:
+            payload = payloads.get(self._shared_key(key))
+            if not payload:
+                self.shared_misses += 1
+                continue
+
+            shared = self._from_payload(key, payload)
+            if shared[2] or (key not in entries and allow_stale):
+                entries[key] = shared
+        return entries
+
+    def _from_payload(self, key: str, payload: Dict[str, Any]) -> Tuple[Any, float, bool]:
+        self.shared_hits += 1
+        now = time.time()
+        expires_at = payload["expires_at"]
+        retain_until = payload["retain_until"]
+        is_fresh = expires_at is None or now < expires_at
+
+        # copy fresh entries into L1 for the rest of their lifetime, tagged so
+        # invalidations from other workers reach the copy
+        if is_fresh:
+            ttl = timedelta(seconds=expires_at - now) if expires_at is not None else None
+            stale_ttl = timedelta(seconds=retain_until - expires_at) if retain_until is not None else None
+            self.local.set(key, payload["value"], ttl, stale_ttl=stale_ttl)
+            self._tag_local(payload.get("tags", ()), [key])
+
+        return payload["value"], now - payload["stored_at"], is_fresh
+
+    async def set(self, key: str, value: Any, ttl: Optional[timedelta] = None,
+                  stale_ttl: Optional[timedelta] = None, tags: Iterable[str] = ()) -> None:
+        """Set a value in L1, and in Redis for shared keys"""
+        await self.set_many({key: value}, ttl, stale_ttl, tags)
+
+    async def set_many(self, values: Dict[str, Any], ttl: Optional[timedelta] = None,
+                       stale_ttl: Optional[timedelta] = None, tags: Iterable[str] = ()) -> None:
+        """Set many values with one TTL - shared keys go to Redis in one pipeline
+
+        Tagged keys are dropped together by invalidate_tags().
+        """
+        tags = list(tags)
+        shared = []
+        for key, value in values.items():
+            self.local.set(key, value, ttl, stale_ttl=stale_ttl)
+            if self._is_shared(key):
+                shared.append(self._to_item(key, value, ttl, stale_ttl, tags))
+
+        self._tag_local(tags, values)
+
+        if len(shared) == 1:
+            await self.shared.set(*shared[0])
+        elif shared:
+            await self.shared.mset(shared)
+
+        # index shared keys by tag so any worker can find them
+        for tag in tags if shared else ():
+            await self.shared.add_members(self._tag_key(tag), [key for key, _, _ in shared], shared[0][2])
+
+    def set_local(self, key: str, value: Any, ttl: Optional[timedelta] = None,
+                  stale_ttl: Optional[timedelta] = None, tags: Iterable[str] = ()) -> None:
+        """Set a value in L1 only - for sync callers that can't reach Redis"""
+        self.local.set(key, value, ttl, stale_ttl=stale_ttl)
+        self._tag_local(tags, [key])
+
+    def _tag_local(self, tags: Iterable[str], keys: Iterable[str]) -> None:
+        with self._tag_lock:
+            for tag in tags:
+                self._tagged.setdefault(tag, set()).update(keys)
+
+    def tag_generation(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        """Invalidation counts for tags - compare before and after building a value"""
+        with self._tag_lock:
+            return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def drop_local_tags(self, tags: Iterable[str]) -> int:
+        """Drop L1 entries carrying any of tags, returns entries dropped"""
+        tags = list(tags)
+        with self._tag_lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+            keys = set().union(*[self._tagged.pop(tag, set()) for tag in tags])
+        return sum(self.local.delete(key) for key in keys)
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Drop entries carrying any of tags from L1 and Redis"""
+        tags = list(tags)
+        dropped = self.drop_local_tags(tags)
+        if self.shared.enabled:
+            for tag in tags:
+                keys = await self.shared.pop_members(self._tag_key(tag))
+                dropped += await self.shared.delete_many(keys)
+        return dropped
+
+    def _to_item(self, key: str, value: Any, ttl: Optional[timedelta], stale_ttl: Optional[timedelta],
+                 tags: Iterable[str] = ()) -> Tuple[str, Dict[str, Any], Optional[timedelta]]:
+        """(redis key, payload, expire) for a shared entry"""
+        ttl = ttl if ttl is not None else self.local.default_ttl
+        now = time.time()
+        expires_at = now + ttl.total_seconds() if ttl is not None else None
+        retain_until = expires_at
+        if expires_at is not None and stale_ttl is not None:
+            retain_until = expires_at + stale_ttl.total_seconds()
+
+        return (
+            self._shared_key(key),
+            {"value": value, "stored_at": now, "expires_at": expires_at, "retain_until": retain_until,
+             "tags": list(tags)},
+            timedelta(seconds=retain_until - now) if retain_until is not None else None
+        )
+
+    async def delete(self, key: str) -> bool:
+        """Delete a key from both tiers"""
+        deleted = self.local.delete(key)
+        if self._is_shared(key):
+            deleted = await self.shared.delete(self._shared_key(key)) or deleted
+        return deleted
+
+    async def flush_prefix(self, prefix: str) -> int:
+        """Drop keys starting with prefix from L1 and Redis, returns entries dropped"""
+        dropped = self.local.flush_prefix(prefix)
+        if self.shared.enabled:
+            # escape glob characters so the prefix matches literally
+            pattern = re.sub(r"([*?\[\]\\])", r"\\\1", self._shared_key(prefix))
+            dropped += await self.shared.delete_pattern(f"{pattern}*")
+        return dropped
+
+    def clear(self) -> None:
+        """Clear L1 only - Redis entries belong to every worker"""
+        self.local.clear()
+        with self._tag_lock:
+            self._tagged.clear()
+            self._generations.clear()
+        self.shared_hits = 0
+        self.shared_misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """L1 stats plus Redis hit/miss counters"""
+        return {
+            **self.local.stats(),
+            "shared_enabled": self.shared.enabled,
+            "shared_hits": self.shared_hits,
+            "shared_misses": self.shared_misses,
+            "prefixes": self.local.prefix_stats()
+        }
+
+# global cache service instance - the lazy pool never blocks import; build a
+# CacheService explicitly where a sync client is really needed
+async_cache_service = AsyncCacheService()
+
+# named process-wide caches, for stats and flushing
+caches: Dict[str, Union[MemoryCache, TieredCache]] = {}
+
+def register_cache(name: str, cache: Union[MemoryCache, TieredCache]):
+    """Add a cache to the registry, returns it"""
+    caches[name] = cache
+    return cache
+
+# every @cached function by qualified name, for stats and test resets
+cached_functions: Dict[str, Callable] = {}
+
+def cached(ttl: Union[timedelta, Callable[[], timedelta]],
+           key: Optional[Callable[..., str]] = None,
+           backend: Optional[TieredCache] = None,
+           tags: Optional[Callable[..., Iterable[str]]] = None,
+           model: Optional[Type] = None,
+           negative_ttl: Optional[timedelta] = None,
+           negative_exceptions: Tuple[Type[Exception], ...] = ()):
+    """Memoize a service method
+
+    ttl is a timedelta or a zero-argument callable returning one. key and tags
+    take the method's own arguments. Concurrent misses for one key share a single
+    call. Results of type model are stored as dicts and rebuilt on the way out.
+    With negative_ttl, None results and negative_exceptions are cached too, and a
+    cached exception is raised again with its original type and message.
+
+    Coroutine methods use the backend's Redis tier for keys it shares; the
+    default backend shares none, so it is L1-only. Plain methods only use the L1.
+    """
+    def decorator(func):
+        name = func.__qualname__
+        signature = inspect.signature(func)
+        cache = backend or TieredCache(MemoryCache(), async_cache_service, namespace=name)
+        flight = SingleFlight()
+        stats = {"hits": 0, "negative_hits": 0, "misses": 0, "errors": 0}
+
+        def _key(args, kwargs) -> str:
+            if key is not None:
+                return key(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = ",".join(f"{k}={v!r}" for k, v in bound.arguments.items() if k not in ("self", "cls"))
+            return f"{name}({params})"
+
+        def _ttl() -> timedelta:
+            return ttl() if callable(ttl) else ttl
+
+        def _tags(args, kwargs) -> Iterable[str]:
+            return tags(*args, **kwargs) if tags is not None else ()
+
+        def _unwrap(entry: Dict[str, Any]) -> Any:
+            if "error" in entry:
+                stats["negative_hits"] += 1
+                error_type = next((e for e in negative_exceptions if e.__name__ == entry["error"]), RuntimeError)
+                raise error_type(entry["message"])
+
+            value = entry["value"]
+            if value is None:
+                stats["negative_hits"] += 1
+                return None
+
+            stats["hits"] += 1
+            return model(**value) if model is not None else value
+
+        def _wrap(value: Any) -> Tuple[Optional[Dict[str, Any]], Optional[timedelta]]:
+            """Entry to store and its TTL, or (None, None) when the result isn't cacheable"""
+            if value is None:
+                return ({"value": None}, negative_ttl) if negative_ttl is not None else (None, None)
+            if model is not None:
+                value = value.model_dump()
+            return {"value": value}, _ttl()
+
+        def _wrap_error(error: Exception) -> Tuple[Optional[Dict[str, Any]], Optional[timedelta]]:
+            if negative_ttl is not None and isinstance(error, negative_exceptions):
+                return {"error": type(error).__name__, "message": str(error)}, negative_ttl
+            return None, None
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                cache_key = _key(args, kwargs)
+                entry = await cache.get(cache_key)
+                if entry is not None:
+                    return _unwrap(entry)
+
+                async def _call():
+                    entry_tags = list(_tags(args, kwargs))
+                    generation = cache.tag_generation(entry_tags)
+
+                    async def _store(stored, entry_ttl):
+                        # skip values an invalidation overtook while they were being built
+                        if stored is not None and cache.tag_generation(entry_tags) == generation:
+                            await cache.set(cache_key, stored, entry_ttl, tags=entry_tags)
+
+                    try:
+                        result = await func(*args, **kwargs)
+                    except Exception as e:
+                        stats["errors"] += 1
+                        await _store(*_wrap_error(e))
+                        raise
+
+                    await _store(*_wrap(result))
+                    return result
+
+                stats["misses"] += 1
+                return await flight.do(cache_key, _call)
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                cache_key = _key(args, kwargs)
+                entry = cache.local.get(cache_key)
+                if entry is not None:
+                    return _unwrap(entry)
+
+                stats["misses"] += 1
+                try:
+                    result = func(*args, **kwargs)
+                except Exception as e:
+                    stats["errors"] += 1
+                    stored, entry_ttl = _wrap_error(e)
+                    if stored is not None:
+                        cache.set_local(cache_key, stored, entry_ttl, tags=_tags(args, kwargs))
+                    raise
+
+                stored, entry_ttl = _wrap(result)
+                if stored is not None:
+                    cache.set_local(cache_key, stored, entry_ttl, tags=_tags(args, kwargs))
+                return result
+
+        def cache_stats() -> Dict[str, Any]:
+            lookups = stats["hits"] + stats["negative_hits"] + stats["misses"]
+            return {
+                **stats,
+                "coalesced": flight.coalesced,
+                "hit_ratio": (stats["hits"] + stats["negative_hits"]) / lookups if lookups else 0.0
+            }
+
+        def cache_clear() -> None:
+            """Reset counters and this function's backend L1 (shared backends included)"""
+            cache.clear()
+            stats.update(hits=0, negative_hits=0, misses=0, errors=0)
+            flight.coalesced = 0
+
+        wrapper.cache = cache
+        wrapper.cache_key = lambda *args, **kwargs: _key(args, kwargs)
+        wrapper.cache_stats = cache_stats
+        wrapper.cache_clear = cache_clear
+        cached_functions[name] = wrapper
+        return wrapper
+
+    return decorator
\ No newline at end of file
@@ -103,6 +103,7 @@ def create_tables():
     from app.domains.trading.models import Position, Activity, Watchlist
     from app.domains.portfolio.models import PortfolioSnapshot
     from app.domains.bugs.models import BugReport
+    from app.domains.stocks.models import SymbolMetadata, ListedSymbol, PriceBar
 
     Base.metadata.create_all(bind=engine)
     _ensure_snapshot_uniqueness()
@@ -0,0 +1,91 @@
+# app/infrastructure/executor.py
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import functools
+import logging
+import threading
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class BlockingIOExecutor:
+    """Bounded thread pool for blocking I/O, so sync client calls don't stall the event loop"""
+
+    def __init__(self, max_workers: int, name: str):
+        self.max_workers = max_workers
+        self.name = name
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.active = 0
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """Create the pool lazily (and again after a shutdown)"""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix=self.name
+                )
+            return self._pool
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking callable in the pool and await its result"""
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+
+        with self._lock:
+            self.submitted += 1
+
+        try:
+            return await loop.run_in_executor(pool, functools.partial(self._call, func, *args, **kwargs))
+        finally:
+            with self._lock:
+                self.completed += 1
+
+    def _call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Worker-side wrapper that tracks how many calls are running"""
+        with self._lock:
+            self.active += 1
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get pool size and queue depth"""
+        with self._lock:
+            in_flight = self.submitted - self.completed
+            return {
+                "name": self.name,
+                "max_workers": self.max_workers,
+                "active": self.active,
+                "queued": max(in_flight - self.active, 0),
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed
+            }
+
+    def shutdown(self) -> None:
+        """Stop the pool without waiting for in-flight calls"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+            logger.info(f"{self.name} executor shut down")
+
+# global executor for all yfinance calls
+yfinance_executor = BlockingIOExecutor(
+    max_workers=settings.YFINANCE_MAX_WORKERS,
+    name="yfinance"
+)
@@ -0,0 +1,106 @@
+# app/infrastructure/invalidation.py
+
+import asyncio
+import json
+import logging
+import uuid
+from typing import List, Optional
+
+from app.infrastructure.cache import AsyncCacheService, TieredCache, async_cache_service
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+# how long the listener waits before resubscribing after a redis error
+RESUBSCRIBE_DELAY_SECONDS = 5
+
+# entries derived from every portfolio (e.g. after snapshots are backfilled)
+ALL_PORTFOLIOS_TAG = "portfolios"
+LEADERBOARD_TAG = "leaderboard"
+
+def user_tag(user_id: int) -> str:
+    """Tag for anything derived from one user's positions, cash or profile"""
+    return f"user:{user_id}"
+
+class InvalidationBus:
+    """Drops tagged cache entries in every worker when the data behind them changes
+
+    Caches register here. publish() clears matching entries from each one
+    (L1 and Redis) and broadcasts the tags over Redis pub/sub so other workers
+    drop their L1 copies too.
+    """
+
+    def __init__(self, shared: AsyncCacheService, channel: str = INVALIDATION_CHANNEL):
+        self.shared = shared
+        self.channel = channel
+        self.worker_id = uuid.uuid4().hex
+        self._caches: List[TieredCache] = []
+        self._listener: Optional[asyncio.Task] = None
+        self.published = 0
+        self.received = 0
+
+    def register(self, cache: TieredCache) -> TieredCache:
+        if cache not in self._caches:
+            self._caches.append(cache)
+        return cache
+
+    async def publish(self, *tags: str) -> int:
+        """Invalidate tags everywhere, returns entries dropped in this worker and Redis"""
+        tags = [t for t in dict.fromkeys(tags) if t]
+        if not tags:
+            return 0
+
+        dropped = 0
+        for cache in self._caches:
+            dropped += await cache.invalidate_tags(tags)
+
+        await self.shared.publish(self.channel, json.dumps({"origin": self.worker_id, "tags": tags}))
+        self.published += 1
+        logger.info(f"Invalidated {tags} ({dropped} entries)")
+        return dropped
+
+    def _drop_local(self, tags: List[str]) -> None:
+        for cache in self._caches:
+            cache.drop_local_tags(tags)
+
+    def start(self) -> None:
+        """Start listening for other workers' invalidations (no-op without Redis)"""
+        if self.shared.enabled and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = self.shared.pubsub()
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+
+                    data = json.loads(message["data"])
+                    if data["origin"] != self.worker_id:
+                        self.received += 1
+                        self._drop_local(data["tags"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Invalidation listener error, resubscribing: {e}")
+                await asyncio.sleep(RESUBSCRIBE_DELAY_SECONDS)
+
+    def stats(self) -> dict:
+        return {
+            "caches": len(self._caches),
+            "listening": self._listener is not None,
+            "published": self.published,
+            "received": self.received,
+        }
+
+# global invalidation bus
+invalidation_bus = InvalidationBus(async_cache_service)
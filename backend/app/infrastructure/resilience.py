@@ -0,0 +1,206 @@
+# app/infrastructure/resilience.py
+
+from typing import Any, Dict
+import asyncio
+import logging
+import threading
+import time
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open"""
+    pass
+
+class RateLimitExceededError(Exception):
+    """Raised when no rate limit token became available in time"""
+    pass
+
+class CircuitBreaker:
+    """Fail fast after repeated upstream errors, then probe for recovery
+
+    closed -> open after failure_threshold consecutive failures
+    open -> half_open once recovery_timeout seconds have passed
+    half_open -> closed on a successful probe, back to open on a failed one
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+                 half_open_max_calls: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Return to the closed state and clear counters"""
+        with self._lock:
+            self._state = self.CLOSED
+            self._consecutive_failures = 0
+            self._opened_at = 0.0
+            self._half_open_calls = 0
+            self.rejected = 0
+            self.successes = 0
+            self.failures = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        """Move open -> half_open when the recovery timeout has passed (lock held)"""
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._half_open_calls = 0
+            logger.info(f"Circuit {self.name} half-open, probing upstream")
+        return self._state
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError if the call should not go upstream"""
+        with self._lock:
+            state = self._current_state()
+            if state == self.OPEN or (
+                state == self.HALF_OPEN and self._half_open_calls >= self.half_open_max_calls
+            ):
+                self.rejected += 1
+                raise CircuitOpenError(f"Circuit {self.name} is open")
+            if state == self.HALF_OPEN:
+                self._half_open_calls += 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.successes += 1
+            self._consecutive_failures = 0
+            if self._state != self.CLOSED:
+                logger.info(f"Circuit {self.name} closed, upstream recovered")
+            self._state = self.CLOSED
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._consecutive_failures += 1
+            if self._state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(
+                        f"Circuit {self.name} opened after {self._consecutive_failures} consecutive failures"
+                    )
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "state": self._current_state(),
+                "consecutive_failures": self._consecutive_failures,
+                "failure_threshold": self.failure_threshold,
+                "recovery_timeout": self.recovery_timeout,
+                "successes": self.successes,
+                "failures": self.failures,
+                "rejected": self.rejected
+            }
+
+class TokenBucket:
+    """Adaptive token-bucket rate limiter
+
+    Refills at `rate` tokens/second up to `capacity`. Upstream failures halve the
+    rate (down to min_rate) and successes ramp it back towards max_rate (AIMD).
+    """
+
+    def __init__(self, name: str, rate: float, capacity: float, min_rate: float = 0.5):
+        self.name = name
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Refill the bucket and restore the configured rate"""
+        with self._lock:
+            self.rate = self.max_rate
+            self._tokens = self.capacity
+            self._updated_at = time.monotonic()
+            self.throttled = 0
+            self.rejected = 0
+
+    def _refill(self) -> None:
+        """Add tokens for the time elapsed since the last refill (lock held)"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available right now"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    async def acquire(self, timeout: float) -> None:
+        """Wait up to timeout seconds for a token, raising RateLimitExceededError otherwise"""
+        deadline = time.monotonic() + timeout
+        waited = False
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+
+            if time.monotonic() + wait > deadline:
+                with self._lock:
+                    self.rejected += 1
+                raise RateLimitExceededError(f"Rate limit for {self.name} exceeded")
+
+            if not waited:
+                waited = True
+                with self._lock:
+                    self.throttled += 1
+            await asyncio.sleep(wait)
+
+    def penalize(self) -> None:
+        """Back off after an upstream failure (multiplicative decrease)"""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def reward(self) -> None:
+        """Recover after a success (additive increase)"""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refill()
+            return {
+                "name": self.name,
+                "rate": self.rate,
+                "max_rate": self.max_rate,
+                "capacity": self.capacity,
+                "tokens": round(self._tokens, 2),
+                "throttled": self.throttled,
+                "rejected": self.rejected
+            }
+
+# global guards for all yfinance calls
+yfinance_breaker = CircuitBreaker(
+    name="yfinance",
+    failure_threshold=settings.YFINANCE_BREAKER_FAILURE_THRESHOLD,
+    recovery_timeout=settings.YFINANCE_BREAKER_RECOVERY_SECONDS
+)
+yfinance_rate_limiter = TokenBucket(
+    name="yfinance",
+    rate=settings.YFINANCE_RATE_LIMIT_PER_SECOND,
+    capacity=settings.YFINANCE_RATE_LIMIT_BURST
+)
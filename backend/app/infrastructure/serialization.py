@@ -0,0 +1,186 @@
+# app/infrastructure/serialization.py
+
+import json
+import logging
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+
+# faster serializers and compressors are optional - json needs nothing extra
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+logger = logging.getLogger(__name__)
+
+# first byte of every encoded blob - never the first byte of JSON text, so
+# values written before codecs existed still decode as plain json
+MAGIC = b"\xc1"
+
+def _encode_type(obj: Any) -> Dict[str, Any]:
+    """Tag values the wire formats can't represent so they come back as the same type"""
+    if isinstance(obj, datetime):
+        return {"__type__": "datetime", "value": obj.isoformat()}
+    if isinstance(obj, date):
+        return {"__type__": "date", "value": obj.isoformat()}
+    if isinstance(obj, time):
+        return {"__type__": "time", "value": obj.isoformat()}
+    if isinstance(obj, Decimal):
+        return {"__type__": "decimal", "value": str(obj)}
+    if isinstance(obj, (set, frozenset)):
+        return {"__type__": "set", "value": list(obj)}
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
+_DECODERS = {
+    "datetime": datetime.fromisoformat,
+    "date": date.fromisoformat,
+    "time": time.fromisoformat,
+    "decimal": Decimal,
+    "set": set,
+}
+
+def _decode_type(obj: Dict[str, Any]) -> Any:
+    decoder = _DECODERS.get(obj.get("__type__")) if len(obj) == 2 else None
+    return decoder(obj["value"]) if decoder is not None else obj
+
+def _restore_types(obj: Any) -> Any:
+    """Walk a decoded structure for serializers without an object hook"""
+    if isinstance(obj, dict):
+        return _decode_type({k: _restore_types(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return [_restore_types(v) for v in obj]
+    return obj
+
+class JsonSerializer:
+    name = "json"
+    code = 1
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, default=_encode_type, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data, object_hook=_decode_type)
+
+class OrjsonSerializer:
+    name = "orjson"
+    code = 2
+
+    def dumps(self, value: Any) -> bytes:
+        # passthrough so datetimes get tagged instead of flattened to strings
+        return orjson.dumps(
+            value, default=_encode_type,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        )
+
+    def loads(self, data: bytes) -> Any:
+        return _restore_types(orjson.loads(data))
+
+class MsgpackSerializer:
+    name = "msgpack"
+    code = 3
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, default=_encode_type, datetime=False, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, object_hook=_decode_type, raw=False, strict_map_key=False)
+
+class ZstdCompressor:
+    name = "zstd"
+    code = 1
+
+    def compress(self, data: bytes) -> bytes:
+        return zstandard.ZstdCompressor(level=3).compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zstandard.ZstdDecompressor().decompress(data)
+
+class Lz4Compressor:
+    name = "lz4"
+    code = 2
+
+    def compress(self, data: bytes) -> bytes:
+        return lz4_frame.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return lz4_frame.decompress(data)
+
+SERIALIZERS = {
+    "json": (JsonSerializer, lambda: True),
+    "orjson": (OrjsonSerializer, lambda: orjson is not None),
+    "msgpack": (MsgpackSerializer, lambda: msgpack is not None),
+}
+
+COMPRESSORS = {
+    "zstd": (ZstdCompressor, lambda: zstandard is not None),
+    "lz4": (Lz4Compressor, lambda: lz4_frame is not None),
+}
+
+class CacheCodec:
+    """Serializes cache values to self-describing blobs, compressing large ones
+
+    Every blob starts with MAGIC, the serializer code and the compression code,
+    so readers decode whatever another worker (or an older version) wrote.
+    """
+
+    def __init__(self, serializer: str = "json", compression: Optional[str] = None,
+                 compress_min_bytes: int = 1024):
+        self.serializer = _build(SERIALIZERS, serializer, "serializer")
+        self.compressor = _build(COMPRESSORS, compression, "compression") if compression else None
+        self.compress_min_bytes = compress_min_bytes
+        self._serializers = {cls.code: cls() for cls, available in SERIALIZERS.values() if available()}
+        self._compressors = {cls.code: cls() for cls, available in COMPRESSORS.values() if available()}
+
+    def encode(self, value: Any) -> bytes:
+        data = self.serializer.dumps(value)
+        compression = 0
+        if self.compressor is not None and len(data) >= self.compress_min_bytes:
+            data = self.compressor.compress(data)
+            compression = self.compressor.code
+        return MAGIC + bytes((self.serializer.code, compression)) + data
+
+    def decode(self, blob: bytes) -> Any:
+        if isinstance(blob, str):
+            blob = blob.encode("utf-8")
+        if not blob.startswith(MAGIC):
+            # written as plain json before codecs existed
+            return json.loads(blob)
+
+        serializer_code, compression = blob[1], blob[2]
+        data = blob[3:]
+        if compression:
+            data = self._compressors[compression].decompress(data)
+        return self._serializers[serializer_code].loads(data)
+
+def _build(registry: Dict[str, Any], name: str, kind: str):
+    if name not in registry:
+        raise ValueError(f"Unknown cache {kind}: {name}")
+    cls, available = registry[name]
+    if not available():
+        raise ValueError(f"Cache {kind} {name} is not installed")
+    return cls()
+
+def get_codec() -> CacheCodec:
+    """Codec configured by CACHE_SERIALIZER / CACHE_COMPRESSION"""
+    compression = settings.CACHE_COMPRESSION if settings.CACHE_COMPRESSION != "none" else None
+    return CacheCodec(settings.CACHE_SERIALIZER, compression, settings.CACHE_COMPRESSION_MIN_BYTES)
@@ -0,0 +1,49 @@
+# app/infrastructure/singleflight.py
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one in-flight fetch"""
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run func for key, or join the call already in flight for it"""
+        task = self._inflight.get(key)
+
+        # only join tasks from this event loop (tests and the scheduler may run their own)
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            self.coalesced += 1
+            logger.debug(f"Joining in-flight fetch for {key}")
+        else:
+            self.calls += 1
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._forget(k, t))
+
+        # shield so one cancelled caller doesn't cancel the fetch for everyone else
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        """Drop a finished task, unless a newer one already replaced it"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def in_flight(self) -> int:
+        """Number of fetches currently running"""
+        return len(self._inflight)
+
+    def stats(self) -> Dict[str, int]:
+        """Get call and coalescing counters"""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": self.in_flight()
+        }
@@ -9,6 +9,12 @@ from app.core.middleware import setup_middleware
 from sqlalchemy import text
 from app.core.scheduler import start_scheduler, shutdown_scheduler, backfill_missing_snapshots
 from app.infrastructure.database import create_tables, SessionLocal
+from app.infrastructure.cache import async_cache_service
+from app.infrastructure.invalidation import invalidation_bus
+from app.infrastructure.executor import yfinance_executor
+from app.domains.stocks.services import StockService
+from app.domains.stocks.streaming import quote_hub
+from app.infrastructure.resilience import yfinance_breaker, yfinance_rate_limiter
 
 # domain API routers
 from app.domains.auth.api import router as auth_router
@@ -16,6 +22,7 @@ from app.domains.trading.api import router as trading_router
 from app.domains.stocks.api import router as stocks_router
 from app.domains.portfolio.api import router as portfolio_router
 from app.domains.bugs.api import router as bugs_router
+from app.domains.admin.api import router as admin_router
 
 # configure logging
 logging.basicConfig(level=getattr(logging, settings.LOG_LEVEL))
@@ -37,6 +44,7 @@ app.include_router(trading_router, prefix="/trading", tags=["trading"])
 app.include_router(stocks_router, prefix="/stocks", tags=["stocks"])
 app.include_router(portfolio_router, prefix="/portfolio", tags=["portfolio"])
 app.include_router(bugs_router, prefix="/bugs", tags=["bugs"])
+app.include_router(admin_router, prefix="/admin", tags=["admin"])
 
 @app.on_event("startup")
 async def startup_event():
@@ -55,7 +63,16 @@ async def startup_event():
         logger.error(f"Database unavailable at startup: {e}")
         logger.warning("App starting in degraded mode - DB features will fail until DB is restored")
 
+    # drop other workers' invalidated cache entries from our L1
+    invalidation_bus.start()
+
     if db_available:
+        # local symbol universe for validation and search (refreshed by the scheduler)
+        try:
+            StockService().load_symbol_universe()
+        except Exception as e:
+            logger.error(f"Error loading symbol universe: {e}")
+
         # backfill missing snapshots before scheduler creates today's live snapshot
         try:
             await backfill_missing_snapshots()
@@ -74,6 +91,10 @@ async def shutdown_event():
     """Cleanup on application shutdown"""
     logger.info("Shutting down application...")
     shutdown_scheduler()
+    await quote_hub.shutdown()
+    await invalidation_bus.stop()
+    await async_cache_service.close()
+    yfinance_executor.shutdown()
 
 @app.get("/")
 async def root():
@@ -101,7 +122,20 @@ async def health_check():
     return {
         "status": "healthy" if db_status == "connected" else "degraded",
         "version": settings.VERSION,
-        "database": db_status
+        "database": db_status,
+        "market_data_executor": yfinance_executor.stats()
+    }
+
+@app.get("/health/upstream")
+async def health_upstream():
+    """Market data upstream metrics - circuit breaker, rate limiter and executor state"""
+    breaker = yfinance_breaker.stats()
+    return {
+        "status": "degraded" if breaker["state"] != "closed" else "healthy",
+        "circuit_breaker": breaker,
+        "rate_limiter": yfinance_rate_limiter.stats(),
+        "executor": yfinance_executor.stats(),
+        "quote_stream": quote_hub.stats()
     }
 
 @app.get("/health/db")
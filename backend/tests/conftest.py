@@ -98,4 +98,55 @@ def authenticated_user(client, sample_user_data):
         "user_data": sample_user_data,
         "token": token,
         "headers": {"Authorization": f"Bearer {token}"}
-    }
\ No newline at end of file
+    }
+
+
+@pytest.fixture(autouse=True)
+def clear_quote_cache():
+    """Reset the process-wide quote cache so tests don't see each other's entries"""
+    from app.domains.stocks.services import shared_quote_cache, missing_symbol_cache
+    shared_quote_cache.clear()
+    missing_symbol_cache.clear()
+    yield
+    shared_quote_cache.clear()
+    missing_symbol_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_cached_functions():
+    """@cached results are keyed by user id, which tests reuse"""
+    from app.infrastructure.cache import cached_functions
+    for func in cached_functions.values():
+        func.cache_clear()
+    yield
+    for func in cached_functions.values():
+        func.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_valuation_store():
+    """Valuation states are keyed by user id, which tests reuse"""
+    from app.domains.portfolio.valuation import valuation_store
+    valuation_store.clear()
+    yield
+    valuation_store.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_symbol_index():
+    """Start every test with an empty in-memory symbol universe"""
+    from app.domains.stocks.universe import symbol_index
+    symbol_index.clear()
+    yield
+    symbol_index.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_upstream_guards():
+    """Close the yfinance circuit breaker and refill the rate limiter between tests"""
+    from app.infrastructure.resilience import yfinance_breaker, yfinance_rate_limiter
+    yfinance_breaker.reset()
+    yfinance_rate_limiter.reset()
+    yield
+    yfinance_breaker.reset()
+    yfinance_rate_limiter.reset()
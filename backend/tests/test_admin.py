@@ -0,0 +1,78 @@
+import pytest
+from datetime import timedelta
+from unittest.mock import patch
+
+from app.core.config import settings
+from app.domains.stocks.services import shared_quote_cache, missing_symbol_cache
+
+ADMIN_HEADERS = {"X-Admin-Token": "test-admin-token"}
+
+
+@pytest.fixture
+def admin_token():
+    with patch.object(settings, "ADMIN_API_TOKEN", "test-admin-token"):
+        yield
+
+
+class TestAdminCacheAPI:
+    """Test cache stats, metrics and flushing under /admin"""
+
+    def test_disabled_without_token_configured(self, client):
+        with patch.object(settings, "ADMIN_API_TOKEN", ""):
+            response = client.get("/admin/cache/stats", headers=ADMIN_HEADERS)
+
+        assert response.status_code == 403
+
+    def test_wrong_token_rejected(self, client, admin_token):
+        response = client.get("/admin/cache/stats", headers={"X-Admin-Token": "nope"})
+        assert response.status_code == 403
+
+        response = client.get("/admin/cache/stats")
+        assert response.status_code == 403
+
+    def test_stats_per_prefix(self, client, admin_token):
+        shared_quote_cache.local.set("quote_AAPL", {"price": 1.0}, timedelta(minutes=1))
+        shared_quote_cache.local.get("quote_AAPL")
+        shared_quote_cache.local.get("company_AAPL")
+
+        response = client.get("/admin/cache/stats", headers=ADMIN_HEADERS)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert {"stocks", "missing_symbols", "portfolio"} <= set(data["caches"])
+        prefixes = data["caches"]["stocks"]["prefixes"]
+        assert prefixes["quote"]["size"] == 1
+        assert prefixes["quote"]["hits"] == 1
+        assert prefixes["company"]["misses"] == 1
+        assert "PortfolioService.get_portfolio_summary" in data["functions"]
+
+    def test_prometheus_metrics(self, client, admin_token):
+        shared_quote_cache.local.set("quote_AAPL", {"price": 1.0}, timedelta(minutes=1))
+        shared_quote_cache.local.get("quote_AAPL")
+
+        response = client.get("/admin/cache/metrics", headers=ADMIN_HEADERS)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'mocktrade_cache_hits_total{cache="stocks",prefix="quote"} 1' in response.text
+        assert 'mocktrade_cache_entries{cache="stocks",prefix="quote"} 1' in response.text
+        assert "# TYPE mocktrade_cache_misses_total counter" in response.text
+
+    def test_flush_by_prefix(self, client, admin_token):
+        shared_quote_cache.local.set("quote_AAPL", {"price": 1.0}, timedelta(minutes=1))
+        shared_quote_cache.local.set("quote_MSFT", {"price": 2.0}, timedelta(minutes=1))
+        shared_quote_cache.local.set("company_AAPL", {"name": "Apple"}, timedelta(minutes=1))
+        missing_symbol_cache.set("missing_QUOTE", True)
+
+        response = client.post("/admin/cache/flush", params={"prefix": "quote_", "cache": "stocks"},
+                               headers=ADMIN_HEADERS)
+
+        assert response.status_code == 200
+        assert response.json()["flushed"] == {"stocks": 2}
+        assert shared_quote_cache.local.get("company_AAPL") == {"name": "Apple"}
+        assert missing_symbol_cache.get("missing_QUOTE") is True
+
+    def test_flush_unknown_cache(self, client, admin_token):
+        response = client.post("/admin/cache/flush", params={"prefix": "quote_", "cache": "nope"},
+                               headers=ADMIN_HEADERS)
+        assert response.status_code == 404
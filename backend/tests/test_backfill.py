@@ -1,3 +1,4 @@
+import pandas as pd
 import pytest
 from datetime import date, timedelta
 from unittest.mock import patch, AsyncMock
@@ -9,10 +10,14 @@ from app.domains.trading.repositories import PositionRepository
 from app.domains.auth.repositories import UserRepository
 from app.domains.auth.schemas import UserCreate
 from app.domains.stocks.external import YFinanceClient
+from app.domains.stocks.matrix import densify_closes
 from app.core.config import today_et
 from app.core.security import get_password_hash
 from app.core.scheduler import backfill_missing_snapshots
 
+# a Friday, so the week before it is all trading days
+TODAY = date(2024, 6, 28)
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -69,6 +74,19 @@ def _create_position(db, user_id, symbol, quantity, average_price):
     )
 
 
+def _closes_as_matrix(*batches):
+    """get_close_matrix side effect answering call n from batches[n] (the last one repeats)"""
+    calls = []
+
+    async def get_close_matrix(symbols, start_date, end_date):
+        closes = batches[min(len(calls), len(batches) - 1)]
+        calls.append(start_date)
+        frame = pd.DataFrame({sym: pd.Series(prices, dtype=float) for sym, prices in closes.items()})
+        return densify_closes(frame, start_date, end_date, symbols)
+
+    return get_close_matrix
+
+
 # ---------------------------------------------------------------------------
 # YFinanceClient.get_historical_closes
 # ---------------------------------------------------------------------------
@@ -215,6 +233,11 @@ class TestGetHistoricalCloses:
 class TestBackfillMissingSnapshots:
     """Tests for the historical reconstruction backfill."""
 
+    @pytest.fixture(autouse=True)
+    def today(self):
+        with patch("app.core.scheduler.today_et", return_value=TODAY):
+            yield
+
     @pytest.fixture
     def user(self, db):
         return _create_user(db)
@@ -236,7 +259,7 @@ class TestBackfillMissingSnapshots:
     async def test_no_gap(self, mock_session_local, db, user):
         """When the latest snapshot is yesterday or later, no backfill needed."""
         mock_session_local.return_value = _NoCloseSession(db)
-        yesterday = today_et() - timedelta(days=1)
+        yesterday = TODAY - timedelta(days=1)
         _create_snapshot(db, user.id, yesterday, 100000, 0, 100000)
 
         await backfill_missing_snapshots()
@@ -245,7 +268,7 @@ class TestBackfillMissingSnapshots:
         assert count == 1  # only the original
 
     @pytest.mark.asyncio
-    @patch("app.core.scheduler.YFinanceClient.get_historical_closes", new_callable=AsyncMock)
+    @patch("app.domains.stocks.services.StockService.get_close_matrix", new_callable=AsyncMock)
     @patch("app.core.scheduler.SessionLocal")
     async def test_backfill_reconstructs_values(self, mock_session_local, mock_hist, db, user):
         """
@@ -259,15 +282,15 @@ class TestBackfillMissingSnapshots:
         _create_position(db, user.id, "GOOGL", 5, 2800.0)
 
         # Last snapshot was 4 days ago
-        four_days_ago = today_et() - timedelta(days=4)
+        four_days_ago = TODAY - timedelta(days=4)
         _create_snapshot(db, user.id, four_days_ago, 94000 + 80000, 94000, 80000)
 
         # Historical prices for the 3 gap days
-        three_days_ago = today_et() - timedelta(days=3)
-        two_days_ago = today_et() - timedelta(days=2)
-        yesterday = today_et() - timedelta(days=1)
+        three_days_ago = TODAY - timedelta(days=3)
+        two_days_ago = TODAY - timedelta(days=2)
+        yesterday = TODAY - timedelta(days=1)
 
-        mock_hist.return_value = {
+        mock_hist.side_effect = _closes_as_matrix({
             "AAPL": {
                 three_days_ago: 155.0,
                 two_days_ago: 160.0,
@@ -278,7 +301,7 @@ class TestBackfillMissingSnapshots:
                 two_days_ago: 2900.0,
                 yesterday: 2870.0,
             },
-        }
+        })
 
         await backfill_missing_snapshots()
 
@@ -304,59 +327,70 @@ class TestBackfillMissingSnapshots:
         assert snap3.portfolio_value == pytest.approx(95930.0)
 
     @pytest.mark.asyncio
-    @patch("app.core.scheduler.YFinanceClient.get_historical_closes", new_callable=AsyncMock)
+    @patch("app.domains.stocks.services.StockService.get_close_matrix", new_callable=AsyncMock)
     @patch("app.core.scheduler.SessionLocal")
-    async def test_weekend_uses_friday_close(self, mock_session_local, mock_hist, db, user):
+    async def test_weekend_gets_no_snapshots(self, mock_session_local, mock_hist, db, user):
         """
-        On a weekend, yfinance has no data. Backfill should use Friday's
-        close, not fall back to average_price.
+        Markets are closed on weekends, so like the daily job the backfill
+        only writes snapshots for trading days.
         """
         mock_session_local.return_value = _NoCloseSession(db)
 
-        _create_position(db, user.id, "AAPL", 10, 100.0)  # avg_price = 100
+        _create_position(db, user.id, "AAPL", 10, 100.0)
 
-        # Snapshot from Thursday. Gap = Fri, Sat, Sun (3 days through Sunday).
-        # We need yesterday to be Sunday for this to work, so let's just
-        # use concrete dates.
-        thursday = date(2024, 6, 20)  # Thursday
+        thursday = date(2024, 6, 20)
         friday = date(2024, 6, 21)
         saturday = date(2024, 6, 22)
         sunday = date(2024, 6, 23)
 
         _create_snapshot(db, user.id, thursday, 101500, 1500, 100000)
 
-        # yfinance only has Friday's data (markets closed Sat/Sun)
-        mock_hist.return_value = {
+        mock_hist.side_effect = _closes_as_matrix({
             "AAPL": {friday: 155.0},
-        }
+        })
 
-        # Patch today_et() to return Monday June 24
-        monday = date(2024, 6, 24)
-        with patch("app.core.scheduler.date") as mock_date:
-            mock_date.today.return_value = monday
-            mock_date.side_effect = lambda *a, **kw: date(*a, **kw)
+        # today is Monday June 24, so the gap is Fri, Sat, Sun
+        with patch("app.core.scheduler.today_et", return_value=date(2024, 6, 24)):
             await backfill_missing_snapshots()
 
         repo = PortfolioRepository(db)
 
-        # Friday: 10 * 155 = 1550
         snap_fri = repo.get_snapshot_by_date(user.id, friday)
         assert snap_fri is not None
         assert snap_fri.positions_value == pytest.approx(1550.0)
 
-        # Saturday: no market data → should use Friday's 155.0, NOT avg 100.0
-        snap_sat = repo.get_snapshot_by_date(user.id, saturday)
-        assert snap_sat is not None
-        assert snap_sat.positions_value == pytest.approx(1550.0)  # same as Friday
-        assert snap_sat.positions_value != 1000.0  # would be 10*100 if fallback used
+        assert repo.get_snapshot_by_date(user.id, saturday) is None
+        assert repo.get_snapshot_by_date(user.id, sunday) is None
+
+    @pytest.mark.asyncio
+    @patch("app.domains.stocks.services.StockService.get_close_matrix", new_callable=AsyncMock)
+    @patch("app.core.scheduler.SessionLocal")
+    async def test_holiday_gets_no_snapshot(self, mock_session_local, mock_hist, db, user):
+        """A gap over a market holiday writes no row for the holiday."""
+        mock_session_local.return_value = _NoCloseSession(db)
+
+        _create_position(db, user.id, "AAPL", 10, 100.0)
 
-        # Sunday: same
-        snap_sun = repo.get_snapshot_by_date(user.id, sunday)
-        assert snap_sun is not None
-        assert snap_sun.positions_value == pytest.approx(1550.0)
+        wednesday = date(2024, 7, 3)
+        independence_day = date(2024, 7, 4)
+        friday = date(2024, 7, 5)
+
+        _create_snapshot(db, user.id, wednesday, 101500, 1500, 100000)
+
+        mock_hist.side_effect = _closes_as_matrix({
+            "AAPL": {wednesday: 150.0, friday: 160.0},
+        })
+
+        with patch("app.core.scheduler.today_et", return_value=date(2024, 7, 6)):
+            await backfill_missing_snapshots()
+
+        repo = PortfolioRepository(db)
+        assert repo.get_snapshot_by_date(user.id, independence_day) is None
+        assert repo.get_snapshot_by_date(user.id, friday).positions_value == pytest.approx(1600.0)
+        assert db.query(PortfolioSnapshot).count() == 2
 
     @pytest.mark.asyncio
-    @patch("app.core.scheduler.YFinanceClient.get_historical_closes", new_callable=AsyncMock)
+    @patch("app.domains.stocks.services.StockService.get_close_matrix", new_callable=AsyncMock)
     @patch("app.core.scheduler.SessionLocal")
     async def test_fallback_to_average_price_when_no_data(
         self, mock_session_local, mock_hist, db, user
@@ -370,14 +404,14 @@ class TestBackfillMissingSnapshots:
         _create_position(db, user.id, "AAPL", 10, 150.0)
         _create_position(db, user.id, "OBSCURE", 20, 50.0)
 
-        yesterday = today_et() - timedelta(days=1)
-        two_days_ago = today_et() - timedelta(days=2)
+        yesterday = TODAY - timedelta(days=1)
+        two_days_ago = TODAY - timedelta(days=2)
         _create_snapshot(db, user.id, two_days_ago, 102500, 2500, 100000)
 
         # yfinance succeeds for AAPL, but OBSCURE is still missing.
-        mock_hist.return_value = {
+        mock_hist.side_effect = _closes_as_matrix({
             "AAPL": {yesterday: 160.0},
-        }
+        })
 
         await backfill_missing_snapshots()
 
@@ -389,17 +423,17 @@ class TestBackfillMissingSnapshots:
         assert snap.portfolio_value == pytest.approx(102600.0)
 
     @pytest.mark.asyncio
-    @patch("app.core.scheduler.YFinanceClient.get_historical_closes", new_callable=AsyncMock)
+    @patch("app.domains.stocks.services.StockService.get_close_matrix", new_callable=AsyncMock)
     @patch("app.core.scheduler.SessionLocal")
     async def test_user_with_no_positions(self, mock_session_local, mock_hist, db, user):
         """User with no positions should get cash-only snapshots."""
         mock_session_local.return_value = _NoCloseSession(db)
 
-        yesterday = today_et() - timedelta(days=1)
-        two_days_ago = today_et() - timedelta(days=2)
+        yesterday = TODAY - timedelta(days=1)
+        two_days_ago = TODAY - timedelta(days=2)
         _create_snapshot(db, user.id, two_days_ago, 100000, 0, 100000)
 
-        mock_hist.return_value = {}
+        mock_hist.side_effect = _closes_as_matrix({})
 
         await backfill_missing_snapshots()
 
@@ -411,7 +445,7 @@ class TestBackfillMissingSnapshots:
         assert snap.cash_balance == 100000.0
 
     @pytest.mark.asyncio
-    @patch("app.core.scheduler.YFinanceClient.get_historical_closes", new_callable=AsyncMock)
+    @patch("app.domains.stocks.services.StockService.get_close_matrix", new_callable=AsyncMock)
     @patch("app.core.scheduler.SessionLocal")
     async def test_multiple_users(self, mock_session_local, mock_hist, db):
         """Backfill should work for multiple users independently."""
@@ -423,16 +457,16 @@ class TestBackfillMissingSnapshots:
         _create_position(db, user1.id, "AAPL", 10, 150.0)
         _create_position(db, user2.id, "MSFT", 20, 300.0)
 
-        yesterday = today_et() - timedelta(days=1)
-        two_days_ago = today_et() - timedelta(days=2)
+        yesterday = TODAY - timedelta(days=1)
+        two_days_ago = TODAY - timedelta(days=2)
 
         _create_snapshot(db, user1.id, two_days_ago, 101500, 1500, 100000)
         _create_snapshot(db, user2.id, two_days_ago, 106000, 6000, 100000)
 
-        mock_hist.return_value = {
+        mock_hist.side_effect = _closes_as_matrix({
             "AAPL": {yesterday: 160.0},
             "MSFT": {yesterday: 310.0},
-        }
+        })
 
         await backfill_missing_snapshots()
 
@@ -449,7 +483,7 @@ class TestBackfillMissingSnapshots:
         assert snap2.portfolio_value == pytest.approx(106200.0)
 
     @pytest.mark.asyncio
-    @patch("app.core.scheduler.YFinanceClient.get_historical_closes", new_callable=AsyncMock)
+    @patch("app.domains.stocks.services.StockService.get_close_matrix", new_callable=AsyncMock)
     @patch("app.core.scheduler.SessionLocal")
     async def test_existing_snapshot_not_overwritten(
         self, mock_session_local, mock_hist, db, user
@@ -459,16 +493,16 @@ class TestBackfillMissingSnapshots:
 
         _create_position(db, user.id, "AAPL", 10, 150.0)
 
-        yesterday = today_et() - timedelta(days=1)
-        three_days_ago = today_et() - timedelta(days=3)
+        yesterday = TODAY - timedelta(days=1)
+        three_days_ago = TODAY - timedelta(days=3)
 
         _create_snapshot(db, user.id, three_days_ago, 101500, 1500, 100000)
         # Manually create yesterday's snapshot with a specific value
         _create_snapshot(db, user.id, yesterday, 99999, 99999, 0)
 
-        mock_hist.return_value = {
+        mock_hist.side_effect = _closes_as_matrix({
             "AAPL": {yesterday: 200.0},
-        }
+        })
 
         await backfill_missing_snapshots()
 
@@ -478,7 +512,7 @@ class TestBackfillMissingSnapshots:
         assert snap.portfolio_value == pytest.approx(99999.0)
 
     @pytest.mark.asyncio
-    @patch("app.core.scheduler.YFinanceClient.get_historical_closes", new_callable=AsyncMock)
+    @patch("app.domains.stocks.services.StockService.get_close_matrix", new_callable=AsyncMock)
     @patch("app.core.scheduler.SessionLocal")
     async def test_gap_starting_on_weekend_uses_pre_gap_close(
         self, mock_session_local, mock_hist, db, user
@@ -486,7 +520,8 @@ class TestBackfillMissingSnapshots:
         """
         P1 fix: Last snapshot on Friday, DB pauses over weekend.
         Gap starts Saturday — the fetch window should include pre-gap
-        days so Saturday/Sunday use Friday's close, not average_price.
+        days so Monday, with no close of its own yet, uses Friday's close,
+        not average_price.
         """
         mock_session_local.return_value = _NoCloseSession(db)
 
@@ -494,39 +529,30 @@ class TestBackfillMissingSnapshots:
 
         friday = date(2024, 6, 21)
         saturday = date(2024, 6, 22)
-        sunday = date(2024, 6, 23)
+        monday = date(2024, 6, 24)
 
         # Last snapshot is Friday itself
         _create_snapshot(db, user.id, friday, 101550, 1550, 100000)
 
         # yfinance returns Friday's close in the buffer window (pre-gap),
-        # but nothing for Sat/Sun (markets closed)
-        mock_hist.return_value = {
+        # but nothing after it
+        mock_hist.side_effect = _closes_as_matrix({
             "AAPL": {friday: 155.0},
-        }
+        })
 
-        # Patch today_et() to return Monday June 24
-        monday = date(2024, 6, 24)
-        with patch("app.core.scheduler.date") as mock_date:
-            mock_date.today.return_value = monday
-            mock_date.side_effect = lambda *a, **kw: date(*a, **kw)
+        # today is Tuesday June 25
+        with patch("app.core.scheduler.today_et", return_value=date(2024, 6, 25)):
             await backfill_missing_snapshots()
 
         repo = PortfolioRepository(db)
 
-        # Saturday: should use Friday's 155.0 from the buffer, NOT avg 100.0
-        snap_sat = repo.get_snapshot_by_date(user.id, saturday)
-        assert snap_sat is not None
-        assert snap_sat.positions_value == pytest.approx(1550.0)  # 10 * 155
-        assert snap_sat.positions_value != 1000.0  # would be 10*100 if fallback used
-
-        # Sunday: same
-        snap_sun = repo.get_snapshot_by_date(user.id, sunday)
-        assert snap_sun is not None
-        assert snap_sun.positions_value == pytest.approx(1550.0)
+        snap_mon = repo.get_snapshot_by_date(user.id, monday)
+        assert snap_mon is not None
+        assert snap_mon.positions_value == pytest.approx(1550.0)  # 10 * 155
+        assert repo.get_snapshot_by_date(user.id, saturday) is None
 
     @pytest.mark.asyncio
-    @patch("app.core.scheduler.YFinanceClient.get_historical_closes", new_callable=AsyncMock)
+    @patch("app.domains.stocks.services.StockService.get_close_matrix", new_callable=AsyncMock)
     @patch("app.core.scheduler.SessionLocal")
     async def test_per_user_gap_detection(self, mock_session_local, mock_hist, db):
         """
@@ -540,19 +566,19 @@ class TestBackfillMissingSnapshots:
 
         _create_position(db, lagging_user.id, "AAPL", 10, 150.0)
 
-        yesterday = today_et() - timedelta(days=1)
-        three_days_ago = today_et() - timedelta(days=3)
+        yesterday = TODAY - timedelta(days=1)
+        three_days_ago = TODAY - timedelta(days=3)
 
         # current_user has yesterday's snapshot — no gap
         _create_snapshot(db, current_user.id, yesterday, 100000, 0, 100000)
         # lagging_user's last snapshot is 3 days old
         _create_snapshot(db, lagging_user.id, three_days_ago, 101500, 1500, 100000)
 
-        two_days_ago = today_et() - timedelta(days=2)
+        two_days_ago = TODAY - timedelta(days=2)
 
-        mock_hist.return_value = {
+        mock_hist.side_effect = _closes_as_matrix({
             "AAPL": {two_days_ago: 160.0, yesterday: 158.0},
-        }
+        })
 
         await backfill_missing_snapshots()
 
@@ -574,7 +600,7 @@ class TestBackfillMissingSnapshots:
         assert current_count == 1
 
     @pytest.mark.asyncio
-    @patch("app.core.scheduler.YFinanceClient.get_historical_closes", new_callable=AsyncMock)
+    @patch("app.domains.stocks.services.StockService.get_close_matrix", new_callable=AsyncMock)
     @patch("app.core.scheduler.SessionLocal")
     async def test_yfinance_failure_aborts_backfill(
         self, mock_session_local, mock_hist, db, user
@@ -587,8 +613,8 @@ class TestBackfillMissingSnapshots:
 
         _create_position(db, user.id, "AAPL", 10, 150.0)
 
-        yesterday = today_et() - timedelta(days=1)
-        two_days_ago = today_et() - timedelta(days=2)
+        yesterday = TODAY - timedelta(days=1)
+        two_days_ago = TODAY - timedelta(days=2)
         _create_snapshot(db, user.id, two_days_ago, 101500, 1500, 100000)
 
         mock_hist.side_effect = Exception("Yahoo Finance unavailable")
@@ -604,7 +630,7 @@ class TestBackfillMissingSnapshots:
         assert count == 1  # only the original
 
     @pytest.mark.asyncio
-    @patch("app.core.scheduler.YFinanceClient.get_historical_closes", new_callable=AsyncMock)
+    @patch("app.domains.stocks.services.StockService.get_close_matrix", new_callable=AsyncMock)
     @patch("app.core.scheduler.SessionLocal")
     async def test_all_empty_historical_batches_abort_backfill(
         self, mock_session_local, mock_hist, db, user
@@ -618,11 +644,11 @@ class TestBackfillMissingSnapshots:
 
         _create_position(db, user.id, "AAPL", 10, 150.0)
 
-        yesterday = today_et() - timedelta(days=1)
-        two_days_ago = today_et() - timedelta(days=2)
+        yesterday = TODAY - timedelta(days=1)
+        two_days_ago = TODAY - timedelta(days=2)
         _create_snapshot(db, user.id, two_days_ago, 101500, 1500, 100000)
 
-        mock_hist.return_value = {}
+        mock_hist.side_effect = _closes_as_matrix({})
 
         await backfill_missing_snapshots()
 
@@ -632,7 +658,7 @@ class TestBackfillMissingSnapshots:
         assert mock_hist.await_count == 4  # 7 -> 14 -> 28 -> 30 day lookbacks
 
     @pytest.mark.asyncio
-    @patch("app.core.scheduler.YFinanceClient.get_historical_closes", new_callable=AsyncMock)
+    @patch("app.domains.stocks.services.StockService.get_close_matrix", new_callable=AsyncMock)
     @patch("app.core.scheduler.SessionLocal")
     async def test_backfill_expands_lookback_until_pre_gap_close_found(
         self, mock_session_local, mock_hist, db, user
@@ -653,25 +679,70 @@ class TestBackfillMissingSnapshots:
 
         _create_snapshot(db, user.id, friday, 101550, 1550, 100000)
 
-        mock_hist.side_effect = [
+        mock_hist.side_effect = _closes_as_matrix(
             {"AAPL": {tuesday: 160.0}},
             {"AAPL": {friday: 155.0, tuesday: 160.0}},
-        ]
+        )
 
-        with patch("app.core.scheduler.date") as mock_date:
-            mock_date.today.return_value = date(2024, 1, 10)
-            mock_date.side_effect = lambda *a, **kw: date(*a, **kw)
+        with patch("app.core.scheduler.today_et", return_value=date(2024, 1, 10)):
             await backfill_missing_snapshots()
 
         repo = PortfolioRepository(db)
 
-        assert repo.get_snapshot_by_date(user.id, saturday).positions_value == pytest.approx(1550.0)
-        assert repo.get_snapshot_by_date(user.id, sunday).positions_value == pytest.approx(1550.0)
+        assert repo.get_snapshot_by_date(user.id, saturday) is None
+        assert repo.get_snapshot_by_date(user.id, sunday) is None
         assert repo.get_snapshot_by_date(user.id, monday).positions_value == pytest.approx(1550.0)
         assert repo.get_snapshot_by_date(user.id, tuesday).positions_value == pytest.approx(1600.0)
         assert mock_hist.await_count == 2
 
 
+class TestBackfillFromPriceBarStore:
+    """Backfill end to end through the local price bar store, only upstream mocked"""
+
+    @pytest.mark.asyncio
+    @patch("app.domains.stocks.external.YFinanceClient.get_price_bars", new_callable=AsyncMock)
+    @patch("app.core.scheduler.SessionLocal")
+    async def test_backfill_stores_and_reads_bars(self, mock_session_local, mock_bars, db):
+        from app.core import market_calendar
+        from app.domains.stocks.repositories import PriceBarRepository
+        from app.domains.stocks.schemas import PriceBarData
+
+        mock_session_local.return_value = _NoCloseSession(db)
+        user = _create_user(db)
+        _create_position(db, user.id, "AAPL", 10, 150.0)
+        yesterday = today_et() - timedelta(days=1)
+        gap_start = yesterday - timedelta(days=6)
+        _create_snapshot(db, user.id, gap_start - timedelta(days=1), 101500.0, 1500.0, 100000.0)
+
+        def close(day):
+            return 100.0 + day.day
+
+        async def bars(symbols, start_date, end_date):
+            return {
+                s: [PriceBarData(date=d, open=close(d), high=close(d), low=close(d), close=close(d), volume=1)
+                    for d in market_calendar.trading_days(start_date, end_date)]
+                for s in symbols
+            }
+
+        mock_bars.side_effect = bars
+
+        await backfill_missing_snapshots()
+
+        repo = PortfolioRepository(db)
+        day = gap_start
+        while day <= yesterday:
+            snapshot = repo.get_snapshot_by_date(user.id, day)
+            if market_calendar.is_trading_day(day):
+                assert snapshot.positions_value == pytest.approx(10 * close(day))
+            else:
+                assert snapshot is None
+            day += timedelta(days=1)
+
+        # the closes were written to the store, not just passed through
+        stored = PriceBarRepository(db).get_date_bounds(["AAPL"])["AAPL"]
+        assert stored[1] == market_calendar.trading_day_on_or_before(yesterday)
+
+
 class TestPortfolioRepository:
     def test_create_snapshot_is_idempotent(self, db):
         """Creating the same snapshot twice should return the existing row."""
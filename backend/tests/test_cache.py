@@ -0,0 +1,403 @@
+import pytest
+from datetime import timedelta
+from unittest.mock import patch, AsyncMock
+
+from app.infrastructure.cache import MemoryCache
+from app.domains.stocks.services import StockService, quote_cache
+
+
+class TestMemoryCache:
+    """Test the in-process LRU cache"""
+
+    def test_set_and_get(self):
+        cache = MemoryCache(max_size=10)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("missing") is None
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_expired_entry_is_a_miss(self):
+        cache = MemoryCache(max_size=10)
+        with patch("app.infrastructure.cache.time.monotonic", return_value=1000.0):
+            cache.set("a", 1, timedelta(seconds=30))
+        with patch("app.infrastructure.cache.time.monotonic", return_value=1031.0):
+            assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_stale_entry_within_window(self):
+        cache = MemoryCache(max_size=10)
+        with patch("app.infrastructure.cache.time.monotonic", return_value=1000.0):
+            cache.set("a", 1, timedelta(seconds=30), stale_ttl=timedelta(seconds=60))
+        with patch("app.infrastructure.cache.time.monotonic", return_value=1040.0):
+            assert cache.get("a") is None
+            assert cache.get_entry("a") == (1, 40.0, False)
+        with patch("app.infrastructure.cache.time.monotonic", return_value=1091.0):
+            assert cache.get_entry("a") is None
+        assert cache.stale_hits == 1
+
+    def test_lru_eviction(self):
+        cache = MemoryCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.evictions == 1
+
+    def test_stats(self):
+        cache = MemoryCache(max_size=10)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("b")
+
+        stats = cache.stats()
+        assert stats["size"] == 1
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+
+
+class TestCachePrefixStats:
+    """Test per-prefix counters and flushing"""
+
+    def test_counters_grouped_by_prefix(self):
+        cache = MemoryCache(max_size=2)
+        cache.set("quote_AAPL", 1)
+        cache.get("quote_AAPL")
+        cache.get("quote_MSFT")
+        cache.set("valid_AAPL", True)
+        cache.set("valid_MSFT", True)
+
+        stats = cache.prefix_stats()
+        assert stats["quote"]["hits"] == 1
+        assert stats["quote"]["misses"] == 1
+        # the quote was least recently used
+        assert stats["quote"]["evictions"] == 1
+        assert stats["quote"]["size"] == 0
+        assert stats["valid"]["size"] == 2
+        assert stats["valid"]["oldest_age_seconds"] >= 0
+
+    def test_flush_prefix(self):
+        cache = MemoryCache()
+        cache.set("quote_AAPL", 1)
+        cache.set("quote_MSFT", 2)
+        cache.set("company_AAPL", 3)
+
+        assert cache.flush_prefix("quote_") == 2
+        assert cache.get("quote_AAPL") is None
+        assert cache.get("company_AAPL") == 3
+
+
+class TestSharedQuoteCache:
+    """Test that StockService instances share one quote cache"""
+
+    @pytest.mark.asyncio
+    @patch("app.domains.stocks.external.YFinanceClient.get_current_price", new_callable=AsyncMock)
+    async def test_price_cached_across_instances(self, mock_price):
+        mock_price.return_value = 150.0
+
+        first = await StockService().get_current_price("AAPL")
+        second = await StockService().get_current_price("AAPL")
+
+        assert first["current_price"] == 150.0
+        assert second == first
+        assert mock_price.await_count == 1
+        assert quote_cache.hits == 1
+
+
+class TestTieredCache:
+    """Test the in-process + redis two-tier cache"""
+
+    @pytest.fixture
+    def redis_service(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        from app.infrastructure.cache import AsyncCacheService
+        return AsyncCacheService(redis_client=fakeredis.FakeAsyncRedis())
+
+    def _worker(self, shared):
+        from app.infrastructure.cache import TieredCache
+        return TieredCache(MemoryCache(max_size=10), shared, namespace="test", shared_prefixes=("quote_",))
+
+    @pytest.mark.asyncio
+    async def test_flush_prefix_reaches_redis(self, redis_service):
+        first, second = self._worker(redis_service), self._worker(redis_service)
+        await first.set("quote_AAPL", {"price": 150.0}, timedelta(minutes=1))
+        await first.set("quote_MSFT", {"price": 300.0}, timedelta(minutes=1))
+
+        assert await first.flush_prefix("quote_") == 4
+        assert await second.get("quote_AAPL") is None
+
+    @pytest.mark.asyncio
+    async def test_workers_share_entries(self, redis_service):
+        first, second = self._worker(redis_service), self._worker(redis_service)
+
+        await first.set("quote_AAPL", {"price": 150.0}, timedelta(minutes=1))
+
+        assert await second.get("quote_AAPL") == {"price": 150.0}
+        assert second.shared_hits == 1
+        # copied into the second worker's L1
+        assert second.local.get("quote_AAPL") == {"price": 150.0}
+
+    @pytest.mark.asyncio
+    async def test_unshared_keys_stay_local(self, redis_service):
+        first, second = self._worker(redis_service), self._worker(redis_service)
+
+        await first.set("bars_synced_AAPL", ["2024-01-01", "2024-01-31"])
+
+        assert await second.get("bars_synced_AAPL") is None
+        assert await first.get("bars_synced_AAPL") == ["2024-01-01", "2024-01-31"]
+
+    @pytest.mark.asyncio
+    async def test_fresh_shared_entry_beats_stale_local_one(self, redis_service):
+        first, second = self._worker(redis_service), self._worker(redis_service)
+
+        second.local.set("quote_AAPL", {"price": 100.0}, timedelta(seconds=-1), stale_ttl=timedelta(minutes=5))
+        await first.set("quote_AAPL", {"price": 150.0}, timedelta(minutes=1))
+
+        value, age, is_fresh = await second.get_entry("quote_AAPL")
+        assert value == {"price": 150.0}
+        assert is_fresh
+
+    @pytest.mark.asyncio
+    async def test_stale_shared_entry_is_servable(self, redis_service):
+        first, second = self._worker(redis_service), self._worker(redis_service)
+
+        await first.set("quote_AAPL", {"price": 150.0}, timedelta(seconds=-1), stale_ttl=timedelta(minutes=5))
+
+        assert await second.get("quote_AAPL") is None
+        value, age, is_fresh = await second.get_entry("quote_AAPL")
+        assert value == {"price": 150.0}
+        assert not is_fresh
+
+    @pytest.mark.asyncio
+    async def test_delete_removes_both_tiers(self, redis_service):
+        first, second = self._worker(redis_service), self._worker(redis_service)
+
+        await first.set("quote_AAPL", {"price": 150.0}, timedelta(minutes=1))
+        await first.delete("quote_AAPL")
+
+        assert await second.get("quote_AAPL") is None
+
+    @pytest.mark.asyncio
+    async def test_without_redis_is_local_only(self):
+        from app.infrastructure.cache import AsyncCacheService
+
+        cache = self._worker(AsyncCacheService(redis_client=None))
+        await cache.set("quote_AAPL", {"price": 150.0}, timedelta(minutes=1))
+
+        assert await cache.get("quote_AAPL") == {"price": 150.0}
+        assert cache.stats()["shared_enabled"] is False
+        assert cache.shared_misses == 0
+
+    @pytest.mark.asyncio
+    @patch("app.domains.stocks.external.YFinanceClient.get_quotes", new_callable=AsyncMock)
+    async def test_quotes_fetched_once_across_workers(self, mock_get_quotes, redis_service):
+        from app.domains.stocks.schemas import StockQuote
+
+        mock_get_quotes.return_value = {
+            "AAPL": StockQuote(symbol="AAPL", current_price=150.0, previous_close_price=149.0, timestamp="t")
+        }
+
+        workers = []
+        for _ in range(2):
+            service = StockService()
+            service._cache = self._worker(redis_service)
+            workers.append(service)
+
+        await workers[0].get_quotes(["AAPL"])
+        result = await workers[1].get_quotes(["AAPL"])
+
+        assert result["AAPL"]["current_price"] == 150.0
+        assert mock_get_quotes.await_count == 1
+
+
+class TestAsyncCacheService:
+    """Test batched reads and writes against redis"""
+
+    @pytest.fixture
+    def redis_service(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        from app.infrastructure.cache import AsyncCacheService
+        return AsyncCacheService(redis_client=fakeredis.FakeAsyncRedis())
+
+    @pytest.mark.asyncio
+    async def test_mset_and_mget_round_trip(self, redis_service):
+        await redis_service.mset([
+            ("a", {"price": 1.0}, timedelta(minutes=1)),
+            ("b", [1, 2], None),
+        ])
+
+        values = await redis_service.mget(["a", "b", "missing"])
+
+        assert values == {"a": {"price": 1.0}, "b": [1, 2]}
+        assert 0 < await redis_service.redis_client.ttl("a") <= 60
+        assert await redis_service.redis_client.ttl("b") == -1
+
+    @pytest.mark.asyncio
+    async def test_portfolio_quotes_read_in_one_round_trip(self, redis_service):
+        from app.infrastructure.cache import TieredCache
+
+        writer = TieredCache(MemoryCache(), redis_service, namespace="test", shared_prefixes=("quote_",))
+        reader = TieredCache(MemoryCache(), redis_service, namespace="test", shared_prefixes=("quote_",))
+        keys = [f"quote_SYM{i}" for i in range(30)]
+        await writer.set_many({k: {"price": 1.0} for k in keys}, timedelta(minutes=1))
+
+        with patch.object(redis_service, "get", wraps=redis_service.get) as single_get, \
+             patch.object(redis_service, "mget", wraps=redis_service.mget) as multi_get:
+            entries = await reader.get_entries(keys)
+
+        assert len(entries) == 30
+        assert multi_get.await_count == 1
+        assert single_get.await_count == 0
+
+    @pytest.mark.asyncio
+    async def test_disabled_service_is_a_no_op(self):
+        from app.infrastructure.cache import AsyncCacheService
+
+        service = AsyncCacheService(redis_client=None)
+
+        assert await service.set("a", 1) is False
+        assert await service.get("a") is None
+        assert await service.mget(["a"]) == {}
+        assert await service.mset([("a", 1, None)]) is False
+
+
+class TestCachedDecorator:
+    """Test the @cached service-method decorator"""
+
+    @pytest.mark.asyncio
+    async def test_second_call_is_a_hit(self):
+        from app.infrastructure.cache import cached
+        calls = []
+
+        @cached(ttl=timedelta(minutes=1))
+        async def lookup(symbol):
+            calls.append(symbol)
+            return {"symbol": symbol}
+
+        assert await lookup("AAPL") == {"symbol": "AAPL"}
+        assert await lookup("AAPL") == {"symbol": "AAPL"}
+        await lookup("MSFT")
+
+        assert calls == ["AAPL", "MSFT"]
+        stats = lookup.cache_stats()
+        assert (stats["hits"], stats["misses"]) == (1, 2)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_call(self):
+        import asyncio
+        from app.infrastructure.cache import cached
+        calls = 0
+
+        @cached(ttl=timedelta(minutes=1))
+        async def slow(key):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return key
+
+        results = await asyncio.gather(*(slow("a") for _ in range(5)))
+
+        assert results == ["a"] * 5
+        assert calls == 1
+        assert slow.cache_stats()["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_negative_results_and_errors_are_cached(self):
+        from app.infrastructure.cache import cached
+        from app.domains.stocks.services import StockError
+        calls = []
+
+        @cached(ttl=timedelta(minutes=1), negative_ttl=timedelta(minutes=1),
+                negative_exceptions=(StockError,))
+        async def lookup(symbol):
+            calls.append(symbol)
+            if symbol == "GONE":
+                raise StockError(f"{symbol} not found")
+            return None
+
+        assert await lookup("NONE") is None
+        assert await lookup("NONE") is None
+        for _ in range(2):
+            with pytest.raises(StockError, match="GONE not found"):
+                await lookup("GONE")
+
+        assert calls == ["NONE", "GONE"]
+        assert lookup.cache_stats()["negative_hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_other_errors_are_not_cached(self):
+        from app.infrastructure.cache import cached
+        calls = 0
+
+        @cached(ttl=timedelta(minutes=1), negative_ttl=timedelta(minutes=1))
+        async def flaky():
+            nonlocal calls
+            calls += 1
+            raise ConnectionError("upstream down")
+
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                await flaky()
+
+        assert calls == 2
+
+    @pytest.mark.asyncio
+    async def test_model_round_trip(self):
+        from pydantic import BaseModel
+        from app.infrastructure.cache import cached
+
+        class Quote(BaseModel):
+            symbol: str
+            price: float
+
+        @cached(ttl=timedelta(minutes=1), model=Quote)
+        async def quote(symbol):
+            return Quote(symbol=symbol, price=1.5)
+
+        first = await quote("AAPL")
+        second = await quote("AAPL")
+
+        assert isinstance(second, Quote)
+        assert second == first
+        assert second is not first
+
+    @pytest.mark.asyncio
+    async def test_tag_invalidation(self):
+        from app.infrastructure.cache import cached
+        calls = 0
+
+        @cached(ttl=timedelta(minutes=1), key=lambda user_id: f"summary_{user_id}",
+                tags=lambda user_id: [f"user:{user_id}"])
+        async def summary(user_id):
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await summary(1) == 1
+        assert await summary(1) == 1
+        await summary.cache.invalidate_tags(["user:1"])
+        assert await summary(1) == 2
+
+    def test_sync_methods_use_the_local_tier(self):
+        from app.infrastructure.cache import cached, cached_functions
+        calls = 0
+
+        class Service:
+            @cached(ttl=timedelta(minutes=1))
+            def history(self, user_id, period="1m"):
+                nonlocal calls
+                calls += 1
+                return [user_id, period]
+
+        service = Service()
+        assert service.history(1) == [1, "1m"]
+        assert service.history(1, period="1m") == [1, "1m"]
+        assert calls == 1
+        assert Service.history.cache_key(service, 1) == f"{Service.history.__qualname__}(user_id=1,period='1m')"
+        assert Service.history.__qualname__ in cached_functions
@@ -0,0 +1,78 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.infrastructure.executor import BlockingIOExecutor
+
+
+class TestBlockingIOExecutor:
+    """Test the bounded executor used for blocking yfinance calls"""
+
+    @pytest.mark.asyncio
+    async def test_runs_off_the_event_loop(self):
+        executor = BlockingIOExecutor(max_workers=2, name="test")
+        loop_thread = threading.get_ident()
+
+        worker_thread = await executor.run(threading.get_ident)
+
+        assert worker_thread != loop_thread
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_blocking_call_does_not_stall_loop(self):
+        executor = BlockingIOExecutor(max_workers=1, name="test")
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(executor.run(time.sleep, 0.1), ticker())
+
+        assert len(ticks) == 5
+        assert ticks[-1] - ticks[0] < 0.1
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_stats_track_queue_depth(self):
+        executor = BlockingIOExecutor(max_workers=1, name="test")
+        release = threading.Event()
+
+        tasks = [asyncio.ensure_future(executor.run(release.wait, 1)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+
+        stats = executor.stats()
+        assert stats["active"] == 1
+        assert stats["queued"] == 2
+
+        release.set()
+        await asyncio.gather(*tasks)
+
+        stats = executor.stats()
+        assert stats["completed"] == 3
+        assert stats["queued"] == 0
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_failures_are_counted_and_raised(self):
+        executor = BlockingIOExecutor(max_workers=1, name="test")
+
+        def boom():
+            raise ValueError("upstream error")
+
+        with pytest.raises(ValueError):
+            await executor.run(boom)
+
+        assert executor.stats()["failed"] == 1
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_usable_after_shutdown(self):
+        executor = BlockingIOExecutor(max_workers=1, name="test")
+        executor.shutdown()
+
+        assert await executor.run(lambda: 42) == 42
+        executor.shutdown()
@@ -0,0 +1,161 @@
+import asyncio
+import pytest
+from datetime import timedelta
+from unittest.mock import patch
+
+from app.infrastructure.cache import AsyncCacheService, MemoryCache, TieredCache
+from app.infrastructure.invalidation import InvalidationBus, user_tag
+
+
+@pytest.fixture
+def redis_service():
+    fakeredis = pytest.importorskip("fakeredis")
+    return AsyncCacheService(redis_client=fakeredis.FakeAsyncRedis(server=fakeredis.FakeServer()))
+
+
+def _cache(shared):
+    return TieredCache(MemoryCache(), shared, namespace="test", shared_prefixes=("summary_",))
+
+
+class TestTaggedCache:
+    """Test dropping cache entries by tag"""
+
+    @pytest.mark.asyncio
+    async def test_invalidate_drops_only_tagged_entries(self):
+        cache = _cache(AsyncCacheService(redis_client=None))
+        await cache.set("summary_1", {"v": 1}, timedelta(minutes=5), tags=[user_tag(1)])
+        await cache.set("summary_2", {"v": 2}, timedelta(minutes=5), tags=[user_tag(2)])
+
+        assert await cache.invalidate_tags([user_tag(1)]) == 1
+
+        assert await cache.get("summary_1") is None
+        assert await cache.get("summary_2") == {"v": 2}
+
+    @pytest.mark.asyncio
+    async def test_invalidate_reaches_entries_written_by_other_workers(self, redis_service):
+        writer, invalidator = _cache(redis_service), _cache(redis_service)
+        await writer.set("summary_1", {"v": 1}, timedelta(minutes=5), tags=[user_tag(1)])
+
+        # the invalidating worker never saw the key, redis knows it by tag
+        await invalidator.invalidate_tags([user_tag(1)])
+        writer.local.clear()
+
+        assert await writer.get("summary_1") is None
+
+
+    @pytest.mark.asyncio
+    async def test_entries_loaded_from_redis_keep_their_tags(self, redis_service):
+        writer, reader = _cache(redis_service), _cache(redis_service)
+        await writer.set("summary_1", {"v": 1}, timedelta(minutes=5), tags=[user_tag(1)])
+        assert await reader.get("summary_1") == {"v": 1}
+
+        # what the reader's bus does on another worker's invalidation
+        assert reader.drop_local_tags([user_tag(1)]) == 1
+        await writer.invalidate_tags([user_tag(1)])
+
+        assert await reader.get("summary_1") is None
+
+    @pytest.mark.asyncio
+    async def test_value_built_across_an_invalidation_is_not_stored(self, redis_service):
+        from app.infrastructure.cache import cached
+
+        cache = _cache(redis_service)
+        calls = 0
+
+        @cached(ttl=timedelta(minutes=5), backend=cache, key=lambda user_id: f"summary_{user_id}",
+                tags=lambda user_id: [user_tag(user_id)])
+        async def summary(user_id):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                # a trade lands while the first summary is being built
+                await cache.invalidate_tags([user_tag(user_id)])
+            return calls
+
+        assert await summary(1) == 1
+        assert await redis_service.get("test:summary_1") is None
+        assert await summary(1) == 2
+        assert await summary(1) == 2
+
+
+class TestInvalidationBus:
+    """Test publishing invalidations to every registered cache and worker"""
+
+    @pytest.mark.asyncio
+    async def test_publish_drops_registered_caches(self):
+        shared = AsyncCacheService(redis_client=None)
+        bus = InvalidationBus(shared)
+        cache = bus.register(_cache(shared))
+        await cache.set("summary_1", {"v": 1}, timedelta(minutes=5), tags=[user_tag(1)])
+
+        await bus.publish(user_tag(1))
+
+        assert await cache.get("summary_1") is None
+        assert bus.stats()["published"] == 1
+
+    @pytest.mark.asyncio
+    async def test_other_workers_drop_their_local_copies(self, redis_service):
+        first_bus, second_bus = InvalidationBus(redis_service), InvalidationBus(redis_service)
+        first_bus.register(_cache(redis_service))
+        second_cache = second_bus.register(_cache(redis_service))
+        second_cache.local.set("summary_1", {"v": 1}, timedelta(minutes=5))
+        second_cache._tagged[user_tag(1)] = {"summary_1"}
+
+        second_bus.start()
+        await asyncio.sleep(0.05)
+        await first_bus.publish(user_tag(1))
+        for _ in range(50):
+            if second_bus.received:
+                break
+            await asyncio.sleep(0.01)
+        await second_bus.stop()
+
+        assert second_bus.received == 1
+        assert second_cache.local.get("summary_1") is None
+
+
+class TestSummaryInvalidation:
+    """Test that cached portfolio summaries are dropped by trades"""
+
+    @pytest.fixture
+    def test_user(self, db):
+        from app.domains.auth.repositories import UserRepository
+        from app.domains.auth.schemas import UserCreate
+        from app.core.security import get_password_hash
+
+        user_data = UserCreate(
+            first_name="John",
+            last_name="Doe",
+            email="john@example.com",
+            username="johndoe",
+            password="password123"
+        )
+        return UserRepository(db).create(user_data, get_password_hash("password123"))
+
+    @pytest.mark.asyncio
+    @patch('app.domains.stocks.services.StockService.get_company_info')
+    @patch('app.domains.stocks.services.StockService.get_quotes')
+    async def test_summary_cached_until_trade(self, mock_get_quotes, mock_get_info, db, test_user):
+        from app.domains.portfolio.services import PortfolioService
+        from app.domains.trading.schemas import OrderCreate
+        from app.domains.trading.services import TradingService
+
+        async def quotes(symbols):
+            return {s: {"symbol": s, "current_price": 100.0, "previous_close_price": 100.0} for s in symbols}
+
+        mock_get_quotes.side_effect = quotes
+        mock_get_info.return_value = {}
+        service = PortfolioService(db)
+
+        first = await service.get_portfolio_summary(test_user.id)
+        second = await service.get_portfolio_summary(test_user.id)
+        assert second == first
+        assert first.positions_count == 0
+
+        await TradingService(db).execute_order(
+            test_user, OrderCreate(symbol="AAPL", action="buy", quantity=10), 100.0
+        )
+        after_trade = await service.get_portfolio_summary(test_user.id)
+
+        assert after_trade.positions_count == 1
+        assert after_trade.cash_balance == first.cash_balance - 1000.0
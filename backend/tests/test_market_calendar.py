@@ -0,0 +1,99 @@
+import pytest
+from datetime import date, datetime, timedelta
+from unittest.mock import patch, AsyncMock
+
+from app.core import market_calendar
+from app.core.config import ET
+from app.core.scheduler import create_daily_snapshots
+from app.domains.stocks.services import market_aware_ttl, PRICE_CACHE_TTL
+
+
+class TestHolidays:
+    """Test the NYSE holiday and early-close rules"""
+
+    def test_2024_holidays(self):
+        assert sorted(market_calendar.holidays(2024)) == [
+            date(2024, 1, 1), date(2024, 1, 15), date(2024, 2, 19), date(2024, 3, 29),
+            date(2024, 5, 27), date(2024, 6, 19), date(2024, 7, 4), date(2024, 9, 2),
+            date(2024, 11, 28), date(2024, 12, 25),
+        ]
+
+    def test_weekend_holidays_are_observed(self):
+        # July 4th 2026 is a Saturday, Christmas 2022 a Sunday
+        assert date(2026, 7, 3) in market_calendar.holidays(2026)
+        assert date(2022, 12, 26) in market_calendar.holidays(2022)
+
+    def test_saturday_new_year_not_observed(self):
+        # Jan 1 2022 was a Saturday - NYSE stayed open on Dec 31 2021
+        assert market_calendar.is_trading_day(date(2021, 12, 31))
+
+    def test_special_closure(self):
+        assert not market_calendar.is_trading_day(date(2025, 1, 9))
+
+    def test_early_closes(self):
+        assert sorted(market_calendar.early_closes(2024)) == [
+            date(2024, 7, 3), date(2024, 11, 29), date(2024, 12, 24)
+        ]
+        # July 3rd 2026 is the observed holiday, not an early close
+        assert date(2026, 7, 3) not in market_calendar.early_closes(2026)
+
+
+class TestSessions:
+    """Test session hours and trading-day navigation"""
+
+    def test_early_close_session(self):
+        assert market_calendar.is_open(datetime(2024, 11, 29, 12, 59, tzinfo=ET))
+        assert not market_calendar.is_open(datetime(2024, 11, 29, 13, 0, tzinfo=ET))
+
+    def test_closed_on_holiday(self):
+        assert market_calendar.session(date(2024, 12, 25)) is None
+        assert not market_calendar.is_open(datetime(2024, 12, 25, 11, 0, tzinfo=ET))
+
+    def test_next_open_skips_weekend_and_holiday(self):
+        # Friday evening before MLK day -> Tuesday open
+        now = datetime(2024, 1, 12, 17, 0, tzinfo=ET)
+
+        assert market_calendar.next_open(now) == datetime(2024, 1, 16, 9, 30, tzinfo=ET)
+        assert market_calendar.seconds_until_open(now) == (
+            datetime(2024, 1, 16, 9, 30, tzinfo=ET) - now
+        ).total_seconds()
+
+    def test_seconds_until_open_during_session(self):
+        assert market_calendar.seconds_until_open(datetime(2024, 1, 3, 10, 0, tzinfo=ET)) == 0.0
+
+    def test_previous_trading_day(self):
+        assert market_calendar.previous_trading_day(date(2024, 1, 16)) == date(2024, 1, 12)
+        assert market_calendar.trading_day_on_or_before(date(2024, 1, 14)) == date(2024, 1, 12)
+        assert market_calendar.trading_day_on_or_before(date(2024, 1, 12)) == date(2024, 1, 12)
+
+    def test_trading_days(self):
+        assert market_calendar.trading_days(date(2024, 1, 12), date(2024, 1, 16)) == [
+            date(2024, 1, 12), date(2024, 1, 16)
+        ]
+
+
+class TestMarketAwareTtl:
+    """Test price caching that holds outside market hours"""
+
+    def test_regular_ttl_during_session(self):
+        assert market_aware_ttl(PRICE_CACHE_TTL, datetime(2024, 1, 3, 10, 0, tzinfo=ET)) == PRICE_CACHE_TTL
+
+    def test_regular_ttl_while_close_settles(self):
+        assert market_aware_ttl(PRICE_CACHE_TTL, datetime(2024, 1, 3, 16, 5, tzinfo=ET)) == PRICE_CACHE_TTL
+
+    def test_held_until_next_open(self):
+        now = datetime(2024, 1, 12, 20, 0, tzinfo=ET)
+
+        assert market_aware_ttl(PRICE_CACHE_TTL, now) == datetime(2024, 1, 16, 9, 30, tzinfo=ET) - now
+
+
+class TestSnapshotSchedule:
+    """Test that the snapshot job skips non-trading days"""
+
+    @pytest.mark.asyncio
+    @patch("app.core.scheduler.SessionLocal")
+    @patch("app.core.scheduler.today_et", return_value=date(2024, 12, 25))
+    async def test_skips_holiday(self, mock_today, mock_session_local):
+        await create_daily_snapshots()
+
+        mock_session_local.assert_not_called()
@@ -0,0 +1,108 @@
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+
+from app.domains.stocks import providers
+from app.domains.stocks.external import YFinanceClient
+from app.domains.stocks.providers import MarketDataProvider, get_market_data_provider
+from app.domains.stocks.replay import ReplayProvider
+from app.domains.stocks.services import StockService
+
+REPLAY_CSV = """symbol,date,close,name,market_cap
+AAPL,2024-01-02,180.0,Apple Inc.,2800000000000
+AAPL,2024-01-03,185.0,Apple Inc.,2800000000000
+MSFT,2024-01-02,400.0,Microsoft Corporation,
+MSFT,2024-01-03,390.0,Microsoft Corporation,
+^GSPC,2024-01-02,4700.0,,
+^GSPC,2024-01-03,4750.0,,
+"""
+
+
+@pytest.fixture
+def replay_path(tmp_path):
+    path = tmp_path / "quotes.csv"
+    path.write_text(REPLAY_CSV)
+    return str(path)
+
+
+@pytest.fixture
+def replay(replay_path):
+    return ReplayProvider(replay_path)
+
+
+class TestProviderSelection:
+    """Test the settings-driven provider factory"""
+
+    def test_defaults_to_yfinance(self):
+        provider = get_market_data_provider()
+
+        assert isinstance(provider, YFinanceClient)
+        assert isinstance(provider, MarketDataProvider)
+
+    def test_replay_selected_by_settings(self, replay_path):
+        with patch.object(providers.settings, "MARKET_DATA_PROVIDER", "replay"), \
+             patch.object(providers.settings, "MARKET_DATA_REPLAY_PATH", replay_path), \
+             patch.object(providers, "_replay_provider", None):
+            provider = get_market_data_provider()
+
+            assert isinstance(provider, ReplayProvider)
+            assert isinstance(provider, MarketDataProvider)
+            assert get_market_data_provider() is provider
+
+    def test_unknown_provider(self):
+        with patch.object(providers.settings, "MARKET_DATA_PROVIDER", "bloomberg"):
+            with pytest.raises(ValueError):
+                get_market_data_provider()
+
+
+class TestReplayProvider:
+    """Test the file-backed replay provider"""
+
+    @pytest.mark.asyncio
+    async def test_quotes_use_last_two_closes(self, replay):
+        quotes = await replay.get_quotes(["AAPL", "MSFT", "NOPE"])
+
+        assert set(quotes) == {"AAPL", "MSFT"}
+        assert quotes["AAPL"].current_price == 185.0
+        assert quotes["AAPL"].previous_close_price == 180.0
+
+    @pytest.mark.asyncio
+    async def test_metadata_and_validation(self, replay):
+        metadata = await replay.get_symbol_metadata("aapl")
+
+        assert metadata.company_name == "Apple Inc."
+        assert metadata.market_cap == 2.8e12
+        assert (await replay.get_symbol_metadata("MSFT")).market_cap is None
+        assert await replay.validate_symbol("msft") is True
+        assert await replay.validate_symbol("NOPE") is False
+
+    @pytest.mark.asyncio
+    async def test_historical_closes_in_range(self, replay):
+        closes = await replay.get_historical_closes(["AAPL"], date(2024, 1, 3), date(2024, 1, 5))
+
+        assert closes == {"AAPL": {date(2024, 1, 3): 185.0}}
+
+    @pytest.mark.asyncio
+    async def test_indices_and_movers(self, replay):
+        indices = await replay.get_market_indices()
+        movers = await replay.get_market_movers()
+
+        assert [i.ticker for i in indices] == ["^GSPC"]
+        assert [m.symbol for m in movers["gainers"]] == ["AAPL"]
+        assert [m.symbol for m in movers["losers"]] == ["MSFT"]
+
+    def test_missing_columns(self, tmp_path):
+        path = tmp_path / "bad.csv"
+        path.write_text("symbol,price\nAAPL,1.0\n")
+
+        with pytest.raises(ValueError):
+            ReplayProvider(str(path))
+
+    @pytest.mark.asyncio
+    async def test_stock_service_runs_on_replay(self, replay):
+        with patch("app.domains.stocks.services.get_market_data_provider", return_value=replay):
+            service = StockService()
+            price = await service.get_current_price("AAPL")
+
+        assert price["current_price"] == 185.0
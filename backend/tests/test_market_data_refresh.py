@@ -0,0 +1,103 @@
+import pytest
+from datetime import datetime
+from unittest.mock import patch, AsyncMock
+
+from app.core.config import ET
+from app.core.scheduler import refresh_market_data, _is_market_hours
+from app.domains.trading.repositories import PositionRepository, WatchlistRepository
+from app.domains.auth.repositories import UserRepository
+from app.domains.auth.schemas import UserCreate
+from app.core.security import get_password_hash
+
+
+class _NoCloseSession:
+    """Wraps a SQLAlchemy Session but ignores close() so the test fixture
+    retains control over the session lifecycle."""
+
+    def __init__(self, real_db):
+        self._db = real_db
+
+    def close(self):
+        pass  # intentional no-op
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+
+@pytest.fixture
+def user(db):
+    return UserRepository(db).create(
+        UserCreate(
+            first_name="John",
+            last_name="Doe",
+            email="john@example.com",
+            username="johndoe",
+            password="password123",
+        ),
+        get_password_hash("password123"),
+    )
+
+
+class TestMarketHours:
+    """Tests for the regular-session check."""
+
+    def test_open_on_weekday_session(self):
+        assert _is_market_hours(datetime(2024, 1, 3, 10, 0, tzinfo=ET))
+
+    def test_closed_before_open_and_at_close(self):
+        assert not _is_market_hours(datetime(2024, 1, 3, 9, 29, tzinfo=ET))
+        assert not _is_market_hours(datetime(2024, 1, 3, 16, 0, tzinfo=ET))
+
+    def test_closed_on_weekend(self):
+        assert not _is_market_hours(datetime(2024, 1, 6, 12, 0, tzinfo=ET))
+
+
+class TestRefreshMarketData:
+    """Tests for the background quote pre-warmer."""
+
+    @pytest.mark.asyncio
+    @patch("app.core.scheduler.StockService.refresh_quotes", new_callable=AsyncMock)
+    @patch("app.core.scheduler._is_market_hours", return_value=True)
+    @patch("app.core.scheduler.SessionLocal")
+    async def test_refreshes_union_of_held_and_watched(self, mock_session_local, _, mock_refresh, db, user):
+        mock_session_local.return_value = _NoCloseSession(db)
+        PositionRepository(db).create(user.id, "AAPL", 10, 150.0)
+        WatchlistRepository(db).create(user.id, "AAPL")
+        WatchlistRepository(db).create(user.id, "MSFT")
+        mock_refresh.return_value = 2
+
+        await refresh_market_data()
+
+        mock_refresh.assert_awaited_once_with(["AAPL", "MSFT"])
+
+    @pytest.mark.asyncio
+    @patch("app.core.scheduler.StockService.refresh_quotes", new_callable=AsyncMock)
+    @patch("app.core.scheduler._is_market_hours", return_value=False)
+    @patch("app.core.scheduler.SessionLocal")
+    async def test_skips_outside_market_hours(self, mock_session_local, _, mock_refresh, db, user):
+        mock_session_local.return_value = _NoCloseSession(db)
+        PositionRepository(db).create(user.id, "AAPL", 10, 150.0)
+
+        await refresh_market_data()
+
+        mock_refresh.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    @patch("app.domains.stocks.external.YFinanceClient.get_quotes", new_callable=AsyncMock)
+    async def test_refresh_quotes_overwrites_cache(self, mock_get_quotes):
+        from app.domains.stocks.schemas import StockQuote
+        from app.domains.stocks.services import StockService
+
+        def quote(price):
+            return {"AAPL": StockQuote(symbol="AAPL", current_price=price, previous_close_price=100.0, timestamp="t")}
+
+        service = StockService()
+        mock_get_quotes.return_value = quote(101.0)
+        await service.get_quotes(["AAPL"])
+
+        mock_get_quotes.return_value = quote(102.0)
+        await service.refresh_quotes(["AAPL"])
+        result = await service.get_quotes(["AAPL"])
+
+        assert result["AAPL"]["current_price"] == 102.0
+        assert mock_get_quotes.await_count == 2
@@ -150,18 +150,23 @@ class TestPortfolioService:
         
         return positions
 
-    @patch('app.domains.stocks.services.StockService.get_stock_data')
-    async def test_get_portfolio_summary_success(self, mock_get_data, portfolio_service, test_user, test_positions):
+    @patch('app.domains.stocks.services.StockService.get_company_info')
+    @patch('app.domains.stocks.services.StockService.get_quotes')
+    async def test_get_portfolio_summary_success(self, mock_get_quotes, mock_get_info, portfolio_service, test_user, test_positions):
         """Test successful portfolio summary calculation"""
-        # mock stock service responses - using async side_effect
-        async def side_effect(symbol):
-            data = {
-                "AAPL": {"current_price": 160.0, "company_name": "Apple Inc."},
-                "GOOGL": {"current_price": 2600.0, "company_name": "Alphabet Inc."}
+        # mock one batch quote call plus company info lookups
+        async def quotes_side_effect(symbols):
+            prices = {"AAPL": 160.0, "GOOGL": 2600.0}
+            return {
+                s: {"symbol": s, "current_price": prices[s], "previous_close_price": prices[s]}
+                for s in symbols
             }
-            return data[symbol]
 
-        mock_get_data.side_effect = side_effect
+        mock_get_quotes.side_effect = quotes_side_effect
+        mock_get_info.return_value = {
+            "AAPL": {"company_name": "Apple Inc.", "market_capitalization": "N/A"},
+            "GOOGL": {"company_name": "Alphabet Inc.", "market_capitalization": "N/A"}
+        }
 
         summary = await portfolio_service.get_portfolio_summary(test_user.id)
 
@@ -169,6 +174,8 @@ class TestPortfolioService:
         assert summary.positions_value == (10 * 160.0) + (5 * 2600.0)  # 1600 + 13000 = 14600
         assert summary.portfolio_value == summary.cash_balance + summary.positions_value
         assert summary.positions_count == 2
+        assert mock_get_quotes.call_count == 1
+        assert {p.company_name for p in summary.positions} == {"Apple Inc.", "Alphabet Inc."}
 
     async def test_get_portfolio_summary_no_positions(self, portfolio_service, test_user):
         """Test portfolio summary with no positions"""
@@ -184,11 +191,13 @@ class TestPortfolioService:
         with pytest.raises(PortfolioError):
             await portfolio_service.get_portfolio_summary(999999)
 
-    @patch('app.domains.stocks.services.StockService.get_stock_data')
-    async def test_get_portfolio_summary_stock_price_error(self, mock_get_data, portfolio_service, test_user, test_positions):
+    @patch('app.domains.stocks.services.StockService.get_company_info')
+    @patch('app.domains.stocks.services.StockService.get_quotes')
+    async def test_get_portfolio_summary_stock_price_error(self, mock_get_quotes, mock_get_info, portfolio_service, test_user, test_positions):
         """Test portfolio summary when stock price fetch fails"""
         # mock stock service to raise exception
-        mock_get_data.side_effect = Exception("API Error")
+        mock_get_quotes.side_effect = Exception("API Error")
+        mock_get_info.return_value = {}
 
         # should use average price as fallback
         summary = await portfolio_service.get_portfolio_summary(test_user.id)
@@ -0,0 +1,168 @@
+from datetime import date, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pandas as pd
+import pytest
+
+from app.core import market_calendar
+from app.core.config import today_et
+from app.domains.stocks.external import YFinanceClient
+from app.domains.stocks.repositories import PriceBarRepository
+from app.domains.stocks.schemas import PriceBarData
+from app.domains.stocks.services import StockService
+
+
+def _bar(day: date, close: float) -> PriceBarData:
+    return PriceBarData(date=day, open=close, high=close, low=close, close=close, volume=1000)
+
+
+class TestFetchPriceBars:
+    """Test splitting yf.download output into per-symbol OHLCV bars"""
+
+    @pytest.mark.asyncio
+    @patch("app.domains.stocks.external.yf.download")
+    async def test_multi_symbol_frame(self, mock_download):
+        dates = pd.to_datetime(["2024-01-02", "2024-01-03"])
+        columns = pd.MultiIndex.from_product([["Open", "High", "Low", "Close", "Volume"], ["AAPL", "MSFT"]])
+        mock_download.return_value = pd.DataFrame(
+            [[1, 2, 3, 4, 0.5, 1.5, 2, 3, 100, 200],
+             [5, 6, 7, 8, 4.5, 5.5, 6, float("nan"), 300, 400]],
+            index=dates, columns=columns
+        )
+
+        bars = await YFinanceClient().get_price_bars(["AAPL", "MSFT"], date(2024, 1, 2), date(2024, 1, 3))
+
+        assert [b.close for b in bars["AAPL"]] == [2.0, 6.0]
+        assert bars["AAPL"][0].open == 1.0
+        assert bars["AAPL"][1].volume == 300
+        # NaN closes are dropped
+        assert [b.date for b in bars["MSFT"]] == [date(2024, 1, 2)]
+
+
+class TestPriceBarSync:
+    """Test the incremental price bar sync and local reads"""
+
+    @pytest.mark.asyncio
+    @patch("app.domains.stocks.external.YFinanceClient.get_price_bars", new_callable=AsyncMock)
+    async def test_sync_only_fetches_after_last_bar(self, mock_bars, db):
+        yesterday = today_et() - timedelta(days=1)
+        start = yesterday - timedelta(days=10)
+        PriceBarRepository(db).upsert_bars("AAPL", [_bar(start, 100.0), _bar(start + timedelta(days=4), 104.0)])
+        mock_bars.return_value = {"AAPL": [_bar(start + timedelta(days=5), 105.0)]}
+
+        written = await StockService(db).sync_price_bars(["AAPL"], start, yesterday)
+
+        mock_bars.assert_awaited_once_with(["AAPL"], start + timedelta(days=5), yesterday)
+        assert written == 1
+
+    @pytest.mark.asyncio
+    @patch("app.domains.stocks.external.YFinanceClient.get_price_bars", new_callable=AsyncMock)
+    async def test_weekend_start_covered_by_first_session(self, mock_bars, db):
+        yesterday = today_et() - timedelta(days=1)
+        saturday = yesterday - timedelta(days=14 + (yesterday.weekday() - 5) % 7)
+        sessions = market_calendar.trading_days(saturday, saturday + timedelta(days=6))
+        PriceBarRepository(db).upsert_bars("AAPL", [_bar(day, 100.0) for day in sessions])
+        mock_bars.return_value = {}
+        service = StockService(db)
+
+        for _ in range(2):
+            await service.sync_price_bars(["AAPL"], saturday, yesterday)
+            # forget the per-worker marker so the store bounds decide
+            service._cache.clear()
+
+        assert mock_bars.await_count == 2
+        for call in mock_bars.await_args_list:
+            assert call.args[1] == sessions[-1] + timedelta(days=1)
+
+    @pytest.mark.asyncio
+    @patch("app.domains.stocks.external.YFinanceClient.get_price_bars", new_callable=AsyncMock)
+    async def test_symbols_batched_by_start_date(self, mock_bars, db):
+        yesterday = today_et() - timedelta(days=1)
+        start = yesterday - timedelta(days=10)
+        mock_bars.return_value = {}
+
+        await StockService(db).sync_price_bars(["AAPL", "MSFT"], start, yesterday)
+
+        mock_bars.assert_awaited_once_with(["AAPL", "MSFT"], start, yesterday)
+
+    @pytest.mark.asyncio
+    @patch("app.domains.stocks.external.YFinanceClient.get_price_bars", new_callable=AsyncMock)
+    async def test_historical_closes_served_locally(self, mock_bars, db):
+        yesterday = today_et() - timedelta(days=1)
+        start = yesterday - timedelta(days=3)
+        mock_bars.return_value = {"AAPL": [_bar(start, 100.0), _bar(yesterday, 103.0)]}
+        service = StockService(db)
+
+        first = await service.get_close_matrix(["AAPL"], start, yesterday)
+        second = await service.get_close_matrix(["AAPL"], start, yesterday)
+
+        assert first.equals(second)
+        assert first["AAPL"].iloc[0] == 100.0
+        assert first["AAPL"].iloc[-1] == 103.0
+        assert mock_bars.await_count == 1
+
+    @pytest.mark.asyncio
+    @patch("app.domains.stocks.external.YFinanceClient.get_price_bars", new_callable=AsyncMock)
+    async def test_todays_bar_not_stored(self, mock_bars, db):
+        mock_bars.return_value = {}
+
+        await StockService(db).sync_price_bars(["AAPL"], today_et(), today_et())
+
+        mock_bars.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    @patch("app.domains.stocks.external.YFinanceClient.get_price_bars", new_callable=AsyncMock)
+    async def test_upstream_error_propagates(self, mock_bars, db):
+        yesterday = today_et() - timedelta(days=1)
+        mock_bars.side_effect = RuntimeError("upstream down")
+
+        with pytest.raises(RuntimeError):
+            await StockService(db).get_close_matrix(["AAPL"], yesterday - timedelta(days=10), yesterday)
+
+    @patch("app.domains.stocks.external.YFinanceClient.get_price_bars", new_callable=AsyncMock)
+    def test_history_endpoint(self, mock_bars, client, authenticated_user):
+        yesterday = today_et() - timedelta(days=1)
+        mock_bars.return_value = {"AAPL": [_bar(yesterday, 190.0)]}
+
+        response = client.get("/stocks/aapl/history?period=5d", headers=authenticated_user["headers"])
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["symbol"] == "AAPL"
+        assert [bar["close"] for bar in data["bars"]] == [190.0]
+
+
+class TestCloseMatrix:
+    """Test the dense forward-filled close matrix"""
+
+    def test_weekend_carry_forward(self):
+        from app.domains.stocks.matrix import densify_closes
+
+        friday, monday = date(2024, 1, 5), date(2024, 1, 8)
+        frame = pd.DataFrame({"AAPL": [150.0, 155.0], "MSFT": [float("nan"), 400.0]}, index=[friday, monday])
+        matrix = densify_closes(frame, date(2024, 1, 6), monday, ["AAPL", "MSFT", "NOPE"])
+
+        assert list(matrix.index.date) == [date(2024, 1, 6), date(2024, 1, 7), monday]
+        assert list(matrix["AAPL"]) == [150.0, 150.0, 155.0]
+        # no close yet -> NaN, unknown symbol -> all NaN
+        assert matrix["MSFT"].isna().tolist() == [True, True, False]
+        assert matrix["NOPE"].isna().all()
+
+    def test_empty_closes(self):
+        from app.domains.stocks.matrix import densify_closes
+
+        matrix = densify_closes(pd.DataFrame(), date(2024, 1, 6), date(2024, 1, 7), ["AAPL"])
+
+        assert matrix.shape == (2, 1)
+        assert matrix["AAPL"].isna().all()
+
+    @pytest.mark.asyncio
+    @patch("app.domains.stocks.external.YFinanceClient.get_price_bars", new_callable=AsyncMock)
+    async def test_matrix_from_store(self, mock_bars, db):
+        yesterday = today_et() - timedelta(days=1)
+        PriceBarRepository(db).upsert_bars("AAPL", [_bar(yesterday - timedelta(days=3), 100.0)])
+        mock_bars.return_value = {}
+
+        matrix = await StockService(db).get_close_matrix(["AAPL"], yesterday - timedelta(days=1), yesterday)
+
+        assert list(matrix["AAPL"]) == [100.0, 100.0]
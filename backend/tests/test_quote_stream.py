@@ -0,0 +1,194 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+
+from app.domains.stocks.streaming import QuoteHub
+
+
+def _quote(symbol, price):
+    return {"symbol": symbol, "current_price": price, "previous_close_price": 100.0, "timestamp": "t"}
+
+
+class TestQuoteHub:
+    """Test fan-out of batched, streamed quotes"""
+
+    @pytest.mark.asyncio
+    async def test_subscribers_share_one_poller(self):
+        calls = []
+
+        async def fetch(symbols):
+            calls.append(symbols)
+            return {s: _quote(s, 101.0) for s in symbols}
+
+        hub = QuoteHub(interval=0.01, fetch=fetch)
+        queues = [hub.connect() for _ in range(100)]
+        for queue in queues:
+            hub.subscribe(queue, ["spy"])
+
+        messages = await asyncio.gather(*[asyncio.wait_for(q.get(), 1) for q in queues])
+        await asyncio.sleep(0.05)
+
+        assert all(m["symbol"] == "SPY" and m["data"]["current_price"] == 101.0 for m in messages)
+        assert hub.stats()["symbols"] == 1
+        # polls are per tick, not per subscriber
+        assert len(calls) < 20
+        await hub.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_only_changes_are_pushed(self):
+        prices = iter([101.0, 101.0, 102.0] + [102.0] * 100)
+
+        async def fetch(symbols):
+            return {s: _quote(s, next(prices)) for s in symbols}
+
+        hub = QuoteHub(interval=0.01, fetch=fetch)
+        queue = hub.connect()
+        hub.subscribe(queue, ["AAPL"])
+        await asyncio.sleep(0.1)
+
+        pushed = [queue.get_nowait()["data"]["current_price"] for _ in range(queue.qsize())]
+        assert pushed == [101.0, 102.0]
+        await hub.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_late_joiner_gets_last_quote(self):
+        async def fetch(symbols):
+            return {s: _quote(s, 101.0) for s in symbols}
+
+        hub = QuoteHub(interval=10, fetch=fetch)
+        first = hub.connect()
+        hub.subscribe(first, ["AAPL"])
+        await asyncio.wait_for(first.get(), 1)
+
+        second = hub.connect()
+        hub.subscribe(second, ["AAPL"])
+
+        assert second.get_nowait()["data"]["current_price"] == 101.0
+        await hub.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_last_unsubscribe_stops_poller(self):
+        async def fetch(symbols):
+            return {s: _quote(s, 101.0) for s in symbols}
+
+        hub = QuoteHub(interval=0.01, fetch=fetch)
+        first, second = hub.connect(), hub.connect()
+        hub.subscribe(first, ["AAPL"])
+        hub.subscribe(second, ["AAPL", "MSFT"])
+
+        hub.disconnect(first)
+        assert hub.stats()["symbols"] == 2
+
+        hub.unsubscribe(second, ["aapl"])
+        assert hub.stats()["symbols"] == 1
+
+        hub.disconnect(second)
+        assert hub.stats()["symbols"] == 0
+        assert hub.stats()["connections"] == 0
+
+    @pytest.mark.asyncio
+    async def test_subscriptions_are_capped_per_connection(self):
+        async def fetch(symbols):
+            return {}
+
+        hub = QuoteHub(interval=10, fetch=fetch, max_symbols_per_connection=2)
+        queue = hub.connect()
+
+        assert hub.subscribe(queue, ["AAPL", "MSFT", "NVDA"]) == ["AAPL", "MSFT"]
+        await hub.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_unknown_symbols_are_rejected(self):
+        from app.domains.stocks.universe import symbol_index
+
+        symbol_index.load({"AAPL": "Apple Inc."})
+        calls = []
+
+        async def fetch(symbols):
+            calls.append(symbols)
+            return {}
+
+        hub = QuoteHub(interval=10, fetch=fetch)
+        queue = hub.connect()
+
+        assert hub.subscribe(queue, ["aapl", "NOTREAL", "ZZZZ1"]) == ["AAPL"]
+        assert hub.stats()["symbols_rejected"] == 2
+        await asyncio.sleep(0.01)
+        assert calls == [["AAPL"]]
+        await hub.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_all_symbols_polled_in_batches(self):
+        calls = []
+
+        async def fetch(symbols):
+            calls.append(symbols)
+            return {s: _quote(s, 101.0) for s in symbols}
+
+        hub = QuoteHub(interval=10, fetch=fetch, batch_size=2, is_streamable=lambda s: True)
+        first, second = hub.connect(), hub.connect()
+        hub.subscribe(first, ["AAPL", "MSFT"])
+        hub.subscribe(second, ["MSFT", "NVDA"])
+        await asyncio.sleep(0.01)
+
+        # one tick covers every symbol in this worker
+        assert calls == [["AAPL", "MSFT"], ["NVDA"]]
+        assert {first.get_nowait()["symbol"] for _ in range(2)} == {"AAPL", "MSFT"}
+        assert {second.get_nowait()["symbol"] for _ in range(2)} == {"MSFT", "NVDA"}
+
+        # a new symbol wakes the poller instead of waiting for the next tick
+        hub.subscribe(first, ["TSLA"])
+        await asyncio.sleep(0.01)
+        assert first.get_nowait()["symbol"] == "TSLA"
+        await hub.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_slow_consumers_drop_oldest_updates(self):
+        from app.domains.stocks.streaming import STREAM_QUEUE_SIZE
+
+        hub = QuoteHub(interval=10, fetch=lambda symbols: {})
+        queue = hub.connect()
+        for i in range(STREAM_QUEUE_SIZE + 5):
+            hub._send(queue, {"seq": i})
+
+        assert queue.qsize() == STREAM_QUEUE_SIZE
+        assert queue.get_nowait()["seq"] == 5
+        assert hub.messages_dropped == 5
+
+
+class TestStreamEndpoint:
+    """Test the /stocks/stream WebSocket"""
+
+    def test_rejects_invalid_token(self, client):
+        from starlette.websockets import WebSocketDisconnect
+
+        with pytest.raises(WebSocketDisconnect):
+            with client.websocket_connect("/stocks/stream?token=bad") as ws:
+                ws.receive_json()
+
+    @patch("app.domains.stocks.services.StockService.get_quotes")
+    def test_streams_subscribed_quotes(self, mock_get_quotes, client, authenticated_user, db):
+        async def get_quotes(symbols):
+            return {s: _quote(s, 150.0) for s in symbols}
+
+        mock_get_quotes.side_effect = get_quotes
+        token = authenticated_user["token"]
+
+        with patch("app.domains.stocks.api.SessionLocal", return_value=db), \
+             patch.object(db, "close") as close_session, \
+             client.websocket_connect(f"/stocks/stream?token={token}&symbols=aapl") as ws:
+            assert ws.receive_json() == {"type": "subscribed", "symbols": ["AAPL"]}
+            # the auth session is released before streaming starts
+            close_session.assert_called_once()
+            update = ws.receive_json()
+            assert update["type"] == "quote"
+            assert update["data"]["current_price"] == 150.0
+
+            ws.send_json({"action": "subscribe", "symbols": ["MSFT"]})
+            messages = [ws.receive_json(), ws.receive_json()]
+            assert {"type": "subscribed", "symbols": ["AAPL", "MSFT"]} in messages
+
+            ws.send_json({"action": "bogus"})
+            while (message := ws.receive_json())["type"] == "quote":
+                pass
+            assert message["type"] == "error"
@@ -0,0 +1,174 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.domains.stocks.external import YFinanceClient
+from app.infrastructure.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RateLimitExceededError,
+    TokenBucket,
+    yfinance_breaker,
+)
+
+
+class TestCircuitBreaker:
+    """Test the open/half-open/closed state machine"""
+
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker("test", failure_threshold=3, recovery_timeout=60)
+
+        for _ in range(3):
+            breaker.before_call()
+            breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        assert breaker.stats()["rejected"] == 1
+
+    def test_success_resets_failure_count(self):
+        breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=60)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_allows_single_probe(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        breaker.before_call()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+    def test_half_open_probe_result(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        breaker.before_call()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+
+        time.sleep(0.02)
+        breaker.before_call()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+
+class TestTokenBucket:
+    """Test the adaptive token-bucket rate limiter"""
+
+    def test_burst_then_empty(self):
+        bucket = TokenBucket("test", rate=0.1, capacity=2)
+
+        assert bucket.try_acquire()
+        assert bucket.try_acquire()
+        assert not bucket.try_acquire()
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits_for_refill(self):
+        bucket = TokenBucket("test", rate=50, capacity=1)
+        await bucket.acquire(timeout=1)
+
+        start = time.monotonic()
+        await bucket.acquire(timeout=1)
+
+        assert time.monotonic() - start > 0.01
+        assert bucket.stats()["throttled"] == 1
+
+    @pytest.mark.asyncio
+    async def test_acquire_fails_fast_past_timeout(self):
+        bucket = TokenBucket("test", rate=0.1, capacity=1)
+        await bucket.acquire(timeout=1)
+
+        with pytest.raises(RateLimitExceededError):
+            await bucket.acquire(timeout=0.05)
+
+    def test_penalize_and_reward(self):
+        bucket = TokenBucket("test", rate=4, capacity=4, min_rate=1)
+
+        bucket.penalize()
+        bucket.penalize()
+        bucket.penalize()
+        assert bucket.rate == 1
+
+        for _ in range(20):
+            bucket.reward()
+        assert bucket.rate == 4
+
+
+class TestClientGuards:
+    """Test that YFinanceClient calls go through the breaker"""
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_upstream(self):
+        client = YFinanceClient()
+        for _ in range(yfinance_breaker.failure_threshold):
+            yfinance_breaker.record_failure()
+
+        with patch("app.domains.stocks.external.yf.download") as mock_download:
+            quotes = await client.get_quotes(["AAPL"])
+
+        assert quotes == {}
+        mock_download.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_upstream_errors_open_circuit(self):
+        client = YFinanceClient()
+
+        with patch("app.domains.stocks.external.yf.Ticker", side_effect=RuntimeError("429")):
+            for _ in range(yfinance_breaker.failure_threshold):
+                with pytest.raises(RuntimeError):
+                    await client.validate_symbol("AAPL")
+
+            with pytest.raises(CircuitOpenError):
+                await client.validate_symbol("AAPL")
+
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_reopens_circuit(self):
+        client = YFinanceClient()
+        for _ in range(yfinance_breaker.failure_threshold):
+            yfinance_breaker.record_failure()
+        yfinance_breaker._opened_at -= yfinance_breaker.recovery_timeout
+        assert yfinance_breaker.state == "half_open"
+
+        with patch("app.domains.stocks.external.yf.Ticker", side_effect=lambda s: time.sleep(0.2)):
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(client.validate_symbol("AAPL"), timeout=0.05)
+
+        # the probe failed, so the next recovery window gets a fresh probe
+        assert yfinance_breaker.state == "open"
+        yfinance_breaker._opened_at -= yfinance_breaker.recovery_timeout
+        with patch("app.domains.stocks.external.yf.Ticker") as mock_ticker:
+            mock_ticker.return_value.info = {"symbol": "AAPL"}
+            await client.validate_symbol("AAPL")
+        assert yfinance_breaker.state == "closed"
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_call_leaves_probe_slot(self):
+        client = YFinanceClient()
+        for _ in range(yfinance_breaker.failure_threshold):
+            yfinance_breaker.record_failure()
+        yfinance_breaker._opened_at -= yfinance_breaker.recovery_timeout
+
+        with patch.object(client.rate_limiter, "acquire", side_effect=RateLimitExceededError("limited")):
+            with pytest.raises(RateLimitExceededError):
+                await client.validate_symbol("AAPL")
+
+        assert yfinance_breaker._half_open_calls == 0
+
+    def test_upstream_metrics_endpoint(self, client):
+        response = client.get("/health/upstream")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["circuit_breaker"]["state"] == "closed"
+        assert "tokens" in data["rate_limiter"]
+        assert "active" in data["executor"]
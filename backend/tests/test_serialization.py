@@ -0,0 +1,94 @@
+import json
+import pytest
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+from app.infrastructure.serialization import CacheCodec, MAGIC
+
+VALUE = {
+    "symbol": "AAPL",
+    "price": 150.25,
+    "as_of": datetime(2024, 1, 2, 16, 0, tzinfo=timezone.utc),
+    "day": date(2024, 1, 2),
+    "cost": Decimal("1234.56"),
+    "tags": {"tech"},
+    "bars": [{"date": date(2024, 1, 1), "close": 149.0}],
+}
+
+
+def _codec(serializer, compression=None, **kwargs):
+    modules = {"orjson": "orjson", "msgpack": "msgpack", "zstd": "zstandard", "lz4": "lz4.frame"}
+    for name in (serializer, compression):
+        if name in modules:
+            pytest.importorskip(modules[name])
+    return CacheCodec(serializer, compression, **kwargs)
+
+
+class TestCacheCodec:
+    """Test typed round-tripping and compression of cached values"""
+
+    @pytest.mark.parametrize("serializer", ["json", "orjson", "msgpack"])
+    def test_round_trip_keeps_types(self, serializer):
+        codec = _codec(serializer)
+
+        assert codec.decode(codec.encode(VALUE)) == VALUE
+
+    @pytest.mark.parametrize("compression", ["zstd", "lz4"])
+    def test_large_values_are_compressed(self, compression):
+        codec = _codec("json", compression, compress_min_bytes=100)
+        history = [{"date": date(2024, 1, 1), "close": 100.0 + i} for i in range(500)]
+
+        blob = codec.encode(history)
+
+        assert blob[2] != 0
+        assert len(blob) < len(_codec("json").encode(history))
+        assert codec.decode(blob) == history
+
+    def test_small_values_are_not_compressed(self):
+        codec = _codec("json", "zstd", compress_min_bytes=1024)
+
+        blob = codec.encode({"price": 1.0})
+
+        assert blob[2] == 0
+        assert codec.decode(blob) == {"price": 1.0}
+
+    def test_reads_blobs_from_other_codecs(self):
+        writer = _codec("msgpack", "lz4", compress_min_bytes=0)
+        reader = _codec("json")
+
+        assert reader.decode(writer.encode(VALUE)) == VALUE
+
+    def test_reads_legacy_plain_json(self):
+        codec = _codec("json")
+        legacy = json.dumps({"price": 1.0}).encode("utf-8")
+
+        assert not legacy.startswith(MAGIC)
+        assert codec.decode(legacy) == {"price": 1.0}
+
+    def test_unknown_serializer_raises(self):
+        with pytest.raises(ValueError):
+            CacheCodec("pickle")
+
+
+class TestCacheServiceCodec:
+    """Test that redis values go through the configured codec"""
+
+    @pytest.mark.asyncio
+    async def test_async_service_round_trips_datetimes(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        from app.infrastructure.cache import AsyncCacheService
+
+        service = AsyncCacheService(redis_client=fakeredis.FakeAsyncRedis(), codec=_codec("msgpack", "zstd"))
+        await service.set("a", VALUE)
+
+        assert await service.get("a") == VALUE
+        assert await service.mget(["a"]) == {"a": VALUE}
+
+    def test_sync_service_round_trips_datetimes(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        from app.infrastructure.cache import CacheService
+
+        service = CacheService(redis_client=fakeredis.FakeRedis(), codec=_codec("orjson"))
+        service.set("a", VALUE)
+
+        assert service.get("a") == VALUE
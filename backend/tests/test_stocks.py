@@ -2,7 +2,7 @@ import pytest
 from fastapi import status
 from unittest.mock import patch, MagicMock
 
-from app.domains.stocks.services import StockService, StockError
+from app.domains.stocks.services import StockService, StockError, quote_cache
 
 
 class TestStocksAPI:
@@ -154,3 +154,551 @@ class TestStocksAPI:
         assert len(data["gainers"]) == 1
         assert len(data["losers"]) == 1
 
+
+
+class TestQuoteCoalescing:
+    """Test single-flight coalescing of concurrent quote fetches"""
+
+    @pytest.mark.asyncio
+    async def test_singleflight_shares_one_call(self):
+        import asyncio
+        from app.infrastructure.singleflight import SingleFlight
+
+        flight = SingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*[flight.do("AAPL", fetch) for _ in range(5)])
+
+        assert results == ["result"] * 5
+        assert calls == 1
+        assert flight.coalesced == 4
+        assert flight.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_singleflight_propagates_errors_to_all_callers(self):
+        import asyncio
+        from app.infrastructure.singleflight import SingleFlight
+
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream error")
+
+        results = await asyncio.gather(*[flight.do("AAPL", fetch) for _ in range(3)], return_exceptions=True)
+
+        assert all(isinstance(r, ValueError) for r in results)
+        assert flight.in_flight() == 0
+
+    @pytest.mark.asyncio
+    @patch('app.domains.stocks.external.YFinanceClient.get_current_price')
+    async def test_concurrent_price_requests_fetch_once(self, mock_get_price):
+        import asyncio
+
+        async def slow_fetch(symbol):
+            await asyncio.sleep(0.01)
+            return 150.0
+
+        mock_get_price.side_effect = slow_fetch
+
+        results = await asyncio.gather(*[StockService().get_current_price("AAPL") for _ in range(10)])
+
+        assert all(r["current_price"] == 150.0 for r in results)
+        assert mock_get_price.call_count == 1
+
+
+class TestBatchQuotes:
+    """Test batch quote fetching"""
+
+    def _quote(self, symbol, price, previous):
+        from app.domains.stocks.schemas import StockQuote
+        return StockQuote(
+            symbol=symbol,
+            current_price=price,
+            previous_close_price=previous,
+            timestamp="2024-01-01T12:00:00"
+        )
+
+    @patch('app.domains.stocks.external.yf.download')
+    @pytest.mark.asyncio
+    async def test_client_parses_batch_download(self, mock_download):
+        import pandas as pd
+        from app.domains.stocks.external import YFinanceClient
+
+        dates = pd.to_datetime(["2024-01-02", "2024-01-03"])
+        columns = pd.MultiIndex.from_tuples([("Close", "AAPL"), ("Close", "MSFT")])
+        mock_download.return_value = pd.DataFrame(
+            [[150.0, 370.0], [155.0, 375.0]], index=dates, columns=columns
+        )
+
+        quotes = await YFinanceClient().get_quotes(["AAPL", "MSFT", "NOPE"])
+
+        assert mock_download.call_count == 1
+        assert quotes["AAPL"].current_price == 155.0
+        assert quotes["AAPL"].previous_close_price == 150.0
+        assert quotes["MSFT"].current_price == 375.0
+        assert "NOPE" not in quotes
+
+    @patch('app.domains.stocks.external.YFinanceClient.get_quotes')
+    @pytest.mark.asyncio
+    async def test_service_only_fetches_cache_misses(self, mock_get_quotes):
+        async def side_effect(symbols):
+            return {s: self._quote(s, 100.0, 99.0) for s in symbols}
+
+        mock_get_quotes.side_effect = side_effect
+        service = StockService()
+
+        await service.get_quotes(["AAPL"])
+        result = await service.get_quotes(["aapl", "MSFT"])
+
+        assert set(result) == {"AAPL", "MSFT"}
+        assert mock_get_quotes.call_args_list[1].args[0] == ["MSFT"]
+
+        # batch results also serve single-price lookups
+        price = await service.get_current_price("MSFT")
+        assert price["current_price"] == 100.0
+        assert mock_get_quotes.call_count == 2
+
+    @patch('app.domains.stocks.services.StockService.get_quotes')
+    def test_quotes_endpoint(self, mock_get_quotes, client, authenticated_user):
+        mock_get_quotes.return_value = {
+            "AAPL": {
+                "symbol": "AAPL",
+                "current_price": 155.0,
+                "previous_close_price": 150.0,
+                "timestamp": "2024-01-01T12:00:00"
+            }
+        }
+
+        response = client.post(
+            "/stocks/quotes",
+            json={"symbols": ["aapl", "NOPE", "AAPL"]},
+            headers=authenticated_user["headers"]
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [q["symbol"] for q in data["quotes"]] == ["AAPL"]
+        assert data["missing"] == ["NOPE"]
+        mock_get_quotes.assert_called_once_with(["AAPL", "NOPE"])
+
+    def test_quotes_endpoint_rejects_oversized_batch(self, client, authenticated_user):
+        from app.core.config import settings
+
+        symbols = [f"SYM{i}" for i in range(settings.MAX_QUOTE_BATCH_SIZE + 1)]
+        response = client.post(
+            "/stocks/quotes",
+            json={"symbols": symbols},
+            headers=authenticated_user["headers"]
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+class TestNegativeCache:
+    """Test short-lived caching of symbols upstream has no data for"""
+
+    def _quote(self, symbol, price):
+        from app.domains.stocks.schemas import StockQuote
+        return StockQuote(symbol=symbol, current_price=price, previous_close_price=price, timestamp="t")
+
+    @patch('app.domains.stocks.external.YFinanceClient.get_quotes')
+    @pytest.mark.asyncio
+    async def test_missing_symbols_in_batch_are_not_refetched(self, mock_get_quotes):
+        from app.domains.stocks.universe import symbol_index
+
+        symbol_index.load({"AAPL": "Apple Inc."})
+        mock_get_quotes.return_value = {"AAPL": self._quote("AAPL", 150.0)}
+        service = StockService()
+
+        await service.get_quotes(["AAPL", "NOPE"])
+        quote_cache.delete("quote_AAPL")
+        result = await service.get_quotes(["AAPL", "NOPE"])
+
+        assert set(result) == {"AAPL"}
+        assert mock_get_quotes.call_args_list[1].args[0] == ["AAPL"]
+        assert service.is_known_missing("nope")
+
+    @patch('app.domains.stocks.external.YFinanceClient.get_current_price')
+    @patch('app.domains.stocks.external.YFinanceClient.get_quotes')
+    @pytest.mark.asyncio
+    async def test_partial_batch_never_caches_listed_symbols(self, mock_get_quotes, mock_get_price):
+        from app.domains.stocks.universe import symbol_index
+
+        symbol_index.load({"AAPL": "Apple Inc.", "MSFT": "Microsoft Corporation"})
+        mock_get_quotes.return_value = {"AAPL": self._quote("AAPL", 150.0)}
+        mock_get_price.return_value = 400.0
+        service = StockService()
+
+        await service.get_quotes(["AAPL", "MSFT"])
+
+        assert not service.is_known_missing("MSFT")
+        assert await service.validate_symbol("MSFT") is True
+        # orders for a listed symbol still reach upstream
+        assert (await service.get_current_price("MSFT"))["current_price"] == 400.0
+        mock_get_price.assert_called_once()
+
+    @patch('app.domains.stocks.external.YFinanceClient.get_quotes')
+    @pytest.mark.asyncio
+    async def test_empty_batch_only_caches_unlisted_symbols(self, mock_get_quotes):
+        from app.domains.stocks.universe import symbol_index
+
+        mock_get_quotes.return_value = {}
+        service = StockService()
+
+        # without a universe an empty batch looks like an outage
+        await service.get_quotes(["AAPL", "NOPE"])
+        assert not service.is_known_missing("AAPL")
+        assert not service.is_known_missing("NOPE")
+
+        symbol_index.load({"AAPL": "Apple Inc."})
+        await service.get_quotes(["AAPL", "NOPE"])
+        assert not service.is_known_missing("AAPL")
+        assert service.is_known_missing("NOPE")
+
+    @patch('app.domains.stocks.external.YFinanceClient.get_current_price')
+    @pytest.mark.asyncio
+    async def test_price_lookup_for_bad_symbol_goes_upstream_once(self, mock_get_price):
+        mock_get_price.return_value = None
+        service = StockService()
+
+        for _ in range(3):
+            with pytest.raises(StockError):
+                await service.get_current_price("TYPO")
+
+        assert mock_get_price.call_count == 1
+
+    @patch('app.domains.stocks.external.YFinanceClient.get_current_price')
+    @pytest.mark.asyncio
+    async def test_upstream_errors_are_not_negative_cached(self, mock_get_price):
+        mock_get_price.side_effect = RuntimeError("429")
+        service = StockService()
+
+        with pytest.raises(RuntimeError):
+            await service.get_current_price("AAPL")
+
+        assert not service.is_known_missing("AAPL")
+
+    @patch('app.domains.stocks.external.YFinanceClient.validate_symbol')
+    @pytest.mark.asyncio
+    async def test_invalid_symbols_use_negative_cache(self, mock_validate):
+        mock_validate.return_value = False
+        service = StockService()
+
+        assert await service.validate_symbol("TYPO") is False
+        assert await service.validate_symbol("typo") is False
+
+        assert mock_validate.call_count == 1
+        assert quote_cache.get("valid_TYPO") is None
+
+    @pytest.mark.asyncio
+    async def test_bad_symbols_cannot_evict_quotes(self):
+        from app.core.config import settings
+
+        service = StockService()
+        quote_cache.set("quote_AAPL", {"symbol": "AAPL"})
+        service._mark_missing([f"BAD{i}" for i in range(settings.NEGATIVE_CACHE_MAX_SIZE + 10)])
+
+        assert quote_cache.get("quote_AAPL") == {"symbol": "AAPL"}
+        assert not service.is_known_missing("BAD0")
+
+
+class TestSymbolMetadata:
+    """Test the long-lived company metadata store"""
+
+    def _metadata(self, symbol, name, market_cap=None):
+        from app.domains.stocks.schemas import SymbolMetadata
+        return SymbolMetadata(symbol=symbol, company_name=name, market_cap=market_cap)
+
+    @patch('app.domains.stocks.external.YFinanceClient.get_symbol_metadata')
+    @pytest.mark.asyncio
+    async def test_metadata_fetched_once_then_persisted(self, mock_get_metadata, db):
+        from app.domains.stocks.repositories import SymbolMetadataRepository
+
+        mock_get_metadata.return_value = self._metadata("AAPL", "Apple Inc.", 2.5e12)
+
+        info = await StockService(db).get_company_info(["AAPL"])
+
+        assert info["AAPL"] == {"company_name": "Apple Inc.", "market_capitalization": "$2.50T"}
+        rows = SymbolMetadataRepository(db).get_by_symbols(["AAPL"])
+        assert rows[0].company_name == "Apple Inc."
+
+        # a fresh process (empty in-memory cache) reads the DB instead of going upstream
+        quote_cache.clear()
+        info = await StockService(db).get_company_info(["AAPL"])
+
+        assert info["AAPL"]["company_name"] == "Apple Inc."
+        assert mock_get_metadata.call_count == 1
+
+    @patch('app.domains.stocks.external.YFinanceClient.get_symbol_metadata')
+    @patch('app.domains.stocks.external.YFinanceClient.get_quotes')
+    @pytest.mark.asyncio
+    async def test_stock_data_combines_price_and_metadata(self, mock_get_quotes, mock_get_metadata, db):
+        from app.domains.stocks.schemas import StockQuote
+
+        mock_get_quotes.return_value = {
+            "AAPL": StockQuote(symbol="AAPL", current_price=155.0, previous_close_price=150.0, timestamp="t")
+        }
+        mock_get_metadata.return_value = self._metadata("AAPL", "Apple Inc.", 2.5e12)
+        service = StockService(db)
+
+        await service.get_stock_data("AAPL")
+        quote_cache.delete("quote_AAPL")  # price expires, metadata doesn't
+        result = await service.get_stock_data("AAPL")
+
+        assert result["company_name"] == "Apple Inc."
+        assert result["current_price"] == 155.0
+        assert result["previous_close_price"] == 150.0
+        assert mock_get_quotes.call_count == 2
+        assert mock_get_metadata.call_count == 1
+
+    @patch('app.domains.stocks.external.YFinanceClient.get_symbol_metadata')
+    @pytest.mark.asyncio
+    async def test_refresh_stale_metadata(self, mock_get_metadata, db):
+        from datetime import datetime, timedelta
+        from app.domains.stocks.repositories import SymbolMetadataRepository
+
+        repo = SymbolMetadataRepository(db)
+        row = repo.upsert("AAPL", "Apple", None)
+        row.updated_at = datetime.utcnow() - timedelta(days=2)
+        db.commit()
+        repo.upsert("MSFT", "Microsoft", None)
+
+        mock_get_metadata.return_value = self._metadata("AAPL", "Apple Inc.", 2.5e12)
+
+        refreshed = await StockService(db).refresh_stale_metadata()
+
+        assert refreshed == 1
+        mock_get_metadata.assert_called_once_with("AAPL")
+        assert repo.get_by_symbols(["AAPL"])[0].company_name == "Apple Inc."
+
+
+    def test_upsert_many_overwrites_in_one_commit(self, db):
+        from app.domains.stocks.repositories import SymbolMetadataRepository
+
+        repo = SymbolMetadataRepository(db)
+        repo.upsert("AAPL", "Apple", None)
+
+        with patch.object(db, "commit", wraps=db.commit) as commit:
+            written = repo.upsert_many([("AAPL", "Apple Inc.", 2.5e12), ("MSFT", "Microsoft", None)])
+
+        assert written == 2
+        assert commit.call_count == 1
+        rows = {row.symbol: row for row in repo.get_by_symbols(["AAPL", "MSFT"])}
+        assert rows["AAPL"].company_name == "Apple Inc."
+        assert rows["AAPL"].market_cap == 2.5e12
+
+    def test_failed_metadata_write_leaves_session_usable(self, db):
+        from app.domains.stocks.repositories import SymbolMetadataRepository
+        from app.domains.stocks.models import SymbolMetadata as SymbolMetadataRow
+
+        # a pending row that will conflict on flush, like a racing first insert
+        db.add(SymbolMetadataRow(symbol="AAPL", company_name="Apple"))
+        db.add(SymbolMetadataRow(symbol="AAPL", company_name="Apple"))
+
+        StockService(db)._store_metadata([self._metadata("MSFT", "Microsoft", None)])
+
+        assert SymbolMetadataRepository(db).get_by_symbols(["AAPL", "MSFT"]) == []
+
+
+class TestStaleWhileRevalidate:
+    """Test serving stale market data while a refresh runs"""
+
+    def _index(self, value):
+        from app.domains.stocks.schemas import MarketIndex
+        return MarketIndex(symbol="S&P 500", ticker="^GSPC", value=value, change=0.0, percent=0.0)
+
+    def _expire(self, key, seconds_ago):
+        # rewrite the entry as if it had been stored seconds_ago
+        value, stored_at, expires_at, retain_until = quote_cache._entries[key]
+        shift = (expires_at - stored_at) + seconds_ago
+        quote_cache._entries[key] = (value, stored_at - shift, expires_at - shift, retain_until - shift)
+
+    @patch('app.domains.stocks.external.YFinanceClient.get_market_indices')
+    @pytest.mark.asyncio
+    async def test_stale_indices_served_then_refreshed(self, mock_indices):
+        import asyncio
+        mock_indices.return_value = [self._index(4300.0)]
+        service = StockService()
+
+        first = await service.get_market_indices()
+        assert first.stale is False
+
+        self._expire("market_indices", 10)
+        mock_indices.return_value = [self._index(4400.0)]
+
+        stale = await service.get_market_indices()
+        assert stale.stale is True
+        assert stale.indices[0].value == 4300.0
+        assert stale.age_seconds > 0
+
+        await asyncio.sleep(0.01)  # let the background refresh finish
+        fresh = await service.get_market_indices()
+        assert fresh.stale is False
+        assert fresh.indices[0].value == 4400.0
+
+    @patch('app.domains.stocks.external.YFinanceClient.get_market_indices')
+    @pytest.mark.asyncio
+    async def test_outage_keeps_serving_last_good_value(self, mock_indices):
+        import asyncio
+        mock_indices.return_value = [self._index(4300.0)]
+        service = StockService()
+        await service.get_market_indices()
+
+        self._expire("market_indices", 10)
+        mock_indices.return_value = []  # upstream outage
+
+        for _ in range(2):
+            result = await service.get_market_indices()
+            await asyncio.sleep(0.01)
+            assert result.indices[0].value == 4300.0
+            assert result.stale is True
+
+    @patch('app.domains.stocks.external.YFinanceClient.get_market_indices')
+    @pytest.mark.asyncio
+    async def test_beyond_max_staleness_blocks_on_fetch(self, mock_indices):
+        from app.domains.stocks.services import MARKET_MAX_STALENESS
+        mock_indices.return_value = [self._index(4300.0)]
+        service = StockService()
+        await service.get_market_indices()
+
+        self._expire("market_indices", MARKET_MAX_STALENESS.total_seconds() + 1)
+        mock_indices.return_value = []
+
+        result = await service.get_market_indices()
+        assert result.indices == []
+
+    @patch('app.domains.stocks.external.YFinanceClient.get_quotes')
+    @pytest.mark.asyncio
+    async def test_stale_quotes_marked_and_revalidated(self, mock_get_quotes):
+        import asyncio
+        from app.domains.stocks.schemas import StockQuote
+
+        def quotes(price):
+            return {"AAPL": StockQuote(symbol="AAPL", current_price=price, previous_close_price=100.0, timestamp="t")}
+
+        mock_get_quotes.return_value = quotes(101.0)
+        service = StockService()
+        await service.get_quotes(["AAPL"])
+
+        self._expire("quote_AAPL", 10)
+        mock_get_quotes.return_value = quotes(102.0)
+
+        result = await service.get_quotes(["AAPL"])
+        assert result["AAPL"]["current_price"] == 101.0
+        assert result["AAPL"]["stale"] is True
+
+        await asyncio.sleep(0.01)
+        result = await service.get_quotes(["AAPL"])
+        assert result["AAPL"]["current_price"] == 102.0
+        assert "stale" not in result["AAPL"]
+
+
+class TestParallelIndices:
+    """Test that index fetches run concurrently with a per-index timeout"""
+
+    @pytest.mark.asyncio
+    async def test_indices_fetched_concurrently(self):
+        import threading
+        import time
+        from app.domains.stocks.external import YFinanceClient
+        from app.domains.stocks.schemas import MarketIndex
+
+        client = YFinanceClient()
+        barrier = threading.Barrier(len(client.INDICES), timeout=2)
+
+        def fake_fetch(symbol, name):
+            # only succeeds if all four calls are in flight at once
+            barrier.wait()
+            return MarketIndex(symbol=name, ticker=symbol, value=1.0, change=0.0, percent=0.0)
+
+        start = time.monotonic()
+        with patch.object(client, '_fetch_index', side_effect=fake_fetch):
+            indices = await client.get_market_indices()
+
+        assert [i.ticker for i in indices] == list(client.INDICES)
+        assert time.monotonic() - start < 2
+
+    @pytest.mark.asyncio
+    async def test_slow_index_is_dropped(self):
+        import time
+        from app.domains.stocks.external import YFinanceClient
+        from app.domains.stocks.schemas import MarketIndex
+
+        client = YFinanceClient()
+
+        def fake_fetch(symbol, name):
+            if symbol == "^VIX":
+                time.sleep(0.5)
+            return MarketIndex(symbol=name, ticker=symbol, value=1.0, change=0.0, percent=0.0)
+
+        with patch.object(client, '_fetch_index', side_effect=fake_fetch), \
+             patch('app.domains.stocks.external.settings.MARKET_INDEX_TIMEOUT_SECONDS', 0.1):
+            indices = await client.get_market_indices()
+
+        assert [i.ticker for i in indices] == ["^GSPC", "^DJI", "^IXIC"]
+
+
+class _DictSharedCache:
+    """In-memory stand-in for the Redis-backed async_cache_service"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, expire=None):
+        self.data[key] = value
+        return True
+
+
+class TestMarketMovers:
+    """Test concurrent screener fetches and the cross-worker movers cache"""
+
+    @pytest.mark.asyncio
+    async def test_screens_fetched_concurrently(self):
+        import threading
+        from app.domains.stocks.external import YFinanceClient
+
+        client = YFinanceClient()
+        barrier = threading.Barrier(2, timeout=2)
+
+        def fake_screen(screen_type):
+            barrier.wait()
+            return [screen_type]
+
+        with patch.object(client, '_get_screener_data', side_effect=fake_screen):
+            movers = await client.get_market_movers()
+
+        assert movers == {'gainers': ['day_gainers'], 'losers': ['day_losers']}
+
+    @pytest.mark.asyncio
+    @patch('app.domains.stocks.external.YFinanceClient.get_market_movers')
+    async def test_movers_shared_between_workers(self, mock_movers):
+        from app.domains.stocks.schemas import MarketMover
+
+        mock_movers.return_value = {
+            'gainers': [MarketMover(symbol="AAPL", name="Apple", price=1.0, change=0.1, change_percent=10.0)],
+            'losers': []
+        }
+        shared = _DictSharedCache()
+
+        first_worker = StockService()
+        first_worker._shared = shared
+        await first_worker.get_market_movers()
+
+        # a second worker has its own empty L1 but sees the shared copy
+        quote_cache.clear()
+        second_worker = StockService()
+        second_worker._shared = shared
+        result = await second_worker.get_market_movers()
+
+        assert mock_movers.call_count == 1
+        assert result.gainers[0].symbol == "AAPL"
@@ -0,0 +1,153 @@
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from app.domains.stocks.repositories import ListedSymbolRepository
+from app.domains.stocks.services import StockService
+from app.domains.stocks.universe import SymbolIndex, parse_symbol_directory, symbol_index
+
+NASDAQ_FILE = """Symbol|Security Name|Market Category|Test Issue|Financial Status|Round Lot Size|ETF|NextShares
+AAPL|Apple Inc. - Common Stock|Q|N|N|100|N|N
+ZVZZT|NASDAQ TEST STOCK|G|Y|N|100|N|N
+AMZN|Amazon.com, Inc. - Common Stock|Q|N|N|100|N|N
+File Creation Time: 0102202422:01|||||||
+"""
+
+OTHER_FILE = """ACT Symbol|Security Name|Exchange|CQS Symbol|ETF|Round Lot Size|Test Issue|NASDAQ Symbol
+BRK.B|Berkshire Hathaway Inc. Class B|N|BRK.B|N|100|N|BRK=B
+ABR$D|Arbor Realty Trust Preferred|N|ABRpD|N|100|N|ABR-D
+SPY|SPDR S&P 500 ETF Trust|P|SPY|Y|100|N|SPY
+File Creation Time: 0102202422:01||||||
+"""
+
+
+class TestParseSymbolDirectory:
+    """Test parsing of the nasdaq trader directory files"""
+
+    def test_nasdaq_listed(self):
+        entries = parse_symbol_directory(NASDAQ_FILE, "Symbol", "NASDAQ")
+
+        assert entries == {
+            "AAPL": ("Apple Inc.", "NASDAQ"),
+            "AMZN": ("Amazon.com, Inc.", "NASDAQ"),
+        }
+
+    def test_other_listed_uses_yahoo_format(self):
+        entries = parse_symbol_directory(OTHER_FILE, "ACT Symbol")
+
+        assert entries["BRK-B"] == ("Berkshire Hathaway Inc. Class B", "NYSE")
+        assert entries["SPY"][1] == "NYSE Arca"
+        assert not any("$" in s for s in entries)
+
+
+class TestSymbolIndex:
+    """Test membership and prefix search"""
+
+    def test_prefix_search(self):
+        index = SymbolIndex()
+        index.load({"AMZN": "Amazon", "AAPL": "Apple", "AMD": "AMD", "MSFT": "Microsoft"})
+
+        assert index.search_prefix("am") == [("AMD", "AMD"), ("AMZN", "Amazon")]
+        assert index.search_prefix("A", limit=2) == [("AAPL", "Apple"), ("AMD", "AMD")]
+        assert index.search_prefix("Q") == []
+
+    def test_add_keeps_order(self):
+        index = SymbolIndex()
+        index.load({"AAPL": "Apple", "MSFT": "Microsoft"})
+
+        index.add("GOOG")
+
+        assert "GOOG" in index
+        assert [s for s, _ in index.search_prefix("")] == ["AAPL", "GOOG", "MSFT"]
+
+
+class TestLocalValidation:
+    """Test that validation is answered locally for listed symbols"""
+
+    @pytest.mark.asyncio
+    @patch("app.domains.stocks.external.YFinanceClient.validate_symbol", new_callable=AsyncMock)
+    async def test_listed_symbol_skips_upstream(self, mock_validate):
+        symbol_index.load({"AAPL": "Apple Inc."})
+
+        assert await StockService().validate_symbol("aapl") is True
+        mock_validate.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch("app.domains.stocks.external.YFinanceClient.validate_symbol", new_callable=AsyncMock)
+    async def test_unknown_symbol_falls_through_and_is_remembered(self, mock_validate):
+        symbol_index.load({"AAPL": "Apple Inc."})
+        mock_validate.return_value = True
+
+        assert await StockService().validate_symbol("NEWCO") is True
+        assert "NEWCO" in symbol_index
+        mock_validate.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @patch("app.domains.stocks.services.fetch_symbol_directory")
+    async def test_refresh_persists_and_loads(self, mock_fetch, db):
+        from app.infrastructure.executor import yfinance_executor
+
+        mock_fetch.return_value = {"AAPL": ("Apple Inc.", "NASDAQ"), "BRK-B": ("Berkshire", "NYSE")}
+        service = StockService(db)
+
+        submitted = yfinance_executor.stats()["submitted"]
+
+        assert await service.refresh_symbol_universe() == 2
+        # the directory download doesn't take a yfinance worker slot
+        assert yfinance_executor.stats()["submitted"] == submitted
+        assert {row.symbol for row in ListedSymbolRepository(db).get_all()} == {"AAPL", "BRK-B"}
+        assert service.search_symbols("br") == [{"symbol": "BRK-B", "name": "Berkshire"}]
+
+        # a fresh process picks the universe up from the table
+        symbol_index.clear()
+        assert service.load_symbol_universe() == 2
+        assert "AAPL" in symbol_index
+
+
+class TestSymbolSearch:
+    """Test ranked ticker and company name search"""
+
+    UNIVERSE = {
+        "A": "Agilent Technologies",
+        "AAPL": "Apple Inc.",
+        "APLE": "Apple Hospitality REIT",
+        "MAPL": "Pineapple Maple Co",
+        "BRK-B": "Berkshire Hathaway Inc. Class B",
+        "MSFT": "Microsoft Corporation",
+    }
+
+    @pytest.fixture(autouse=True)
+    def universe(self):
+        symbol_index.load(self.UNIVERSE)
+
+    def test_exact_ticker_ranks_first(self):
+        results = symbol_index.search("a")
+
+        assert results[0] == ("A", "Agilent Technologies")
+        assert [s for s, _ in results[1:3]] == ["AAPL", "APLE"]
+
+    def test_company_name_match(self):
+        assert [s for s, _ in symbol_index.search("apple")] == ["AAPL", "APLE"]
+        assert [s for s, _ in symbol_index.search("maple")] == ["MAPL"]
+
+    def test_all_words_must_match(self):
+        assert [s for s, _ in symbol_index.search("apple hosp")] == ["APLE"]
+
+    def test_dotted_ticker(self):
+        assert symbol_index.search("brk.b") == [("BRK-B", "Berkshire Hathaway Inc. Class B")]
+
+    def test_search_endpoint(self, client, authenticated_user):
+        # app startup reloads the (empty) symbol table, so load after the client exists
+        symbol_index.load(self.UNIVERSE)
+
+        response = client.get("/stocks/search?q=micro", headers=authenticated_user["headers"])
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "query": "micro",
+            "results": [{"symbol": "MSFT", "name": "Microsoft Corporation"}]
+        }
+
+    def test_search_endpoint_requires_query(self, client, authenticated_user):
+        response = client.get("/stocks/search", headers=authenticated_user["headers"])
+
+        assert response.status_code == 422
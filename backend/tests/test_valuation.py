@@ -0,0 +1,186 @@
+import pytest
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from app.domains.portfolio.valuation import UserValuation, ValuationStore
+from app.infrastructure.invalidation import ALL_PORTFOLIOS_TAG, user_tag
+
+TODAY = date(2026, 10, 16)
+
+
+def _state(user_id=1, day=TODAY):
+    return UserValuation(
+        user_id=user_id, day=day, cash_balance=1000.0,
+        positions={"AAPL": (10, 100.0)}, activity_count=1, baseline_value=2000.0
+    )
+
+
+def _quote(price):
+    return {"current_price": price, "previous_close_price": price}
+
+
+class TestUserValuation:
+    """Test incremental valuation updates"""
+
+    def test_reprice(self):
+        state = _state()
+        assert state.needs_pricing(1, timedelta(minutes=1))
+
+        state.reprice({"AAPL": _quote(110.0)}, version=1)
+
+        assert state.positions_value == 1100.0
+        assert state.portfolio_value == 2100.0
+        assert not state.needs_pricing(1, timedelta(minutes=1))
+        assert state.needs_pricing(2, timedelta(minutes=1))
+
+    def test_missing_quote_retried_next_read(self):
+        state = _state()
+        state.reprice({}, version=1)
+
+        # valued at cost, but not marked as priced
+        assert state.positions_value == 1000.0
+        assert state.needs_pricing(1, timedelta(minutes=1))
+
+    def test_apply_trade(self):
+        state = _state()
+        state.reprice({"AAPL": _quote(110.0)}, version=1)
+
+        state.apply_trade("MSFT", 5, 200.0, 0.0)
+        assert state.positions_value == 1100.0 + 1000.0
+        assert state.activity_count == 2
+
+        state.apply_trade("AAPL", 0, 100.0, 1100.0)
+        assert set(state.positions) == {"MSFT"}
+        assert state.portfolio_value == 1000.0 + 1100.0
+
+
+class TestValuationStore:
+    """Test the per-worker valuation store"""
+
+    def test_state_expires_with_the_day(self):
+        store = ValuationStore()
+        store.put(_state())
+
+        assert store.get(1, TODAY) is not None
+        assert store.get(1, TODAY + timedelta(days=1)) is None
+        assert store.get(1, TODAY) is None
+
+    def test_state_reloaded_after_max_age(self):
+        store = ValuationStore(max_age=timedelta(minutes=5))
+        store.put(_state())
+        assert store.get(1, TODAY) is not None
+
+        # a missed bus message can't keep a stale state around past max_age
+        with patch("app.domains.portfolio.valuation.time.monotonic",
+                   return_value=store._states[1].loaded_at + 300):
+            assert store.get(1, TODAY) is None
+        assert store.get(1, TODAY) is None
+
+    def test_apply_trade_needs_loaded_state(self):
+        store = ValuationStore()
+        assert store.apply_trade(1, "AAPL", 5, 100.0, 0.0) is False
+
+        store.put(_state())
+        assert store.apply_trade(1, "AAPL", 5, 100.0, 0.0) is True
+        assert store.get(1, TODAY).positions["AAPL"] == [5, 100.0]
+
+    def test_lru_bound(self):
+        store = ValuationStore(max_size=2)
+        for user_id in (1, 2, 3):
+            store.put(_state(user_id))
+
+        assert store.get(1, TODAY) is None
+        assert store.get(3, TODAY) is not None
+
+    @pytest.mark.asyncio
+    async def test_invalidation(self):
+        store = ValuationStore()
+        store.put(_state(1))
+        store.put(_state(2))
+
+        # this worker applies its own user changes directly
+        assert await store.invalidate_tags([user_tag(1)]) == 0
+        # another worker's change drops our copy
+        assert store.drop_local_tags([user_tag(1)]) == 1
+        assert store.get(1, TODAY) is None
+
+        assert await store.invalidate_tags([ALL_PORTFOLIOS_TAG]) == 1
+        assert store.get(2, TODAY) is None
+
+
+class TestSummaryValuation:
+    """Test that summaries are served from the valuation state"""
+
+    @pytest.fixture
+    def test_user(self, db):
+        from app.domains.auth.repositories import UserRepository
+        from app.domains.auth.schemas import UserCreate
+        from app.core.security import get_password_hash
+
+        user_data = UserCreate(
+            first_name="John",
+            last_name="Doe",
+            email="john@example.com",
+            username="johndoe",
+            password="password123"
+        )
+        return UserRepository(db).create(user_data, get_password_hash("password123"))
+
+    @pytest.mark.asyncio
+    @patch('app.domains.stocks.services.StockService.get_company_info')
+    @patch('app.domains.stocks.services.StockService.get_quotes')
+    async def test_trades_update_state_without_reloading(self, mock_get_quotes, mock_get_info, db, test_user):
+        from app.domains.portfolio.services import PortfolioService
+        from app.domains.trading.repositories import PositionRepository
+        from app.domains.trading.schemas import OrderCreate
+        from app.domains.trading.services import TradingService
+
+        async def quotes(symbols):
+            return {s: _quote(100.0) for s in symbols}
+
+        mock_get_quotes.side_effect = quotes
+        mock_get_info.return_value = {"AAPL": {"company_name": "Apple Inc."}}
+        service = PortfolioService(db)
+        await service.get_portfolio_summary(test_user.id)
+
+        trading = TradingService(db)
+        await trading.execute_order(test_user, OrderCreate(symbol="AAPL", action="buy", quantity=10), 100.0)
+        await trading.execute_order(test_user, OrderCreate(symbol="AAPL", action="sell", quantity=4), 100.0)
+
+        with patch.object(PositionRepository, "get_all_by_user") as load_positions:
+            summary = await service.get_portfolio_summary(test_user.id)
+
+        load_positions.assert_not_called()
+        assert summary.positions[0].shares == 6
+        assert summary.positions[0].company_name == "Apple Inc."
+        assert summary.cash_balance == 100000.0 - 600.0
+        assert summary.portfolio_value == 100000.0
+        assert summary.activity_count == 2
+
+    @pytest.mark.asyncio
+    @patch('app.domains.stocks.services.StockService.get_company_info')
+    @patch('app.domains.stocks.services.StockService.get_quotes')
+    async def test_quotes_reread_only_when_version_moves(self, mock_get_quotes, mock_get_info, db, test_user):
+        from app.domains.portfolio.services import PortfolioService
+        from app.domains.trading.schemas import OrderCreate
+        from app.domains.trading.services import TradingService
+
+        async def quotes(symbols):
+            return {s: _quote(120.0) for s in symbols}
+
+        mock_get_quotes.side_effect = quotes
+        mock_get_info.return_value = {}
+        await TradingService(db).execute_order(test_user, OrderCreate(symbol="AAPL", action="buy", quantity=10), 100.0)
+        service = PortfolioService(db)
+
+        with patch('app.domains.portfolio.services.quote_version', return_value=1):
+            first = await service.get_portfolio_summary(test_user.id)
+            service.get_portfolio_summary.cache_clear()
+            await service.get_portfolio_summary(test_user.id)
+        assert mock_get_quotes.await_count == 1
+        assert first.positions_value == 1200.0
+
+        with patch('app.domains.portfolio.services.quote_version', return_value=2):
+            service.get_portfolio_summary.cache_clear()
+            await service.get_portfolio_summary(test_user.id)
+        assert mock_get_quotes.await_count == 2